@@ -3,13 +3,32 @@ Database configuration and session management.
 
 Handles async SQLAlchemy engine creation with appropriate connection pooling
 for different environments (test, development, production).
+
+Read sessions (GraphQL queries, editor GET routes) run in autocommit mode, so
+they skip the BEGIN/COMMIT round trips; writes always go to the primary in a
+transaction. When ``DATABASE_REPLICA_URLS`` is set, read sessions are spread
+round-robin over the replicas; a replica that fails to connect is skipped for a
+while, and after a content change reads stay on the primary long enough for the
+replicas to catch up, so editors read their own writes.
+
+Other instances learn about a write through the content change event, which
+only leaves the writing process through Redis: with replicas but without
+``REDIS_URL`` only the instance that wrote pins its reads, and the others may
+serve replica data that lags behind the write (see ``check_replica_pinning``).
 """
 
+import asyncio
+import itertools
 import ssl
+import time
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
-from typing import Optional
+from functools import partial
+from typing import Dict, List, Optional
 
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.engine.url import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.asyncio.session import AsyncSession as SQLAlchemyAsyncSession
@@ -18,12 +37,20 @@ from sqlalchemy.pool.impl import AsyncAdaptedQueuePool
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from . import settings
+from .logger import get_logger
+
+logger = get_logger("db")
 
 _engine: Optional[AsyncEngine] = None
 _async_session_factory: Optional[async_sessionmaker[SQLAlchemyAsyncSession]] = None
+_replicas: Optional["ReplicaSet"] = None
+_read_session_factories: Dict[AsyncEngine, async_sessionmaker[SQLAlchemyAsyncSession]] = {}
+_primary_pinned_until = 0.0
+
+READ_METHODS = frozenset({"GET", "HEAD"})
 
 
-def _new_engine() -> AsyncEngine:
+def _new_engine(database_url: Optional[str] = None) -> AsyncEngine:
     """Create a new async engine with environment-appropriate pooling."""
     kwargs = {
         "echo": settings.DEBUG,
@@ -43,7 +70,7 @@ def _new_engine() -> AsyncEngine:
             }
         )
 
-    url = make_url(settings.DATABASE_URL)
+    url = make_url(database_url or settings.DATABASE_URL)
     connect_args = {}
 
     # Handle asyncpg + Neon DB SSL parameters
@@ -76,6 +103,115 @@ def get_engine() -> AsyncEngine:
     return _engine
 
 
+class ReplicaSet:
+    """Round-robin over read replicas, skipping those that recently failed."""
+
+    def __init__(self, engines: List[AsyncEngine], eject_seconds: float):
+        self.engines = engines
+        self.eject_seconds = eject_seconds
+        self._ejected_until: Dict[Engine, float] = {}
+        self._next = itertools.count()
+        for engine in engines:
+            event.listen(
+                engine.sync_engine, "do_connect", partial(self._connect, engine.sync_engine)
+            )
+            event.listen(
+                engine.sync_engine, "handle_error", partial(self._handle_error, engine.sync_engine)
+            )
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """Next healthy replica, or None when all of them are ejected."""
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            engine = self.engines[next(self._next) % len(self.engines)]
+            if self._ejected_until.get(engine.sync_engine, 0.0) <= now:
+                return engine
+        return None
+
+    def eject(self, sync_engine: Engine) -> None:
+        self._ejected_until[sync_engine] = time.monotonic() + self.eject_seconds
+        logger.warning(
+            "Read replica ejected",
+            extra={"replica": sync_engine.url.host, "seconds": self.eject_seconds},
+        )
+
+    def _connect(self, sync_engine: Engine, dialect, conn_rec, cargs, cparams):
+        # Refused connections raise OSError, which never reaches handle_error
+        try:
+            return dialect.connect(*cargs, **cparams)
+        except Exception:
+            self.eject(sync_engine)
+            raise
+
+    def _handle_error(self, sync_engine: Engine, context) -> None:
+        # context.engine may be a derived engine with other execution options
+        if context.is_disconnect:
+            self.eject(sync_engine)
+
+
+def get_replicas() -> Optional[ReplicaSet]:
+    """Get or create the read replicas, or None when none are configured."""
+    global _replicas
+    if _replicas is None and settings.DATABASE_REPLICA_URLS:
+        _replicas = ReplicaSet(
+            [_new_engine(url) for url in settings.DATABASE_REPLICA_URLS],
+            settings.DATABASE_REPLICA_EJECT_SECONDS,
+        )
+    return _replicas
+
+
+def get_engines() -> List[AsyncEngine]:
+    """The primary followed by every configured replica."""
+    replicas = get_replicas()
+    return [get_engine(), *(replicas.engines if replicas else [])]
+
+
+def pin_primary(*_) -> None:
+    """Keep reads on the primary until the replicas have caught up with a write.
+
+    Subscribed to content change events, so with Redis a write on any
+    instance pins reads on every instance; without it, only on the writer.
+    """
+    global _primary_pinned_until
+    _primary_pinned_until = time.monotonic() + settings.DATABASE_REPLICA_PIN_SECONDS
+
+
+def check_replica_pinning() -> None:
+    """Warn at startup when replica reads cannot be pinned across instances."""
+    if settings.DATABASE_REPLICA_URLS and not settings.REDIS_URL:
+        logger.warning(
+            "DATABASE_REPLICA_URLS is set without REDIS_URL: a write pins reads to the "
+            "primary only on the instance that made it, so other instances may read "
+            "from replicas that have not caught up yet"
+        )
+
+
+def get_read_engine() -> AsyncEngine:
+    """A healthy replica, or the primary when there is none or reads are pinned."""
+    replicas = get_replicas()
+    if replicas is None or time.monotonic() < _primary_pinned_until:
+        return get_engine()
+    return replicas.choose() or get_engine()
+
+
+def get_read_session_factory() -> async_sessionmaker[SQLAlchemyAsyncSession]:
+    """Autocommit session factory bound to the engine reads should use right now.
+
+    Sessions from it must only read: every statement commits on its own.
+    """
+    engine = get_read_engine()
+    factory = _read_session_factories.get(engine)
+    if factory is None:
+        # Without a transaction there is no BEGIN/COMMIT round trip around the SELECTs
+        factory = async_sessionmaker(
+            bind=engine.execution_options(isolation_level="AUTOCOMMIT"),
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+        _read_session_factories[engine] = factory
+    return factory
+
+
 def get_async_session_factory() -> async_sessionmaker[SQLAlchemyAsyncSession]:
     """Get or create the global session factory."""
     global _async_session_factory
@@ -101,9 +237,29 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
-async def get_session_dependency() -> AsyncGenerator[AsyncSession, None]:
-    """FastAPI dependency that provides a database session."""
-    async_session_factory = get_async_session_factory()
+@asynccontextmanager
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get a session for reads only, served by a replica when available."""
+    async with get_read_session_factory()() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+async def get_session_dependency(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that provides a database session.
+
+    GET and HEAD requests get a read session; every other method the primary.
+    """
+    if request.method in READ_METHODS:
+        async_session_factory = get_read_session_factory()
+    else:
+        async_session_factory = get_async_session_factory()
     session = async_session_factory()
     try:
         yield session
@@ -115,10 +271,63 @@ async def get_session_dependency() -> AsyncGenerator[AsyncSession, None]:
         await session.close()
 
 
+class RequestSession:
+    """
+    Lazily opened session shared by everything that runs within one request.
+
+    Calling the instance works like ``get_session``, but every caller gets the
+    same session and the transaction is finished once, in ``close``. Access is
+    serialized with a lock because an AsyncSession cannot run statements
+    concurrently, while sibling GraphQL fields resolve concurrently.
+    """
+
+    def __init__(
+        self, session_factory: Optional[async_sessionmaker[SQLAlchemyAsyncSession]] = None
+    ):
+        self._session_factory = session_factory
+        self._session: Optional[AsyncSession] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._session is not None
+
+    @asynccontextmanager
+    async def __call__(self) -> AsyncGenerator[AsyncSession, None]:
+        async with self._lock:
+            if self._session is None:
+                factory = self._session_factory or get_async_session_factory()
+                self._session = factory()
+            try:
+                yield self._session
+            except Exception:
+                # Leave the shared transaction usable for the other callers
+                await self._session.rollback()
+                raise
+
+    async def close(self) -> None:
+        """Commit and close the session if anything opened it."""
+        if self._session is None:
+            return
+        session, self._session = self._session, None
+        try:
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
 def close_engine():
-    """Close the global engine."""
-    global _engine, _async_session_factory
+    """Close the global engine and the replica engines."""
+    global _engine, _async_session_factory, _replicas
     if _engine is not None:
         _engine.sync_engine.dispose()
         _engine = None
         _async_session_factory = None
+    if _replicas is not None:
+        for engine in _replicas.engines:
+            engine.sync_engine.dispose()
+        _replicas = None
+    _read_session_factories.clear()
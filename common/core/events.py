@@ -0,0 +1,164 @@
+"""
+Content change events.
+
+Editor write paths publish a ``ContentChanged`` event after a successful
+commit. Handlers subscribed in the same process run immediately; when Redis is
+configured the event is also published on a pub/sub channel so that every
+other instance (e.g. the GraphQL API workers) receives it through ``listen``
+and runs its own handlers. Handlers are used to keep derived, in-memory state
+such as response caches consistent with the database.
+
+Without Redis, events never leave the process that published them. ``listen``
+then polls a version of the content (row counts and latest timestamps) every
+``CONTENT_POLL_SECONDS`` instead, and dispatches ``REFRESHED`` when it changed:
+handlers must treat that event as "anything may have changed". Until the next
+poll, other instances' writes are invisible to this process's derived state.
+"""
+
+import asyncio
+import inspect
+import json
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, List, Union
+
+from sqlalchemy import text
+
+from ..core.db import get_engine
+from ..core.logger import get_logger
+from ..core.rate_limiting import get_redis_client
+from ..core.settings import CONTENT_POLL_SECONDS
+
+logger = get_logger("events")
+
+CHANNEL = "helpcenter:content-changed"
+
+# Identifies this process so it can ignore its own events coming back from Redis
+INSTANCE_ID = uuid.uuid4().hex
+
+
+@dataclass(frozen=True)
+class ContentChanged:
+    entity: str  # "guide", "category", "media", or "content" for REFRESHED
+    action: str  # "created", "updated", "deleted" or "refreshed"
+    id: str
+
+
+# Dispatched by the poll when content changed in a way no event reported
+REFRESHED = ContentChanged(entity="content", action="refreshed", id="")
+
+# Changes whenever a row is created, updated or deleted; link rows only through
+# their counts, which every attach/detach changes
+CONTENT_VERSION = text("""
+SELECT concat_ws(',',
+    (SELECT count(*) || '/' || coalesce(max(coalesce(updated_at, created_at))::text, '')
+        FROM userguide),
+    (SELECT count(*) || '/' || coalesce(max(coalesce(updated_at, created_at))::text, '')
+        FROM category),
+    (SELECT count(*) || '/' || coalesce(max(coalesce(updated_at, created_at))::text, '')
+        FROM media),
+    (SELECT count(*) FROM guidecategorylink),
+    (SELECT count(*) FROM guidemedialink)
+)
+""")
+
+
+Handler = Callable[[ContentChanged], Union[None, Awaitable[None]]]
+
+_handlers: List[Handler] = []
+
+
+def subscribe(handler: Handler) -> None:
+    """Register a handler for content changes seen by this process."""
+    if handler not in _handlers:
+        _handlers.append(handler)
+
+
+def unsubscribe(handler: Handler) -> None:
+    if handler in _handlers:
+        _handlers.remove(handler)
+
+
+async def dispatch(event: ContentChanged) -> None:
+    """Run local handlers; a failing handler never breaks the write path."""
+    for handler in list(_handlers):
+        try:
+            result = handler(event)
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            logger.exception("Content change handler failed", extra={"event": asdict(event)})
+
+
+async def publish(entity: str, action: str, id: object) -> None:
+    """Notify this process and, through Redis, every other instance of a change."""
+    event = ContentChanged(entity=entity, action=action, id=str(id))
+    await dispatch(event)
+
+    redis_client = get_redis_client()
+    if redis_client is None:
+        return
+    try:
+        await redis_client.publish(CHANNEL, json.dumps({**asdict(event), "origin": INSTANCE_ID}))
+    except Exception as e:
+        logger.warning(f"Failed to publish content change to Redis: {e}")
+
+
+def is_distributed() -> bool:
+    """Whether events reach other instances, i.e. Redis is configured."""
+    return get_redis_client() is not None
+
+
+async def content_version() -> str:
+    """A value that changes with every committed write to the content tables."""
+    async with get_engine().connect() as conn:
+        return (await conn.execute(CONTENT_VERSION)).scalar_one()
+
+
+async def poll(interval: float) -> None:
+    """Dispatch ``REFRESHED`` whenever the content version changes, until cancelled."""
+    version = None
+    while True:
+        try:
+            current = await content_version()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to poll the content version: {e}")
+        else:
+            if version is not None and current != version:
+                await dispatch(REFRESHED)
+            version = current
+        await asyncio.sleep(interval)
+
+
+async def listen(retry_delay: float = 5.0, poll_interval: float = CONTENT_POLL_SECONDS) -> None:
+    """Dispatch events published by other instances until cancelled.
+
+    Without Redis, polls the content version every ``poll_interval`` seconds
+    instead (never when it is 0).
+    """
+    redis_client = get_redis_client()
+    if redis_client is None:
+        if poll_interval > 0:
+            await poll(poll_interval)
+        return
+
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(CHANNEL)
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                payload = json.loads(message["data"])
+                if payload.pop("origin", None) == INSTANCE_ID:
+                    continue
+                await dispatch(ContentChanged(**payload))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Content change listener disconnected: {e}")
+            await asyncio.sleep(retry_delay)
+        finally:
+            await pubsub.aclose()
@@ -64,6 +64,18 @@ DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
 DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
 DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
 
+# Optional read replicas (comma separated); GraphQL queries and editor GETs read from them
+DATABASE_REPLICA_URLS = [
+    url.strip().replace("postgresql://", "postgresql+asyncpg://", 1)
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+# How long a replica that failed to connect is skipped
+DATABASE_REPLICA_EJECT_SECONDS = float(os.getenv("DATABASE_REPLICA_EJECT_SECONDS", "30"))
+# How long reads stay on the primary after a content change, to cover replica lag;
+# on every instance with REDIS_URL, otherwise only on the one that wrote
+DATABASE_REPLICA_PIN_SECONDS = float(os.getenv("DATABASE_REPLICA_PIN_SECONDS", "5"))
+
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
 DEV_EDITOR_KEY = os.getenv("DEV_EDITOR_KEY", "dev-editor-key")
 
@@ -72,3 +84,60 @@ GCS_BUCKET_NAME = os.getenv("GCS_BUCKET_NAME")
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
 
 REDIS_URL = os.getenv("REDIS_URL")
+
+# Without Redis, content changes made by other instances are only noticed by
+# polling the database this often (seconds; 0 disables polling)
+CONTENT_POLL_SECONDS = float(os.getenv("CONTENT_POLL_SECONDS", "30"))
+
+# Automatic persisted queries: in-process LRU size and Redis entry TTL
+APQ_CACHE_SIZE = int(os.getenv("APQ_CACHE_SIZE", "1000"))
+APQ_REDIS_TTL = int(os.getenv("APQ_REDIS_TTL", "86400"))
+# Longer queries are executed but never registered
+APQ_MAX_QUERY_LENGTH = int(os.getenv("APQ_MAX_QUERY_LENGTH", "20000"))
+
+# Rendered UserGuide.bodyHtml, keyed by body hash: in-process LRU size and Redis entry TTL
+BODY_HTML_CACHE_SIZE = int(os.getenv("BODY_HTML_CACHE_SIZE", "1000"))
+BODY_HTML_REDIS_TTL = int(os.getenv("BODY_HTML_REDIS_TTL", "604800"))
+
+# Parsed-and-validated GraphQL documents kept per process
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.getenv("GRAPHQL_DOCUMENT_CACHE_SIZE", "500"))
+
+# Static cost/depth budget of a GraphQL operation, checked before execution
+GRAPHQL_MAX_QUERY_COST = int(os.getenv("GRAPHQL_MAX_QUERY_COST", "10000"))
+GRAPHQL_MAX_QUERY_DEPTH = int(os.getenv("GRAPHQL_MAX_QUERY_DEPTH", "10"))
+
+# GraphQL response cache; a TTL of 0 disables it
+GRAPHQL_RESPONSE_CACHE_SIZE = int(os.getenv("GRAPHQL_RESPONSE_CACHE_SIZE", "1000"))
+GRAPHQL_RESPONSE_CACHE_TTL = int(os.getenv("GRAPHQL_RESPONSE_CACHE_TTL", "300"))
+
+# Operations accepted in one batched (JSON array) GraphQL request; 0 disables batching
+GRAPHQL_BATCH_MAX_OPERATIONS = int(os.getenv("GRAPHQL_BATCH_MAX_OPERATIONS", "10"))
+
+# @defer/@stream over multipart/mixed; only takes effect with graphql-core>=3.3
+GRAPHQL_INCREMENTAL_DELIVERY = os.getenv("GRAPHQL_INCREMENTAL_DELIVERY", "false").lower() == "true"
+
+# Return per-resolver traces to clients sending X-Debug-Trace; off in production
+GRAPHQL_TRACING_RESPONSES = (
+    os.getenv("GRAPHQL_TRACING_RESPONSES", str(DEBUG or ENVIRONMENT != "production")).lower()
+    == "true"
+)
+
+# Guide search backend: "postgres" (full-text search with the trigram fallback) or
+# "memory" (in-process BM25 index per instance, kept current by content events,
+# which reach other instances through Redis or else through CONTENT_POLL_SECONDS)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "postgres").lower()
+
+# Guide search falls back to trigram matching of titles, slugs and category names
+# when full-text search finds fewer results than this (0 disables the fallback)
+SEARCH_FUZZY_MIN_RESULTS = int(os.getenv("SEARCH_FUZZY_MIN_RESULTS", "3"))
+# Minimum trigram similarity (0..1) of a fuzzy match
+SEARCH_TRIGRAM_THRESHOLD = float(os.getenv("SEARCH_TRIGRAM_THRESHOLD", "0.3"))
+
+# Serve the hottest editor reads (guide by slug, guide list, category list) with
+# hand-written SQL on the raw asyncpg connection instead of ORM objects
+FAST_READ_PATH = os.getenv("FAST_READ_PATH", "false").lower() == "true"
+
+# Related guides (scripts/refresh_related_guides.py): stored per guide, and the weight of
+# shared categories (Jaccard similarity) added to the TF-IDF cosine similarity
+RELATED_GUIDES_COUNT = int(os.getenv("RELATED_GUIDES_COUNT", "10"))
+RELATED_GUIDES_CATEGORY_BOOST = float(os.getenv("RELATED_GUIDES_CATEGORY_BOOST", "0.2"))
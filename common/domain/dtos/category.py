@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
@@ -66,3 +66,7 @@ class CategoryReadDTO(BaseModel):
     slug: str
     created_at: datetime
     updated_at: Optional[datetime]
+
+
+class CategoryWithGuidesDTO(CategoryReadDTO):
+    guide_ids: List[UUID] = Field(default=[], description="IDs of the category's guides")
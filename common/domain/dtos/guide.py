@@ -13,8 +13,11 @@ class GuideCreateDTO(BaseModel):
     title: str = Field(..., min_length=1, max_length=200, description="Guide title")
     slug: str = Field(..., min_length=1, max_length=100, description="URL-friendly slug")
     body: Dict[str, Any] = Field(..., description="Rich text content with blocks structure")
-    estimated_read_time: int = Field(
-        ..., ge=1, le=300, description="Estimated read time in minutes"
+    estimated_read_time: Optional[int] = Field(
+        None,
+        ge=1,
+        le=300,
+        description="Estimated read time in minutes, computed from the body's length if omitted",
     )
     category_ids: Optional[List[UUID]] = Field(
         default=[], description="Category IDs to associate with this guide"
@@ -38,7 +41,9 @@ class GuideCreateDTO(BaseModel):
     @field_validator("estimated_read_time")
     @classmethod
     def validate_read_time(cls, v):
-        return CommonValidators.validate_positive_int(v)
+        if v is not None:
+            return CommonValidators.validate_positive_int(v)
+        return v
 
     @field_validator("category_ids")
     @classmethod
@@ -57,7 +62,10 @@ class GuideUpdateDTO(BaseModel):
         None, description="Rich text content with blocks structure"
     )
     estimated_read_time: Optional[int] = Field(
-        None, ge=1, le=300, description="Estimated read time in minutes"
+        None,
+        ge=1,
+        le=300,
+        description="Estimated read time in minutes, recomputed if omitted with a new body",
     )
     category_ids: Optional[List[UUID]] = Field(
         None, description="Category IDs to associate with this guide"
@@ -108,5 +116,28 @@ class GuideReadDTO(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
     category_ids: List[UUID] = Field(default=[], description="Associated category IDs")
+    excerpt: str = Field(default="", description="Start of the body's text")
+    word_count: int = Field(default=0, description="Words in the body")
+    toc: List[Dict[str, Any]] = Field(
+        default=[], description="Headings of the body: level, text and anchor"
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class GuideSummaryDTO(BaseModel):
+    id: UUID
+    title: str
+    slug: str
+    created_at: datetime
+    updated_at: Optional[datetime]
+    category_ids: List[UUID] = Field(default=[], description="Associated category IDs")
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class GuideTextDTO(BaseModel):
+    id: UUID
+    title: str
+    plaintext: str
+    category_ids: List[UUID] = Field(default=[], description="Associated category IDs")
@@ -0,0 +1,13 @@
+from .cost import QueryCostExtension
+from .document_cache import DocumentCacheExtension
+from .persisted_queries import PersistedQueryExtension
+from .response_cache import ResponseCacheExtension
+from .tracing import TracingExtension
+
+__all__ = [
+    "DocumentCacheExtension",
+    "PersistedQueryExtension",
+    "QueryCostExtension",
+    "ResponseCacheExtension",
+    "TracingExtension",
+]
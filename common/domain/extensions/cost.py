@@ -0,0 +1,203 @@
+"""
+Static query cost and depth analysis.
+
+The schema is cyclic (``Category.guides`` -> ``UserGuide.categories`` -> ...),
+so a small document can fan out into a very large number of rows. Before
+execution the selected operation is walked once: every object field costs its
+weight (1 by default, scalars are free) times the number of parent objects it
+is resolved for, and list fields multiply the cost of their selection by their
+``first`` argument or by an estimated list size. Operations over the cost or
+depth budget are rejected without touching the database; the computed cost is
+returned in ``extensions.cost`` of every response.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from graphql import (
+    ExecutionResult,
+    FieldNode,
+    FragmentDefinitionNode,
+    GraphQLError,
+    GraphQLObjectType,
+    InlineFragmentNode,
+    SelectionSetNode,
+    get_named_type,
+    get_nullable_type,
+    get_operation_ast,
+    is_list_type,
+    is_object_type,
+)
+from graphql.execution.values import get_argument_values
+from strawberry.extensions import SchemaExtension
+
+from ...core.settings import GRAPHQL_MAX_QUERY_COST, GRAPHQL_MAX_QUERY_DEPTH
+
+# Estimated size of list fields without a ``first`` argument, by (type, field)
+LIST_SIZES: Dict[Tuple[str, str], int] = {
+    ("Query", "guides"): 100,
+    ("Query", "categories"): 100,
+    ("Query", "media"): 100,
+    ("Category", "guides"): 50,
+    ("Media", "guides"): 10,
+    ("UserGuide", "categories"): 5,
+    ("UserGuide", "media"): 5,
+}
+DEFAULT_LIST_SIZE = 20
+
+# Fields more expensive than a plain object lookup, by (type, field)
+FIELD_WEIGHTS: Dict[Tuple[str, str], int] = {
+    # Ranking and snippet generation over the full-text index
+    ("Query", "searchGuides"): 10,
+}
+
+
+@dataclass
+class QueryCost:
+    cost: int = 0
+    depth: int = 0
+
+
+class CostAnalyzer:
+    """Compute the cost and depth of one operation of a document."""
+
+    def __init__(self, schema, document, operation_name: Optional[str], variables: dict):
+        self.schema = schema
+        self.variables = variables or {}
+        self.operation = get_operation_ast(document, operation_name)
+        self.fragments = {
+            definition.name.value: definition
+            for definition in document.definitions
+            if isinstance(definition, FragmentDefinitionNode)
+        }
+
+    def analyze(self) -> QueryCost:
+        if self.operation is None:
+            return QueryCost()
+        root_type = self.schema.get_root_type(self.operation.operation)
+        return self._selection_set(self.operation.selection_set, root_type, 1, None, 1)
+
+    def _selection_set(
+        self,
+        selection_set: SelectionSetNode,
+        parent_type: GraphQLObjectType,
+        multiplier: int,
+        page_size: Optional[int],
+        depth: int,
+    ) -> QueryCost:
+        total = QueryCost(depth=depth - 1)
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                cost = self._field(selection, parent_type, multiplier, page_size, depth)
+            else:
+                fragment = (
+                    selection
+                    if isinstance(selection, InlineFragmentNode)
+                    else self.fragments.get(selection.name.value)
+                )
+                if fragment is None:
+                    continue
+                fragment_type = parent_type
+                if fragment.type_condition is not None:
+                    fragment_type = self.schema.get_type(fragment.type_condition.name.value)
+                cost = self._selection_set(
+                    fragment.selection_set, fragment_type, multiplier, page_size, depth
+                )
+            total.cost += cost.cost
+            total.depth = max(total.depth, cost.depth)
+        return total
+
+    def _field(
+        self,
+        node: FieldNode,
+        parent_type: GraphQLObjectType,
+        multiplier: int,
+        page_size: Optional[int],
+        depth: int,
+    ) -> QueryCost:
+        name = node.name.value
+        if name.startswith("__") or not is_object_type(parent_type):
+            return QueryCost(depth=depth)
+
+        field = parent_type.fields[name]
+        named_type = get_named_type(field.type)
+        if not is_object_type(named_type) or node.selection_set is None:
+            return QueryCost(depth=depth)
+
+        key = (parent_type.name, name)
+        cost = multiplier * FIELD_WEIGHTS.get(key, 1)
+
+        first = self._first_argument(field, node)
+        size = 1
+        if is_list_type(get_nullable_type(field.type)):
+            # Connection edges are as long as the page requested on the connection
+            size = first or page_size or LIST_SIZES.get(key, DEFAULT_LIST_SIZE)
+
+        nested = self._selection_set(
+            node.selection_set, named_type, multiplier * size, first, depth + 1
+        )
+        return QueryCost(cost=cost + nested.cost, depth=nested.depth)
+
+    def _first_argument(self, field, node: FieldNode) -> Optional[int]:
+        if "first" not in field.args:
+            return None
+        try:
+            first = get_argument_values(field, node, self.variables).get("first")
+        except GraphQLError:
+            return None
+        return first if isinstance(first, int) and first > 0 else None
+
+
+def analyze_query(schema, document, operation_name: Optional[str], variables: Any) -> QueryCost:
+    return CostAnalyzer(schema, document, operation_name, variables).analyze()
+
+
+class QueryCostExtension(SchemaExtension):
+    """Reject operations over the cost or depth budget before they execute."""
+
+    def __init__(
+        self,
+        *,
+        execution_context=None,
+        max_cost: int = GRAPHQL_MAX_QUERY_COST,
+        max_depth: int = GRAPHQL_MAX_QUERY_DEPTH,
+    ):
+        self.max_cost = max_cost
+        self.max_depth = max_depth
+        self.query_cost: Optional[QueryCost] = None
+
+    def on_execute(self):
+        execution_context = self.execution_context
+        self.query_cost = analyze_query(
+            execution_context.schema._schema,
+            execution_context.graphql_document,
+            execution_context.operation_name,
+            execution_context.variables,
+        )
+
+        error = None
+        if self.query_cost.depth > self.max_depth:
+            error = GraphQLError(
+                f"Query depth {self.query_cost.depth} exceeds the maximum of {self.max_depth}",
+                extensions={"code": "QUERY_TOO_DEEP"},
+            )
+        elif self.query_cost.cost > self.max_cost:
+            error = GraphQLError(
+                f"Query cost {self.query_cost.cost} exceeds the maximum of {self.max_cost}",
+                extensions={"code": "QUERY_TOO_COMPLEX"},
+            )
+        if error is not None:
+            # A preset result makes Strawberry skip execution entirely
+            execution_context.result = ExecutionResult(data=None, errors=[error])
+        yield
+
+    def get_results(self) -> Dict[str, Any]:
+        if self.query_cost is None:
+            return {}
+        return {
+            "cost": {
+                "requestedQueryCost": self.query_cost.cost,
+                "maximumAvailable": self.max_cost,
+                "depth": self.query_cost.depth,
+            }
+        }
@@ -0,0 +1,60 @@
+"""
+Cache of parsed and validated GraphQL documents.
+
+Identical query text is parsed and validated once per process: the parsed AST
+and the validation errors (usually none) are kept in a bounded LRU keyed by
+the sha256 of the query, and later requests skip both steps. The schema is
+static, so a document that validated once stays valid until the next deploy.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import List, Optional
+
+from graphql import DocumentNode, GraphQLError
+from strawberry.extensions import SchemaExtension
+
+from ...core.cache import LRUCache
+from ...core.settings import GRAPHQL_DOCUMENT_CACHE_SIZE
+
+
+@dataclass
+class CachedDocument:
+    document: DocumentNode
+    # None until the document has been validated once
+    errors: Optional[List[GraphQLError]] = None
+
+
+document_cache: LRUCache[str, CachedDocument] = LRUCache(GRAPHQL_DOCUMENT_CACHE_SIZE)
+
+
+class DocumentCacheExtension(SchemaExtension):
+    """Skip parsing and validation for query text that was seen before."""
+
+    def __init__(self, *, execution_context=None, cache: LRUCache = document_cache):
+        self.cache = cache
+        self.entry: Optional[CachedDocument] = None
+
+    def on_parse(self):
+        execution_context = self.execution_context
+        key = hashlib.sha256(execution_context.query.encode()).hexdigest()
+
+        self.entry = self.cache.get(key)
+        if self.entry is not None:
+            execution_context.graphql_document = self.entry.document
+        yield
+
+        # Parse errors are not cached; the document is only set on success
+        if self.entry is None and execution_context.graphql_document is not None:
+            self.entry = CachedDocument(execution_context.graphql_document)
+            self.cache.set(key, self.entry)
+
+    def on_validate(self):
+        execution_context = self.execution_context
+        if self.entry is not None and self.entry.errors is not None:
+            # An empty list tells Strawberry validation already ran
+            execution_context.pre_execution_errors = self.entry.errors
+        yield
+
+        if self.entry is not None and self.entry.errors is None:
+            self.entry.errors = execution_context.pre_execution_errors or []
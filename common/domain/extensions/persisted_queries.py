@@ -0,0 +1,138 @@
+"""
+Automatic persisted queries (APQ).
+
+Clients send ``extensions.persistedQuery.sha256Hash`` instead of the query
+text. A known hash is resolved from the registry; an unknown one answers with
+``PersistedQueryNotFound`` and the client retries once with the full query,
+which is verified against the hash and registered once it has parsed and
+validated. Queries sent by hash keep GET URLs short enough to be cached by a
+CDN.
+
+The registry is an in-process LRU, backed by Redis when ``REDIS_URL`` is set
+so every worker learns a hash as soon as one of them has seen it.
+"""
+
+import hashlib
+from typing import Optional
+
+from graphql import GraphQLError
+from strawberry.extensions import SchemaExtension
+
+from ...core.cache import LRUCache
+from ...core.logger import get_logger
+from ...core.rate_limiting import get_redis_client
+from ...core.settings import APQ_CACHE_SIZE, APQ_MAX_QUERY_LENGTH, APQ_REDIS_TTL
+
+logger = get_logger("persisted_queries")
+
+REDIS_KEY_PREFIX = "apq:"
+
+
+class PersistedQueryRegistry:
+    """Maps sha256 hashes to query documents."""
+
+    def __init__(self, maxsize: int = APQ_CACHE_SIZE, ttl: int = APQ_REDIS_TTL):
+        self.cache: LRUCache[str, str] = LRUCache(maxsize)
+        self.ttl = ttl
+
+    async def get(self, sha256_hash: str) -> Optional[str]:
+        """Resolve a hash, falling back to Redis on a local miss."""
+        query = self.cache.get(sha256_hash)
+        if query is not None:
+            return query
+
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return None
+        try:
+            value = await redis_client.get(REDIS_KEY_PREFIX + sha256_hash)
+        except Exception as e:
+            logger.warning(f"Failed to read persisted query from Redis: {e}")
+            return None
+        if value is None:
+            return None
+
+        query = value.decode() if isinstance(value, bytes) else value
+        self.cache.set(sha256_hash, query)
+        return query
+
+    async def set(self, sha256_hash: str, query: str) -> None:
+        """Register a verified query under its hash."""
+        self.cache.set(sha256_hash, query)
+
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return
+        try:
+            await redis_client.set(REDIS_KEY_PREFIX + sha256_hash, query, ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Failed to write persisted query to Redis: {e}")
+
+
+registry = PersistedQueryRegistry()
+
+
+def hash_query(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+class PersistedQueryExtension(SchemaExtension):
+    """Resolve ``extensions.persistedQuery`` hashes into query documents."""
+
+    def __init__(
+        self,
+        *,
+        execution_context=None,
+        registry: PersistedQueryRegistry = registry,
+        max_query_length: int = APQ_MAX_QUERY_LENGTH,
+    ):
+        self.registry = registry
+        self.max_query_length = max_query_length
+        # Hash of a full query to register once it is known to be valid
+        self.pending_hash: Optional[str] = None
+
+    async def on_operation(self):
+        persisted_query = (self.execution_context.operation_extensions or {}).get("persistedQuery")
+        if persisted_query:
+            await self._resolve(persisted_query)
+        yield
+
+    async def on_validate(self):
+        yield
+        # Only documents that parsed and validated are stored
+        if self.pending_hash is not None and not self.execution_context.pre_execution_errors:
+            await self.registry.set(self.pending_hash, self.execution_context.query)
+
+    async def _resolve(self, persisted_query: dict) -> None:
+        if persisted_query.get("version") != 1:
+            raise GraphQLError(
+                "Unsupported persisted query version",
+                extensions={"code": "PERSISTED_QUERY_NOT_SUPPORTED"},
+            )
+
+        sha256_hash = persisted_query.get("sha256Hash")
+        if not isinstance(sha256_hash, str):
+            raise GraphQLError(
+                "persistedQuery.sha256Hash must be a string", extensions={"code": "BAD_REQUEST"}
+            )
+
+        query = self.execution_context.query
+        if query is None:
+            query = await self.registry.get(sha256_hash)
+            if query is None:
+                raise GraphQLError(
+                    "PersistedQueryNotFound", extensions={"code": "PERSISTED_QUERY_NOT_FOUND"}
+                )
+            self.execution_context.query = query
+            return
+
+        # Full query sent after a miss: only register it if it matches the hash
+        if hash_query(query) != sha256_hash:
+            raise GraphQLError(
+                "provided sha does not match query", extensions={"code": "BAD_REQUEST"}
+            )
+        if len(query) > self.max_query_length:
+            # Still executed, just never stored
+            logger.info("Persisted query too long to register", extra={"query_length": len(query)})
+            return
+        self.pending_hash = sha256_hash
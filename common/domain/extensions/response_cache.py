@@ -0,0 +1,279 @@
+"""
+GraphQL response cache.
+
+Query results are cached under the sha256 of the normalized document, the
+variables and the operation name, in an in-process LRU and, when Redis is
+configured, in Redis so all instances share them. Each entry is tagged with
+the GraphQL types its document selects, and with the types its arguments
+filter by (``categorySlug`` makes a guide list depend on categories); a
+``ContentChanged`` event for an entity drops every entry tagged with that
+entity's types, locally and in Redis.
+
+A result computed before an invalidation must not be stored after it. Within
+one process the local ``generation`` counter guards that; across instances
+every invalidation also increments a generation counter in Redis, and a
+result is only written to Redis (under WATCH) if that counter has not moved
+since its execution started.
+
+Editor writes publish those events (see ``common.core.events``), so with Redis
+a cached response never outlives the content it was built from by more than
+the time it takes the event to arrive. Without Redis the events of other
+instances never arrive; the cache is then per process and cleared when the
+content poll notices a change, so entries may be stale for up to
+``CONTENT_POLL_SECONDS``.
+"""
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from graphql import (
+    ExecutionResult,
+    TypeInfo,
+    TypeInfoVisitor,
+    Visitor,
+    get_named_type,
+    print_ast,
+    visit,
+)
+from redis.exceptions import WatchError
+from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
+
+from ...core.cache import LRUCache
+from ...core.events import REFRESHED, ContentChanged
+from ...core.logger import get_logger
+from ...core.rate_limiting import get_redis_client
+from ...core.settings import GRAPHQL_RESPONSE_CACHE_SIZE, GRAPHQL_RESPONSE_CACHE_TTL
+
+logger = get_logger("response_cache")
+
+REDIS_KEY_PREFIX = "gqlresponse:"
+REDIS_TAG_PREFIX = "gqlresponse:tag:"
+# Outside REDIS_KEY_PREFIX so that ``clear`` never deletes it
+REDIS_GENERATION_KEY = "gqlresponse-generation"
+
+# (local generation, Redis generation) when an execution started
+Generation = Tuple[int, Optional[Any]]
+
+# GraphQL types whose cached responses a change to each entity invalidates
+ENTITY_TYPES: Dict[str, FrozenSet[str]] = {
+    "guide": frozenset(
+        {
+            "UserGuide",
+            "UserGuideConnection",
+            "GuideSearchHit",
+            "GuideSearchHitConnection",
+            "Suggestion",
+        }
+    ),
+    "category": frozenset({"Category", "CategoryConnection", "Suggestion"}),
+    "media": frozenset({"Media", "MediaConnection"}),
+}
+
+# Arguments whose value refers to another entity, by argument name
+ARGUMENT_TYPES: Dict[str, FrozenSet[str]] = {
+    "categorySlug": frozenset({"Category"}),
+}
+
+
+@dataclass
+class CachedResponse:
+    data: Dict[str, Any]
+    tags: FrozenSet[str]
+    expires_at: float
+
+
+class ResponseCache:
+    """Tagged response store: in-process LRU in front of optional Redis."""
+
+    def __init__(
+        self, maxsize: int = GRAPHQL_RESPONSE_CACHE_SIZE, ttl: int = GRAPHQL_RESPONSE_CACHE_TTL
+    ):
+        self.entries: LRUCache[str, CachedResponse] = LRUCache(maxsize)
+        self.ttl = ttl
+        # Bumped by every invalidation so results computed before it are not stored
+        self.generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(key)
+        if entry is not None:
+            if entry.expires_at > time.monotonic():
+                return entry.data
+            self.entries.pop(key)
+
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return None
+        try:
+            value = await redis_client.get(REDIS_KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning(f"Failed to read cached response from Redis: {e}")
+            return None
+        if value is None:
+            return None
+
+        payload = json.loads(value)
+        self._store_local(key, payload["data"], frozenset(payload["tags"]))
+        return payload["data"]
+
+    async def current_generation(self) -> Generation:
+        """Taken before executing; ``set`` drops the result if either part moved."""
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return self.generation, None
+        try:
+            return self.generation, await redis_client.get(REDIS_GENERATION_KEY)
+        except Exception as e:
+            logger.warning(f"Failed to read the response cache generation from Redis: {e}")
+            return self.generation, None
+
+    async def set(
+        self, key: str, data: Dict[str, Any], tags: FrozenSet[str], generation: Generation
+    ) -> None:
+        local_generation, redis_generation = generation
+        if local_generation != self.generation:
+            return
+
+        redis_client = get_redis_client()
+        if redis_client is not None:
+            try:
+                async with redis_client.pipeline(transaction=True) as pipe:
+                    await pipe.watch(REDIS_GENERATION_KEY)
+                    if await pipe.get(REDIS_GENERATION_KEY) != redis_generation:
+                        # Invalidated on some instance while this result was computed
+                        return
+                    pipe.multi()
+                    payload = json.dumps({"data": data, "tags": sorted(tags)})
+                    pipe.set(REDIS_KEY_PREFIX + key, payload, ex=self.ttl)
+                    for tag in tags:
+                        pipe.sadd(REDIS_TAG_PREFIX + tag, key)
+                        pipe.expire(REDIS_TAG_PREFIX + tag, self.ttl)
+                    await pipe.execute()
+            except WatchError:
+                return
+            except Exception as e:
+                logger.warning(f"Failed to write cached response to Redis: {e}")
+
+        if local_generation == self.generation:
+            self._store_local(key, data, tags)
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        """Drop every entry tagged with any of ``tags``."""
+        tags = frozenset(tags)
+        self.generation += 1
+        for key in self.entries.keys():
+            entry = self.entries.peek(key)
+            if entry is not None and entry.tags & tags:
+                self.entries.pop(key)
+
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return
+        try:
+            # Before deleting, so a write racing with this one fails its WATCH
+            await redis_client.incr(REDIS_GENERATION_KEY)
+            for tag in tags:
+                keys = await redis_client.smembers(REDIS_TAG_PREFIX + tag)
+                names = [
+                    REDIS_KEY_PREFIX + (k.decode() if isinstance(k, bytes) else k) for k in keys
+                ]
+                await redis_client.delete(REDIS_TAG_PREFIX + tag, *names)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate cached responses in Redis: {e}")
+
+    async def clear(self) -> None:
+        """Drop every cached response, e.g. after content was changed out of band."""
+        self.generation += 1
+        self.entries.clear()
+
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return
+        try:
+            await redis_client.incr(REDIS_GENERATION_KEY)
+            keys = [key async for key in redis_client.scan_iter(match=REDIS_KEY_PREFIX + "*")]
+            if keys:
+                await redis_client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Failed to clear cached responses in Redis: {e}")
+
+    async def handle_content_change(self, event: ContentChanged) -> None:
+        if event == REFRESHED:
+            await self.clear()
+        else:
+            await self.invalidate(ENTITY_TYPES.get(event.entity, frozenset()))
+
+    def _store_local(self, key: str, data: Dict[str, Any], tags: FrozenSet[str]) -> None:
+        self.entries.set(key, CachedResponse(data, tags, time.monotonic() + self.ttl))
+
+
+response_cache = ResponseCache()
+
+
+def cache_key(document, variables: Optional[dict], operation_name: Optional[str]) -> str:
+    """Hash of the normalized document, variables and operation name."""
+    payload = json.dumps(
+        [print_ast(document), variables or {}, operation_name], sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def referenced_types(schema, document) -> FrozenSet[str]:
+    """Names of the GraphQL types selected or filtered by anywhere in ``document``."""
+    type_info = TypeInfo(schema)
+    names = set()
+
+    class Collector(Visitor):
+        def enter_field(self, *_):
+            field_type = type_info.get_type()
+            if field_type is not None:
+                names.add(get_named_type(field_type).name)
+
+        def enter_argument(self, node, *_):
+            names.update(ARGUMENT_TYPES.get(node.name.value, ()))
+
+    visit(document, TypeInfoVisitor(type_info, Collector()))
+    return frozenset(names)
+
+
+class ResponseCacheExtension(SchemaExtension):
+    """Serve repeated queries from the response cache."""
+
+    def __init__(self, *, execution_context=None, cache: ResponseCache = response_cache):
+        self.cache = cache
+
+    async def on_execute(self):
+        execution_context = self.execution_context
+        key = None
+        # A result may already be set, e.g. when the operation was rejected
+        if (
+            self.cache.enabled
+            and execution_context.result is None
+            and execution_context.operation_type == OperationType.QUERY
+        ):
+            key = cache_key(
+                execution_context.graphql_document,
+                execution_context.variables,
+                execution_context.operation_name,
+            )
+            data = await self.cache.get(key)
+            if data is not None:
+                execution_context.result = ExecutionResult(data=data)
+                key = None
+            else:
+                generation = await self.cache.current_generation()
+        yield
+
+        result = execution_context.result
+        if key is not None and isinstance(result, ExecutionResult) and not result.errors:
+            tags = referenced_types(
+                execution_context.schema._schema, execution_context.graphql_document
+            )
+            await self.cache.set(key, result.data, tags, generation)
@@ -0,0 +1,168 @@
+"""
+Per-operation tracing of resolver time and SQL statements.
+
+While an operation runs, every asynchronous resolver (the ones that do I/O) is
+timed, and every SQL statement issued through an instrumented engine is
+counted and timed, both for the whole operation and for the resolver it ran
+under. Resolver stats are aggregated by path without list indices, e.g.
+``guides.categories``. The trace is always logged as structured fields and is
+returned in ``extensions.tracing`` when the request carries the debug header
+and ``GRAPHQL_TRACING_RESPONSES`` is enabled (it is off in production).
+
+DataLoader batches run in their own tasks; their statements count towards the
+resolver that first requested the batch.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from inspect import isawaitable
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from strawberry.extensions import SchemaExtension
+
+from ...core.db import get_engines
+from ...core.logger import get_logger
+from ...core.settings import GRAPHQL_TRACING_RESPONSES
+
+logger = get_logger("tracing")
+
+TRACE_HEADER = "x-debug-trace"
+
+
+@dataclass
+class ResolverStats:
+    calls: int = 0
+    duration: float = 0.0
+    sql_count: int = 0
+    sql_duration: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "durationMs": round(self.duration * 1000, 3),
+            "sqlCount": self.sql_count,
+            "sqlDurationMs": round(self.sql_duration * 1000, 3),
+        }
+
+
+@dataclass
+class OperationTrace:
+    sql_count: int = 0
+    sql_duration: float = 0.0
+    resolvers: Dict[str, ResolverStats] = field(default_factory=dict)
+
+
+_trace: ContextVar[Optional[OperationTrace]] = ContextVar("graphql_trace", default=None)
+_resolver: ContextVar[Optional[ResolverStats]] = ContextVar("graphql_trace_resolver", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _trace.get() is not None:
+        conn.info.setdefault("trace_statement_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = _trace.get()
+    starts = conn.info.get("trace_statement_start")
+    if trace is None or not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    trace.sql_count += 1
+    trace.sql_duration += elapsed
+
+    stats = _resolver.get()
+    if stats is not None:
+        stats.sql_count += 1
+        stats.sql_duration += elapsed
+
+
+def instrument_engine(engine: Union[AsyncEngine, Engine]) -> None:
+    """Count and time statements of ``engine`` for traced operations (idempotent)."""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+async def _timed(trace: OperationTrace, result, info):
+    path = ".".join(key for key in info.path.as_list() if isinstance(key, str))
+    stats = trace.resolvers.setdefault(path, ResolverStats())
+    token = _resolver.set(stats)
+    start = time.perf_counter()
+    try:
+        return await result
+    finally:
+        stats.calls += 1
+        stats.duration += time.perf_counter() - start
+        _resolver.reset(token)
+
+
+class TracingExtension(SchemaExtension):
+    """Record resolver wall time and SQL statements of each operation."""
+
+    def __init__(self, *, execution_context=None, responses: bool = GRAPHQL_TRACING_RESPONSES):
+        self.responses = responses
+        self.trace: Optional[OperationTrace] = None
+        self.started_at = 0.0
+        self.duration = 0.0
+
+    def on_operation(self):
+        for engine in get_engines():
+            instrument_engine(engine)
+        self.trace = OperationTrace()
+        _trace.set(self.trace)
+        self.started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.duration = time.perf_counter() - self.started_at
+            # Not reset with a token: Strawberry may close this generator from
+            # another context when the operation is rejected before execution
+            _trace.set(None)
+            self._log()
+
+    # Strawberry builds its resolver middleware once, from the first request's
+    # extension instances, so per-operation state is read from the context
+    def resolve(self, _next, root, info, *args, **kwargs):
+        result = _next(root, info, *args, **kwargs)
+        trace = _trace.get()
+        # Only asynchronous resolvers do I/O; plain attribute reads stay untimed
+        if trace is None or not isawaitable(result):
+            return result
+        return _timed(trace, result, info)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "durationMs": round(self.duration * 1000, 3),
+            "sqlCount": self.trace.sql_count,
+            "sqlDurationMs": round(self.trace.sql_duration * 1000, 3),
+            "resolvers": {path: stats.as_dict() for path, stats in self.trace.resolvers.items()},
+        }
+
+    def get_results(self) -> Dict[str, Any]:
+        if self.trace is None or not self.responses or not self._requested():
+            return {}
+        # Results are collected before on_operation finishes; take the time so far
+        self.duration = time.perf_counter() - self.started_at
+        return {"tracing": self.summary()}
+
+    def _requested(self) -> bool:
+        context = self.execution_context.context
+        request = context.get("request") if isinstance(context, dict) else None
+        return request is not None and TRACE_HEADER in request.headers
+
+    def _log(self) -> None:
+        summary = self.summary()
+        logger.info(
+            "GraphQL operation traced",
+            extra={
+                "operation_name": self.execution_context.operation_name,
+                "duration_ms": summary["durationMs"],
+                "sql_count": summary["sqlCount"],
+                "sql_duration_ms": summary["sqlDurationMs"],
+                "resolvers": summary["resolvers"],
+            },
+        )
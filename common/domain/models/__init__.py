@@ -1,8 +1,9 @@
+from sqlalchemy import DDL, event
 from sqlmodel import SQLModel
 
 from .category import Category, GuideCategoryLink
 from .feedback import Feedback
-from .guide import UserGuide
+from .guide import GuideRelated, UserGuide
 from .media import GuideMediaLink, Media
 
 __all__ = [
@@ -11,7 +12,15 @@ __all__ = [
     "Media",
     "GuideMediaLink",
     "UserGuide",
+    "GuideRelated",
     "Feedback",
 ]
 
 metadata = SQLModel.metadata
+
+# Trigram operator classes of the fuzzy search indexes
+event.listen(
+    metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -2,19 +2,34 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime
+from sqlalchemy import DateTime, Index
 from sqlmodel import Column, Field, Relationship, SQLModel
 
 from ...utils.time import utcnow
 
 
 class GuideCategoryLink(SQLModel, table=True):
-    guide_id: UUID = Field(foreign_key="userguide.id", primary_key=True)
-    category_id: UUID = Field(foreign_key="category.id", primary_key=True)
+    # The primary key serves guide -> categories; this index category -> guides
+    __table_args__ = (
+        Index("ix_guidecategorylink_category_id_guide_id", "category_id", "guide_id"),
+    )
+
+    # Links go with either side (ON DELETE CASCADE)
+    guide_id: UUID = Field(foreign_key="userguide.id", primary_key=True, ondelete="CASCADE")
+    category_id: UUID = Field(foreign_key="category.id", primary_key=True, ondelete="CASCADE")
 
 
 class Category(SQLModel, table=True):
     __tablename__ = "category"
+    # Trigram index for fuzzy search
+    __table_args__ = (
+        Index(
+            "ix_category_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, nullable=False)
     name: str = Field(nullable=False, index=True)
@@ -27,5 +42,7 @@ class Category(SQLModel, table=True):
     updated_at: Optional[datetime] = Field(sa_column=Column(DateTime(timezone=True)))
 
     guides: List["UserGuide"] = Relationship(
-        back_populates="categories", link_model=GuideCategoryLink
+        back_populates="categories",
+        link_model=GuideCategoryLink,
+        sa_relationship_kwargs={"passive_deletes": True},
     )
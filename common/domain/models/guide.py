@@ -2,31 +2,162 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy import DDL, DateTime, Index, Integer, Text, event
+from sqlalchemy.dialects.postgresql import JSON, JSONB, TSVECTOR
 from sqlmodel import Column, Field, Relationship, SQLModel
 
 from ...utils.time import utcnow
 from .category import GuideCategoryLink
 from .media import GuideMediaLink
 
+# Text of the body blocks of the given types (all blocks when NULL), in order,
+# and the weighted search document: title (A), headings (B), paragraphs and
+# list items (C), and the trigger function keeping search_vector current. Kept in
+# sync with the migrations creating them (jsonb since b8c0d2e4f6a8).
+SEARCH_FUNCTIONS = (
+    """
+CREATE OR REPLACE FUNCTION userguide_block_text(body jsonb, block_types text[] DEFAULT NULL)
+RETURNS text LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT coalesce(string_agg(texts.text, ' ' ORDER BY blocks.position, texts.position), '')
+    FROM jsonb_array_elements(
+        CASE WHEN jsonb_typeof(body -> 'blocks') = 'array' THEN body -> 'blocks' ELSE '[]' END
+    ) WITH ORDINALITY AS blocks(block, position)
+    CROSS JOIN LATERAL (
+        SELECT blocks.block ->> 'text', 0
+        WHERE jsonb_typeof(blocks.block) = 'object' AND blocks.block ->> 'text' IS NOT NULL
+        UNION ALL
+        SELECT item, position
+        FROM jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(blocks.block) = 'object'
+                AND jsonb_typeof(blocks.block -> 'items') = 'array'
+            THEN blocks.block -> 'items' ELSE '[]' END
+        ) WITH ORDINALITY AS items(item, position)
+    ) AS texts(text, position)
+    WHERE block_types IS NULL OR blocks.block ->> 'type' = ANY (block_types)
+$$
+""",
+    """
+CREATE OR REPLACE FUNCTION userguide_search_vector(title text, body jsonb)
+RETURNS tsvector LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', userguide_block_text(body, ARRAY['heading'])), 'B')
+        || setweight(
+            to_tsvector('english', userguide_block_text(body, ARRAY['paragraph', 'list'])), 'C'
+        )
+$$
+""",
+    """
+CREATE OR REPLACE FUNCTION userguide_search_vector_update() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := userguide_search_vector(NEW.title, NEW.body);
+    RETURN NEW;
+END
+$$
+""",
+)
+# Maintains search_vector; a trigger rather than a generated column since b8c0d2e4f6a8
+SEARCH_VECTOR_TRIGGER = """
+CREATE TRIGGER userguide_search_vector_update BEFORE INSERT OR UPDATE OF title, body
+ON userguide FOR EACH ROW EXECUTE FUNCTION userguide_search_vector_update()
+"""
+
+
+class GuideRelated(SQLModel, table=True):
+    """Precomputed related guides of a guide, best first (rank 1), see services/related.py."""
+
+    __tablename__ = "guide_related"
+
+    guide_id: UUID = Field(foreign_key="userguide.id", primary_key=True, ondelete="CASCADE")
+    rank: int = Field(primary_key=True)
+    related_id: UUID = Field(
+        foreign_key="userguide.id", nullable=False, index=True, ondelete="CASCADE"
+    )
+    score: float = Field(nullable=False)
+
 
 class UserGuide(SQLModel, table=True):
     __tablename__ = "userguide"
+    __table_args__ = (
+        # Keyset pagination sort key
+        Index("ix_userguide_created_at_id", "created_at", "id"),
+        # Full-text search document, maintained by a trigger; not mapped so rows
+        # never load it
+        Column("search_vector", TSVECTOR),
+        Index("ix_userguide_search_vector", "search_vector", postgresql_using="gin"),
+        # Containment (@>) queries on the body, e.g. guides with a block of some type
+        Index(
+            "ix_userguide_body_path_ops",
+            "body",
+            postgresql_using="gin",
+            postgresql_ops={"body": "jsonb_path_ops"},
+        ),
+        # Trigram indexes for fuzzy search
+        Index(
+            "ix_userguide_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_userguide_slug_trgm",
+            "slug",
+            postgresql_using="gin",
+            postgresql_ops={"slug": "gin_trgm_ops"},
+        ),
+    )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, nullable=False)
     title: str = Field(nullable=False)
     slug: str = Field(unique=True, index=True, nullable=False)
 
-    body: dict = Field(sa_column=Column(JSON, nullable=False))
+    body: dict = Field(sa_column=Column(JSONB, nullable=False))
     estimated_read_time: int = Field(nullable=False)
 
+    # Derived from body whenever the repository writes it (utils/rich_text.derive_content)
+    plaintext: str = Field(default="", sa_column=Column(Text, nullable=False, server_default=""))
+    excerpt: str = Field(default="", sa_column=Column(Text, nullable=False, server_default=""))
+    word_count: int = Field(
+        default=0, sa_column=Column(Integer, nullable=False, server_default="0")
+    )
+    toc: list = Field(
+        default_factory=list, sa_column=Column(JSON, nullable=False, server_default="[]")
+    )
+
     created_at: datetime = Field(
         sa_column=Column(DateTime(timezone=True), default=utcnow, nullable=False)
     )
     updated_at: Optional[datetime] = Field(sa_column=Column(DateTime(timezone=True)))
 
+    # Link rows are deleted by the database (ON DELETE CASCADE), not loaded to be deleted
     categories: List["Category"] = Relationship(
-        back_populates="guides", link_model=GuideCategoryLink
+        back_populates="guides",
+        link_model=GuideCategoryLink,
+        sa_relationship_kwargs={"passive_deletes": True},
+    )
+    media: List["Media"] = Relationship(
+        back_populates="guides",
+        link_model=GuideMediaLink,
+        sa_relationship_kwargs={"passive_deletes": True},
+    )
+    # Read through the (guide_id, rank) primary key of guide_related
+    related: List["UserGuide"] = Relationship(
+        sa_relationship_kwargs={
+            "secondary": "guide_related",
+            "primaryjoin": "UserGuide.id == GuideRelated.guide_id",
+            "secondaryjoin": "UserGuide.id == GuideRelated.related_id",
+            "order_by": "GuideRelated.rank",
+            "viewonly": True,
+        }
+    )
+
+
+for statement in SEARCH_FUNCTIONS:
+    event.listen(
+        UserGuide.__table__, "before_create", DDL(statement).execute_if(dialect="postgresql")
     )
-    media: List["Media"] = Relationship(back_populates="guides", link_model=GuideMediaLink)
+event.listen(
+    UserGuide.__table__,
+    "after_create",
+    DDL(SEARCH_VECTOR_TRIGGER).execute_if(dialect="postgresql"),
+)
@@ -2,19 +2,25 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime
+from sqlalchemy import DateTime, Index
 from sqlmodel import Column, Field, Relationship, SQLModel
 
 from ...utils.time import utcnow
 
 
 class GuideMediaLink(SQLModel, table=True):
-    guide_id: UUID = Field(foreign_key="userguide.id", primary_key=True)
-    media_id: UUID = Field(foreign_key="media.id", primary_key=True)
+    # The primary key serves guide -> media; this index media -> guides
+    __table_args__ = (Index("ix_guidemedialink_media_id_guide_id", "media_id", "guide_id"),)
+
+    # Links go with either side (ON DELETE CASCADE)
+    guide_id: UUID = Field(foreign_key="userguide.id", primary_key=True, ondelete="CASCADE")
+    media_id: UUID = Field(foreign_key="media.id", primary_key=True, ondelete="CASCADE")
 
 
 class Media(SQLModel, table=True):
     __tablename__ = "media"
+    # Keyset pagination sort key
+    __table_args__ = (Index("ix_media_created_at_id", "created_at", "id"),)
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, nullable=False)
     alt: Optional[str] = Field(default=None)
@@ -25,4 +31,8 @@ class Media(SQLModel, table=True):
     )
     updated_at: Optional[datetime] = Field(sa_column=Column(DateTime(timezone=True)))
 
-    guides: List["UserGuide"] = Relationship(back_populates="media", link_model=GuideMediaLink)
+    guides: List["UserGuide"] = Relationship(
+        back_populates="media",
+        link_model=GuideMediaLink,
+        sa_relationship_kwargs={"passive_deletes": True},
+    )
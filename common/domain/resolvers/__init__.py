@@ -4,10 +4,11 @@ from .category import CategoryQuery
 from .feedback import FeedbackMutation
 from .guide import GuideQuery
 from .media import MediaQuery
+from .suggestion import SuggestionQuery
 
 
 @strawberry.type
-class Query(CategoryQuery, GuideQuery, MediaQuery):
+class Query(CategoryQuery, GuideQuery, MediaQuery, SuggestionQuery):
     """Root Query composed of all sub-queries."""
 
 
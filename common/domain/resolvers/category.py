@@ -1,53 +1,21 @@
-from datetime import datetime
 from typing import List, Optional
 
 import strawberry
 
 from ...services.category import CategoryService
-from ...services.guide import GuideService
+from ..models import Category as CategoryModel
 from ..schema import Category as CategoryType
-from ..schema import UserGuide as GuideType
+from ..schema import Connection
+from .pagination import (
+    DEFAULT_PAGE_SIZE,
+    check_page_size,
+    page_options,
+    parse_after,
+    to_connection,
+)
+from .selection import query_options, to_types
 
-
-def to_guide(
-    guide_id: str,
-    title: str,
-    slug: str,
-    estimated_read_time: int,
-    created_at: datetime,
-    updated_at: Optional[datetime] = None,
-) -> GuideType:
-    return GuideType(
-        id=guide_id,
-        title=title,
-        slug=slug,
-        estimatedReadTime=estimated_read_time,
-        body={"blocks": []},  # Empty body for category listings
-        createdAt=created_at,
-        updatedAt=updated_at,
-        categories=[],
-        media=[],
-    )
-
-
-def to_category(
-    category_id: str,
-    name: str,
-    description: str,
-    slug: str,
-    created_at: datetime,
-    updated_at: Optional[datetime] = None,
-    guides: List[GuideType] = None,
-) -> CategoryType:
-    return CategoryType(
-        id=category_id,
-        name=name,
-        description=description,
-        slug=slug,
-        createdAt=created_at,
-        updatedAt=updated_at,
-        guides=guides or [],
-    )
+CATEGORY_KEYS = ("slug",)
 
 
 @strawberry.type
@@ -57,90 +25,42 @@ class CategoryQuery:
         get_session = info.context["get_session"]
         async with get_session() as session:
             category_service = CategoryService()
-            guide_service = GuideService()
-
-            # Get all categories from database
-            categories_dto = await category_service.list_categories(session)
-
-            # Convert to GraphQL types and include guides
-            result = []
-            for category_dto in categories_dto:
-                # Get guides for this category
-                guides_dto = await guide_service.list_guides_by_category(
-                    session, str(category_dto.id)
-                )
-
-                # Convert guides to GraphQL types
-                guides = []
-                for guide_dto in guides_dto:
-                    guides.append(
-                        GuideType(
-                            id=str(guide_dto.id),
-                            title=guide_dto.title,
-                            slug=guide_dto.slug,
-                            estimatedReadTime=guide_dto.estimated_read_time,
-                            body=guide_dto.body,
-                            createdAt=guide_dto.created_at,
-                            updatedAt=guide_dto.updated_at,
-                            categories=[],  # Avoid circular reference
-                            media=[],
-                        )
-                    )
 
-                # Convert category to GraphQL type
-                result.append(
-                    CategoryType(
-                        id=str(category_dto.id),
-                        name=category_dto.name,
-                        description=category_dto.description,
-                        slug=category_dto.slug,
-                        createdAt=category_dto.created_at,
-                        updatedAt=category_dto.updated_at,
-                        guides=guides,
-                    )
-                )
-
-            return result
+            # Load only the columns and relationships the client selected
+            categories = await category_service.list_categories_for_selection(
+                session, query_options(info, CategoryModel)
+            )
+            return to_types(info, categories)
 
     @strawberry.field
     async def category(self, info, slug: str) -> Optional[CategoryType]:
         get_session = info.context["get_session"]
         async with get_session() as session:
             category_service = CategoryService()
-            guide_service = GuideService()
 
-            # Get category by slug from database
-            category_dto = await category_service.get_category_by_slug(session, slug)
-            if not category_dto:
-                return None
+            # Get category by slug, loading only what the client selected
+            category = await category_service.get_category_by_slug_for_selection(
+                session, slug, query_options(info, CategoryModel)
+            )
+            return to_types(info, [category])[0] if category else None
 
-            # Get guides for this category
-            guides_dto = await guide_service.list_guides_by_category(session, str(category_dto.id))
+    @strawberry.field
+    async def categoriesConnection(
+        self, info, first: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> Connection[CategoryType]:
+        """Categories in slug order, paginated by slug cursors."""
+        check_page_size(first)
+        keyset = parse_after(after, (str,))
+        get_session = info.context["get_session"]
+        category_service = CategoryService()
 
-            # Convert guides to GraphQL types
-            guides = []
-            for guide_dto in guides_dto:
-                guides.append(
-                    GuideType(
-                        id=str(guide_dto.id),
-                        title=guide_dto.title,
-                        slug=guide_dto.slug,
-                        estimatedReadTime=guide_dto.estimated_read_time,
-                        body=guide_dto.body,
-                        createdAt=guide_dto.created_at,
-                        updatedAt=guide_dto.updated_at,
-                        categories=[],  # Avoid circular reference
-                        media=[],
-                    )
-                )
+        async def count_total() -> int:
+            async with get_session() as session:
+                return await category_service.count_categories(session)
 
-            # Convert category to GraphQL type
-            return CategoryType(
-                id=str(category_dto.id),
-                name=category_dto.name,
-                description=category_dto.description,
-                slug=category_dto.slug,
-                createdAt=category_dto.created_at,
-                updatedAt=category_dto.updated_at,
-                guides=guides,
+        async with get_session() as session:
+            # One index range scan for the page, fetching one extra row for hasNextPage
+            categories = await category_service.list_categories_page_for_selection(
+                session, first, keyset, page_options(info, CategoryModel, CATEGORY_KEYS)
             )
+            return to_connection(info, categories, first, after, CATEGORY_KEYS, count_total)
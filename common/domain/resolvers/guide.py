@@ -1,13 +1,33 @@
+from datetime import datetime
 from typing import List, Optional
+from uuid import UUID
 
 import strawberry
 
-from ...services.category import CategoryService
+from ...core import settings
 from ...services.guide import GuideService
-from ...services.media import MediaService
-from ..schema import Category as CategoryType
-from ..schema import Media as MediaType
+from ..models import UserGuide as GuideModel
+from ..schema import Connection, GuideSearchHit
 from ..schema import UserGuide as GuideType
+from .pagination import (
+    DEFAULT_PAGE_SIZE,
+    check_page_size,
+    page_options,
+    parse_after,
+    parse_offset,
+    to_connection,
+    to_offset_connection,
+)
+from .selection import (
+    loader_options,
+    node_fields,
+    query_options,
+    subfields,
+    to_type,
+    to_types,
+)
+
+GUIDE_KEYS = ("created_at", "id")
 
 
 @strawberry.type
@@ -17,74 +37,13 @@ class GuideQuery:
         get_session = info.context["get_session"]
         async with get_session() as session:
             guide_service = GuideService()
-            category_service = CategoryService()
-
-            # Get guides from database
-            if categorySlug:
-                # Get guides for specific category
-                category_dto = await category_service.get_category_by_slug(session, categorySlug)
-                if not category_dto:
-                    return []
-                guides_dto = await guide_service.list_guides_by_category(session, category_dto.id)
-            else:
-                # Get all guides
-                guides_dto = await guide_service.list_guides(session)
-
-            # Convert to GraphQL types
-            result = []
-            for guide_dto in guides_dto:
-                # Get categories for this guide
-                categories_dto = await guide_service.get_guide_categories(session, guide_dto.id)
-
-                # Convert categories to GraphQL types
-                categories = []
-                for category_dto in categories_dto:
-                    categories.append(
-                        CategoryType(
-                            id=category_dto.id,
-                            name=category_dto.name,
-                            description=category_dto.description,
-                            slug=category_dto.slug,
-                            createdAt=category_dto.created_at,
-                            updatedAt=category_dto.updated_at,
-                            guides=[],  # Avoid circular reference
-                        )
-                    )
-
-                # Get media for this guide
-                media_service = MediaService()
-                media_dto = await media_service.get_guide_media(session, guide_dto.id)
-
-                # Convert media to GraphQL types
-                media = []
-                for media_item in media_dto:
-                    media.append(
-                        MediaType(
-                            id=media_item.id,
-                            url=media_item.url,
-                            alt=media_item.alt,
-                            createdAt=media_item.created_at,
-                            updatedAt=media_item.updated_at,
-                            guides=[],  # Avoid circular reference
-                        )
-                    )
-
-                # Convert guide to GraphQL type
-                result.append(
-                    GuideType(
-                        id=guide_dto.id,
-                        title=guide_dto.title,
-                        slug=guide_dto.slug,
-                        estimatedReadTime=guide_dto.estimated_read_time,
-                        body=guide_dto.body,
-                        createdAt=guide_dto.created_at,
-                        updatedAt=guide_dto.updated_at,
-                        categories=categories,
-                        media=media,
-                    )
-                )
 
-            return result
+            # One statement for the guides (optionally filtered by category),
+            # loading only the columns and relationships the client selected
+            guides = await guide_service.list_guides_for_selection(
+                session, query_options(info, GuideModel), categorySlug
+            )
+            return to_types(info, guides)
 
     @strawberry.field
     async def guide(self, info, slug: str) -> Optional[GuideType]:
@@ -92,56 +51,96 @@ class GuideQuery:
         async with get_session() as session:
             guide_service = GuideService()
 
-            # Get guide by slug from database
-            guide_dto = await guide_service.get_guide_by_slug(session, slug)
-            if not guide_dto:
-                return None
-
-            # Get categories for this guide
-            categories_dto = await guide_service.get_guide_categories(session, guide_dto.id)
-
-            # Convert categories to GraphQL types
-            categories = []
-            for category_dto in categories_dto:
-                categories.append(
-                    CategoryType(
-                        id=category_dto.id,
-                        name=category_dto.name,
-                        description=category_dto.description,
-                        slug=category_dto.slug,
-                        createdAt=category_dto.created_at,
-                        updatedAt=category_dto.updated_at,
-                        guides=[],  # Avoid circular reference
-                    )
+            # Get guide by slug, loading only what the client selected
+            guide = await guide_service.get_guide_by_slug_for_selection(
+                session, slug, query_options(info, GuideModel)
+            )
+            return to_types(info, [guide])[0] if guide else None
+
+    @strawberry.field
+    async def guidesConnection(
+        self,
+        info,
+        first: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+        categorySlug: Optional[str] = None,
+    ) -> Connection[GuideType]:
+        """Guides in creation order, paginated by (createdAt, id) cursors."""
+        check_page_size(first)
+        keyset = parse_after(after, (datetime.fromisoformat, UUID))
+        get_session = info.context["get_session"]
+        guide_service = GuideService()
+
+        async def count_total() -> int:
+            async with get_session() as session:
+                return await guide_service.count_guides(session, categorySlug)
+
+        async with get_session() as session:
+            # One index range scan for the page, fetching one extra row for hasNextPage
+            guides = await guide_service.list_guides_page_for_selection(
+                session, first, keyset, page_options(info, GuideModel, GUIDE_KEYS), categorySlug
+            )
+            return to_connection(info, guides, first, after, GUIDE_KEYS, count_total)
+
+    @strawberry.field
+    async def searchGuides(
+        self,
+        info,
+        query: str,
+        first: int = DEFAULT_PAGE_SIZE,
+        after: Optional[str] = None,
+        categorySlug: Optional[str] = None,
+    ) -> Connection[GuideSearchHit]:
+        """Guides matching ``query`` (web search syntax), best match first."""
+        check_page_size(first)
+        offset = parse_offset(after)
+        if not query.strip():
+            raise ValueError("query must not be empty")
+        guide_fields = subfields(node_fields(info), "guide")
+        get_session = info.context["get_session"]
+        guide_service = GuideService()
+
+        async with get_session() as session:
+            if settings.SEARCH_BACKEND == "memory":
+                # Ranked by this instance's BM25 index; only the page is loaded
+                rows, total = await guide_service.search_guides_in_memory(
+                    session,
+                    query,
+                    first,
+                    offset,
+                    loader_options(GuideModel, guide_fields),
+                    categorySlug,
                 )
 
-            # Get media for this guide
-            media_service = MediaService()
-            media_dto = await media_service.get_guide_media(session, guide_dto.id)
-
-            # Convert media to GraphQL types
-            media = []
-            for media_item in media_dto:
-                media.append(
-                    MediaType(
-                        id=media_item.id,
-                        url=media_item.url,
-                        alt=media_item.alt,
-                        createdAt=media_item.created_at,
-                        updatedAt=media_item.updated_at,
-                        guides=[],  # Avoid circular reference
-                    )
+                async def count_total() -> int:
+                    return total
+
+            else:
+                # Too few full-text matches (e.g. a misspelt product name) adds
+                # guides with a similar title, slug or category name
+                fuzzy = await guide_service.needs_fuzzy_search(session, query, categorySlug)
+                # One statement ranks the page (filtered by category in the same
+                # statement) and builds snippets for its rows only
+                rows = await guide_service.search_guides_for_selection(
+                    session,
+                    query,
+                    first,
+                    offset,
+                    loader_options(GuideModel, guide_fields),
+                    categorySlug,
+                    fuzzy,
                 )
 
-            # Convert guide to GraphQL type
-            return GuideType(
-                id=guide_dto.id,
-                title=guide_dto.title,
-                slug=guide_dto.slug,
-                estimatedReadTime=guide_dto.estimated_read_time,
-                body=guide_dto.body,
-                createdAt=guide_dto.created_at,
-                updatedAt=guide_dto.updated_at,
-                categories=categories,
-                media=media,
-            )
+                async def count_total() -> int:
+                    async with get_session() as session:
+                        return await guide_service.count_search_results(
+                            session, query, categorySlug, fuzzy
+                        )
+
+            hits = [
+                GuideSearchHit(
+                    guide=to_type(guide, guide_fields), rank=rank, snippet=snippet, fuzzy=fuzzy_hit
+                )
+                for guide, rank, snippet, fuzzy_hit in rows
+            ]
+            return to_offset_connection(hits, first, offset, count_total)
@@ -0,0 +1,79 @@
+"""
+Per-request DataLoaders for GraphQL relationship fields.
+
+Root resolvers load selected relationships up front through the selection
+lookahead; these loaders cover the types built any other way, whose
+relationships were not prefetched, and the relationships and guide bodies
+selected under ``@defer``, which the lookahead leaves to the deferred payload.
+Every loader collects the keys requested while a resolver level is being
+executed and resolves the whole batch with a single ``IN (...)`` query, so
+nested lists cost a constant number of queries.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+from strawberry.dataloader import DataLoader
+
+from ...services.guide import GuideService
+from ...services.media import MediaService
+from ..dtos.category import CategoryReadDTO
+from ..dtos.guide import GuideReadDTO
+from ..dtos.media import MediaReadDTO
+
+guide_service = GuideService()
+media_service = MediaService()
+
+
+@dataclass
+class Loaders:
+    guide_bodies: DataLoader[UUID, Optional[Dict[str, Any]]]
+    guide_categories: DataLoader[UUID, List[CategoryReadDTO]]
+    guide_media: DataLoader[UUID, List[MediaReadDTO]]
+    guide_related: DataLoader[UUID, List[GuideReadDTO]]
+    media_guides: DataLoader[UUID, List[GuideReadDTO]]
+    category_guides: DataLoader[UUID, List[GuideReadDTO]]
+
+
+def create_loaders(get_session: Callable) -> Loaders:
+    """Build a fresh set of loaders; must be called once per request."""
+
+    async def load_guide_bodies(keys: List[UUID]) -> List[Optional[Dict[str, Any]]]:
+        async with get_session() as session:
+            bodies = await guide_service.get_bodies(session, keys)
+        return [bodies.get(key) for key in keys]
+
+    async def load_guide_categories(keys: List[UUID]) -> List[List[CategoryReadDTO]]:
+        async with get_session() as session:
+            grouped = await guide_service.get_categories_for_guides(session, keys)
+        return [grouped.get(key, []) for key in keys]
+
+    async def load_guide_media(keys: List[UUID]) -> List[List[MediaReadDTO]]:
+        async with get_session() as session:
+            grouped = await media_service.get_media_for_guides(session, keys)
+        return [grouped.get(key, []) for key in keys]
+
+    async def load_guide_related(keys: List[UUID]) -> List[List[GuideReadDTO]]:
+        async with get_session() as session:
+            grouped = await guide_service.list_related_guides(session, keys)
+        return [grouped.get(key, []) for key in keys]
+
+    async def load_media_guides(keys: List[UUID]) -> List[List[GuideReadDTO]]:
+        async with get_session() as session:
+            grouped = await guide_service.list_guides_by_media(session, keys)
+        return [grouped.get(key, []) for key in keys]
+
+    async def load_category_guides(keys: List[UUID]) -> List[List[GuideReadDTO]]:
+        async with get_session() as session:
+            grouped = await guide_service.list_guides_by_categories(session, keys)
+        return [grouped.get(key, []) for key in keys]
+
+    return Loaders(
+        guide_bodies=DataLoader(load_fn=load_guide_bodies),
+        guide_categories=DataLoader(load_fn=load_guide_categories),
+        guide_media=DataLoader(load_fn=load_guide_media),
+        guide_related=DataLoader(load_fn=load_guide_related),
+        media_guides=DataLoader(load_fn=load_media_guides),
+        category_guides=DataLoader(load_fn=load_category_guides),
+    )
@@ -1,10 +1,23 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
 
 import strawberry
 
 from ...services.media import MediaService
+from ..models import Media as MediaModel
+from ..schema import Connection
 from ..schema import Media as MediaType
-from ..schema import UserGuide as GuideType
+from .pagination import (
+    DEFAULT_PAGE_SIZE,
+    check_page_size,
+    page_options,
+    parse_after,
+    to_connection,
+)
+from .selection import query_options, to_types
+
+MEDIA_KEYS = ("created_at", "id")
 
 
 @strawberry.type
@@ -15,41 +28,29 @@ class MediaQuery:
         async with get_session() as session:
             media_service = MediaService()
 
-            # Get media from database
-            media_dto = await media_service.list_media(session)
-
-            # Convert to GraphQL types
-            result = []
-            for media in media_dto:
-                # Get guides associated with this media
-                guides_dto = await media_service.get_media_guides(session, media.id)
-
-                # Convert guides to GraphQL types
-                guides = []
-                for guide_dto in guides_dto:
-                    guides.append(
-                        GuideType(
-                            id=guide_dto.id,
-                            title=guide_dto.title,
-                            slug=guide_dto.slug,
-                            estimatedReadTime=guide_dto.estimated_read_time,
-                            body=guide_dto.body,
-                            createdAt=guide_dto.created_at,
-                            updatedAt=guide_dto.updated_at,
-                            categories=[],  # Avoid circular reference
-                            media=[],  # Avoid circular reference
-                        )
-                    )
-
-                result.append(
-                    MediaType(
-                        id=media.id,
-                        url=media.url,
-                        alt=media.alt,
-                        createdAt=media.created_at,
-                        updatedAt=media.updated_at,
-                        guides=guides,
-                    )
-                )
-
-            return result
+            # Load only the columns and relationships the client selected
+            media = await media_service.list_media_for_selection(
+                session, query_options(info, MediaModel)
+            )
+            return to_types(info, media)
+
+    @strawberry.field
+    async def mediaConnection(
+        self, info, first: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> Connection[MediaType]:
+        """Media in creation order, paginated by (createdAt, id) cursors."""
+        check_page_size(first)
+        keyset = parse_after(after, (datetime.fromisoformat, UUID))
+        get_session = info.context["get_session"]
+        media_service = MediaService()
+
+        async def count_total() -> int:
+            async with get_session() as session:
+                return await media_service.count_media(session)
+
+        async with get_session() as session:
+            # One index range scan for the page, fetching one extra row for hasNextPage
+            media = await media_service.list_media_page_for_selection(
+                session, first, keyset, page_options(info, MediaModel, MEDIA_KEYS)
+            )
+            return to_connection(info, media, first, after, MEDIA_KEYS, count_total)
@@ -0,0 +1,98 @@
+"""
+Helpers shared by the Relay-style connection root fields.
+
+Pages are fetched with keyset pagination (see ``BaseRepository``): the
+repository returns up to ``first + 1`` rows, the extra row only signalling
+``hasNextPage``. Cursors encode the sort key of a row and are decoded back
+into the keyset the next page starts after. Ranked results (search) have no
+stable sort key; their cursors carry the position of the row instead.
+"""
+
+from typing import Any, Awaitable, Callable, Optional, Sequence, Tuple, Type
+
+from sqlmodel import SQLModel
+
+from ...utils.cursor import decode_cursor, encode_cursor
+from ..schema import Connection, Edge, PageInfo
+from .selection import loader_options, node_fields, to_type
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def check_page_size(first: int) -> int:
+    """Reject page sizes outside 1..MAX_PAGE_SIZE."""
+    if first < 1 or first > MAX_PAGE_SIZE:
+        raise ValueError(f"first must be between 1 and {MAX_PAGE_SIZE}")
+    return first
+
+
+def parse_after(
+    after: Optional[str], parsers: Sequence[Callable[[Any], Any]]
+) -> Optional[Tuple[Any, ...]]:
+    """Decode the ``after`` cursor into keyset values, or None for the first page."""
+    return decode_cursor(after, parsers) if after else None
+
+
+def parse_offset(after: Optional[str]) -> int:
+    """Decode a position cursor into the offset the next page starts at."""
+    if not after:
+        return 0
+    (position,) = decode_cursor(after, (int,))
+    if position < 0:
+        raise ValueError("Invalid cursor")
+    return position + 1
+
+
+def page_options(info, model: Type[SQLModel], keys: Sequence[str]) -> list:
+    """Loader options for the connection's nodes, always loading the sort key."""
+    return loader_options(model, node_fields(info), keys)
+
+
+def to_connection(
+    info,
+    rows: Sequence[SQLModel],
+    first: int,
+    after: Optional[str],
+    keys: Sequence[str],
+    count_total: Callable[[], Awaitable[int]],
+) -> Connection:
+    """Map a fetched page onto a connection, building cursors from ``keys``."""
+    fields = node_fields(info)
+    edges = [
+        Edge(
+            cursor=encode_cursor(*(getattr(row, key) for key in keys)),
+            node=to_type(row, fields),
+        )
+        for row in rows[:first]
+    ]
+    return _connection(edges, len(rows) > first, after is not None, count_total)
+
+
+def to_offset_connection(
+    nodes: Sequence[Any],
+    first: int,
+    offset: int,
+    count_total: Callable[[], Awaitable[int]],
+) -> Connection:
+    """Map a page fetched from ``offset`` onto a connection of position cursors."""
+    edges = [
+        Edge(cursor=encode_cursor(offset + index), node=node)
+        for index, node in enumerate(nodes[:first])
+    ]
+    return _connection(edges, len(nodes) > first, offset > 0, count_total)
+
+
+def _connection(
+    edges: list,
+    has_next: bool,
+    has_previous: bool,
+    count_total: Callable[[], Awaitable[int]],
+) -> Connection:
+    page_info = PageInfo(
+        hasNextPage=has_next,
+        hasPreviousPage=has_previous,
+        startCursor=edges[0].cursor if edges else None,
+        endCursor=edges[-1].cursor if edges else None,
+    )
+    return Connection(edges=edges, pageInfo=page_info, count_total=count_total)
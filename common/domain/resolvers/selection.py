@@ -0,0 +1,272 @@
+"""
+Selection-set lookahead for the GraphQL root resolvers.
+
+Walks the fields selected below a root field and compiles them into
+SQLAlchemy loader options: ``load_only`` for the selected columns and a nested
+``selectinload`` for every relationship the query actually uses. A root field
+therefore runs one statement for its rows plus one per selected relationship,
+and ``to_type`` maps the loaded rows onto the GraphQL types along the same
+selection tree so nested resolvers never go back to the database. Connection
+fields are compiled the same way from the selection below ``edges { node }``.
+
+Selections under ``@defer`` are left out where that saves work: deferred
+relationships are not prefetched, so their resolvers use the DataLoaders when
+the deferred payload is executed, and neither is a deferred guide body. Other
+deferred columns are small and still loaded with the rest of the row.
+"""
+
+from typing import Dict, Iterable, List, Set, Tuple, Type
+
+from graphql import BooleanValueNode, FieldNode, FragmentSpreadNode, InlineFragmentNode
+from sqlalchemy.orm import load_only, selectinload
+from sqlmodel import SQLModel
+from strawberry.types.nodes import FragmentSpread, InlineFragment, SelectedField
+
+from ..models import Category as CategoryModel
+from ..models import Media as MediaModel
+from ..models import UserGuide as GuideModel
+from ..schema import Category as CategoryType
+from ..schema import Media as MediaType
+from ..schema import UserGuide as GuideType
+
+TYPES: Dict[Type[SQLModel], type] = {
+    GuideModel: GuideType,
+    CategoryModel: CategoryType,
+    MediaModel: MediaType,
+}
+
+# GraphQL field name -> model column, per model
+COLUMNS: Dict[Type[SQLModel], Dict[str, str]] = {
+    GuideModel: {
+        "id": "id",
+        "title": "title",
+        "slug": "slug",
+        "estimatedReadTime": "estimated_read_time",
+        "body": "body",
+        "excerpt": "excerpt",
+        "toc": "toc",
+        "createdAt": "created_at",
+        "updatedAt": "updated_at",
+    },
+    CategoryModel: {
+        "id": "id",
+        "name": "name",
+        "description": "description",
+        "slug": "slug",
+        "createdAt": "created_at",
+        "updatedAt": "updated_at",
+    },
+    MediaModel: {
+        "id": "id",
+        "alt": "alt",
+        "url": "url",
+        "createdAt": "created_at",
+        "updatedAt": "updated_at",
+    },
+}
+
+# Computed GraphQL field -> GraphQL fields whose columns it is computed from, per model
+DEPENDENCIES: Dict[Type[SQLModel], Dict[str, Tuple[str, ...]]] = {
+    GuideModel: {"bodyHtml": ("body",)},
+}
+
+# Column fields the GraphQL type loads itself when not given -> the type's argument
+# taking the loaded value, per model
+LAZY_COLUMNS: Dict[Type[SQLModel], Dict[str, str]] = {
+    GuideModel: {"body": "loaded_body"},
+}
+
+# GraphQL field name -> (relationship attribute name, target model), per model
+RELATIONSHIPS: Dict[Type[SQLModel], Dict[str, Tuple[str, Type[SQLModel]]]] = {
+    GuideModel: {
+        "categories": ("categories", CategoryModel),
+        "media": ("media", MediaModel),
+        "related": ("related", GuideModel),
+    },
+    CategoryModel: {"guides": ("guides", GuideModel)},
+    MediaModel: {"guides": ("guides", GuideModel)},
+}
+
+
+def flatten_selections(selections: Iterable) -> List[SelectedField]:
+    """Resolve fragments so only concrete fields remain."""
+    fields: List[SelectedField] = []
+    for selection in selections:
+        if isinstance(selection, (FragmentSpread, InlineFragment)):
+            fields.extend(flatten_selections(selection.selections))
+        elif isinstance(selection, SelectedField):
+            fields.append(selection)
+    return fields
+
+
+def is_deferred(node) -> bool:
+    """Whether a fragment carries ``@defer`` (unless its ``if`` is a literal false)."""
+    for directive in node.directives or ():
+        if directive.name.value != "defer":
+            continue
+        condition = next((a.value for a in directive.arguments if a.name.value == "if"), None)
+        return not (isinstance(condition, BooleanValueNode) and not condition.value)
+    return False
+
+
+def _convert_nodes(nodes: Iterable, fragments: dict, deferred: bool = False) -> List[SelectedField]:
+    """Fields of ``nodes``; those under a deferred fragment get a ``defer`` directive."""
+    fields: List[SelectedField] = []
+    for node in nodes:
+        if isinstance(node, FieldNode):
+            selections = node.selection_set.selections if node.selection_set else ()
+            fields.append(
+                SelectedField(
+                    name=node.name.value,
+                    directives={"defer": {}} if deferred else {},
+                    arguments={},
+                    selections=_convert_nodes(selections, fragments, deferred),
+                    alias=node.alias.value if node.alias else None,
+                )
+            )
+        elif isinstance(node, InlineFragmentNode):
+            fields.extend(
+                _convert_nodes(
+                    node.selection_set.selections, fragments, deferred or is_deferred(node)
+                )
+            )
+        elif isinstance(node, FragmentSpreadNode):
+            fragment = fragments[node.name.value]
+            fields.extend(
+                _convert_nodes(
+                    fragment.selection_set.selections, fragments, deferred or is_deferred(node)
+                )
+            )
+    return fields
+
+
+def selected_fields(info) -> List[SelectedField]:
+    """The field being resolved with its selections, fragments already flattened.
+
+    Used instead of ``info.selected_fields``, which fails on inline fragments
+    without a type condition such as ``... @defer { body }``.
+    """
+    raw_info = info._raw_info
+    return _convert_nodes(raw_info.field_nodes, raw_info.fragments)
+
+
+def child_fields(info) -> List[SelectedField]:
+    """Fields selected below the field currently being resolved."""
+    return flatten_selections(
+        selection for field in selected_fields(info) for selection in field.selections
+    )
+
+
+def selected_names(info) -> Set[str]:
+    """Names of the fields selected below the current field."""
+    return {field.name for field in child_fields(info)}
+
+
+def _prefetched_fields(model: Type[SQLModel], fields: List[SelectedField]) -> List[SelectedField]:
+    """The fields to load up front: deferred ones only when they are plain columns."""
+    lazy = LAZY_COLUMNS.get(model, {})
+    return [
+        field
+        for field in fields
+        if "defer" not in field.directives
+        or (field.name in COLUMNS[model] and field.name not in lazy)
+    ]
+
+
+def _nested_fields(
+    model: Type[SQLModel], fields: List[SelectedField]
+) -> Dict[str, List[SelectedField]]:
+    """Selected relationships of ``model``, merging repeated (aliased) selections."""
+    nested: Dict[str, List[SelectedField]] = {}
+    for field in fields:
+        if field.name in RELATIONSHIPS[model]:
+            nested.setdefault(field.name, []).extend(flatten_selections(field.selections))
+    return nested
+
+
+def _column_fields(model: Type[SQLModel], fields: List[SelectedField]) -> Set[str]:
+    """Names of the selected fields plus the fields computed ones depend on."""
+    names = {field.name for field in fields}
+    dependencies = DEPENDENCIES.get(model, {})
+    return names.union(*(dependencies.get(name, ()) for name in names))
+
+
+def subfields(fields: List[SelectedField], name: str) -> List[SelectedField]:
+    """Fields selected below every selection of ``name`` among ``fields``."""
+    return [
+        subfield
+        for field in fields
+        if field.name == name
+        for subfield in flatten_selections(field.selections)
+    ]
+
+
+def node_fields(info) -> List[SelectedField]:
+    """Fields selected below ``edges { node }`` of the connection being resolved."""
+    return [
+        node_field
+        for edges in child_fields(info)
+        if edges.name == "edges"
+        for field in flatten_selections(edges.selections)
+        if field.name == "node"
+        for node_field in flatten_selections(field.selections)
+    ]
+
+
+def loader_options(
+    model: Type[SQLModel], fields: List[SelectedField], keys: Iterable[str] = ()
+) -> list:
+    """Compile selected fields into load_only/selectinload options for ``model``.
+
+    ``keys`` names extra columns that must be loaded whatever the selection,
+    such as the sort key cursors are built from.
+    """
+    columns = COLUMNS[model]
+    fields = _prefetched_fields(model, fields)
+    names = _column_fields(model, fields)
+    attributes = {"id", *keys} | {columns[name] for name in names if name in columns}
+    options = [load_only(*(getattr(model, attribute) for attribute in sorted(attributes)))]
+
+    for name, nested_fields in _nested_fields(model, fields).items():
+        attribute, target = RELATIONSHIPS[model][name]
+        options.append(
+            selectinload(getattr(model, attribute)).options(*loader_options(target, nested_fields))
+        )
+    return options
+
+
+def to_type(obj: SQLModel, fields: List[SelectedField]):
+    """Map a row loaded with ``loader_options`` onto its GraphQL type.
+
+    Only selected columns and those of ``DEPENDENCIES`` are read (others are
+    left as None and never serialized, or loaded by the type for ``LAZY_COLUMNS``), and
+    selected relationships are handed to the type as prefetched lists so its field
+    resolvers skip the DataLoaders.
+    """
+    model = type(obj)
+    fields = _prefetched_fields(model, fields)
+    names = _column_fields(model, fields)
+    lazy = LAZY_COLUMNS.get(model, {})
+    values = {
+        lazy.get(name, name): getattr(obj, attribute) if name in names else None
+        for name, attribute in COLUMNS[model].items()
+    }
+    values["id"] = str(obj.id)
+    instance = TYPES[model](**values)
+
+    for name, nested_fields in _nested_fields(model, fields).items():
+        attribute, _ = RELATIONSHIPS[model][name]
+        children = [to_type(child, nested_fields) for child in getattr(obj, attribute)]
+        setattr(instance, f"prefetched_{name}", children)
+    return instance
+
+
+def query_options(info, model: Type[SQLModel]) -> list:
+    """Loader options for the rows returned by the current root field."""
+    return loader_options(model, child_fields(info))
+
+
+def to_types(info, rows: Iterable[SQLModel]) -> list:
+    """Map the rows returned by the current root field onto GraphQL types."""
+    fields = child_fields(info)
+    return [to_type(row, fields) for row in rows]
@@ -0,0 +1,23 @@
+from typing import List
+
+import strawberry
+
+from ...services.suggestions import title_suggestions
+from ..schema import Suggestion, SuggestionKind
+
+MAX_SUGGESTIONS = 20
+
+
+@strawberry.type
+class SuggestionQuery:
+    @strawberry.field
+    async def suggest(self, prefix: str, limit: int = 10) -> List[Suggestion]:
+        """Guide titles and category names completing ``prefix``, served from memory."""
+        if limit < 1 or limit > MAX_SUGGESTIONS:
+            raise ValueError(f"limit must be between 1 and {MAX_SUGGESTIONS}")
+        return [
+            Suggestion(
+                kind=SuggestionKind(item.kind), id=str(item.id), text=item.text, slug=item.slug
+            )
+            for item in await title_suggestions.suggest(prefix, limit)
+        ]
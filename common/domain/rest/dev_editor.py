@@ -13,6 +13,7 @@ from ..dtos.category import (
     CategoryCreateDTO,
     CategoryReadDTO,
     CategoryUpdateDTO,
+    CategoryWithGuidesDTO,
 )
 from .editor_guard import verify_dev_editor_key
 
@@ -35,7 +36,7 @@ async def create_category(
     return await service.create_category(session, payload)
 
 
-@router.get("/categories", response_model=List[CategoryReadDTO])
+@router.get("/categories", response_model=List[CategoryWithGuidesDTO])
 @rate_limit_dev_editor_read()
 async def list_categories(
     request: Request, session: AsyncSession = Depends(get_session_dependency)
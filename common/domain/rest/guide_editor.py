@@ -13,6 +13,7 @@ from ...services.guide import GuideService
 from ..dtos.guide import (
     GuideCreateDTO,
     GuideReadDTO,
+    GuideSummaryDTO,
     GuideUpdateDTO,
 )
 from .editor_guard import verify_dev_editor_key
@@ -37,7 +38,7 @@ async def create_guide(
     return await service.create_guide(session, payload)
 
 
-@router.get("/guides", response_model=List[GuideReadDTO])
+@router.get("/guides", response_model=List[GuideSummaryDTO])
 @rate_limit_dev_editor_read()
 async def list_guides(
     request: Request,
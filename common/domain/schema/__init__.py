@@ -1,6 +1,19 @@
 from .category import Category
 from .feedback import Feedback
-from .guide import UserGuide
+from .guide import GuideSearchHit, UserGuide
 from .media import Media
+from .pagination import Connection, Edge, PageInfo
+from .suggestion import Suggestion, SuggestionKind
 
-__all__ = ["Category", "Media", "UserGuide", "Feedback"]
+__all__ = [
+    "Category",
+    "Media",
+    "UserGuide",
+    "GuideSearchHit",
+    "Feedback",
+    "Connection",
+    "Edge",
+    "PageInfo",
+    "Suggestion",
+    "SuggestionKind",
+]
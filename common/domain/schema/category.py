@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from datetime import datetime
 from typing import TYPE_CHECKING, Annotated, List, Optional
+from uuid import UUID
 
 import strawberry
 
+from ..dtos.category import CategoryReadDTO
+
 if TYPE_CHECKING:
     from .guide import UserGuide
 
@@ -18,4 +21,27 @@ class Category:
     createdAt: datetime
     updatedAt: Optional[datetime]
 
-    guides: List[Annotated["UserGuide", strawberry.lazy(".guide")]]
+    # Guides already loaded by the root resolver's lookahead (None: not prefetched)
+    prefetched_guides: strawberry.Private[Optional[list]] = None
+
+    @strawberry.field
+    async def guides(self, info) -> List[Annotated["UserGuide", strawberry.lazy(".guide")]]:
+        """Guides in this category; only resolved when selected."""
+        from .guide import UserGuide
+
+        if self.prefetched_guides is not None:
+            return self.prefetched_guides
+
+        guides_dto = await info.context["loaders"].category_guides.load(UUID(self.id))
+        return [UserGuide.from_dto(guide_dto) for guide_dto in guides_dto]
+
+    @classmethod
+    def from_dto(cls, dto: CategoryReadDTO) -> Category:
+        return cls(
+            id=str(dto.id),
+            name=dto.name,
+            description=dto.description,
+            slug=dto.slug,
+            createdAt=dto.created_at,
+            updatedAt=dto.updated_at,
+        )
@@ -2,9 +2,13 @@ from __future__ import annotations
 
 from datetime import datetime
 from typing import TYPE_CHECKING, Annotated, List, Optional
+from uuid import UUID
 
 import strawberry
 
+from ...services.body_html import body_html_cache
+from ..dtos.guide import GuideReadDTO
+
 if TYPE_CHECKING:
     from .category import Category
     from .media import Media
@@ -16,9 +20,93 @@ class UserGuide:
     title: str
     slug: str
     estimatedReadTime: int
-    body: strawberry.scalars.JSON
+    # Derived from body on write, so list views can skip loading it
+    excerpt: str
+    toc: strawberry.scalars.JSON = strawberry.field(
+        description="Headings of the body in order: [{level, text, anchor}]"
+    )
     createdAt: datetime
     updatedAt: Optional[datetime]
 
-    categories: List[Annotated["Category", strawberry.lazy(".category")]]
-    media: List[Annotated["Media", strawberry.lazy(".media")]]
+    # The body, unless the root resolver left it out (e.g. selected under @defer)
+    loaded_body: strawberry.Private[Optional[dict]] = None
+    # Relationships already loaded by the root resolver's lookahead (None: not prefetched)
+    prefetched_categories: strawberry.Private[Optional[list]] = None
+    prefetched_media: strawberry.Private[Optional[list]] = None
+    prefetched_related: strawberry.Private[Optional[list]] = None
+
+    @strawberry.field
+    async def categories(self, info) -> List[Annotated["Category", strawberry.lazy(".category")]]:
+        """Categories of this guide; only resolved when selected."""
+        from .category import Category
+
+        if self.prefetched_categories is not None:
+            return self.prefetched_categories
+
+        categories_dto = await info.context["loaders"].guide_categories.load(UUID(self.id))
+        return [Category.from_dto(category_dto) for category_dto in categories_dto]
+
+    @strawberry.field
+    async def media(self, info) -> List[Annotated["Media", strawberry.lazy(".media")]]:
+        """Media attached to this guide; only resolved when selected."""
+        from .media import Media
+
+        if self.prefetched_media is not None:
+            return self.prefetched_media
+
+        media_dto = await info.context["loaders"].guide_media.load(UUID(self.id))
+        return [Media.from_dto(media_item) for media_item in media_dto]
+
+    @strawberry.field
+    async def related(self, info, first: int = 5) -> List[UserGuide]:
+        """Most related guides first, as last computed by the related guides job."""
+        if first < 1:
+            raise ValueError("first must be positive")
+        if self.prefetched_related is not None:
+            return self.prefetched_related[:first]
+
+        related_dto = await info.context["loaders"].guide_related.load(UUID(self.id))
+        return [UserGuide.from_dto(guide_dto) for guide_dto in related_dto[:first]]
+
+    @strawberry.field
+    async def body(self, info) -> strawberry.scalars.JSON:
+        """Rich text blocks of the guide."""
+        return await self.load_body(info)
+
+    @strawberry.field
+    async def bodyHtml(self, info) -> str:
+        """The body rendered as HTML, cached by a hash of its content."""
+        return await body_html_cache.render(await self.load_body(info))
+
+    async def load_body(self, info) -> dict:
+        if self.loaded_body is None:
+            self.loaded_body = await info.context["loaders"].guide_bodies.load(UUID(self.id))
+        return self.loaded_body
+
+    @classmethod
+    def from_dto(cls, dto: GuideReadDTO) -> UserGuide:
+        return cls(
+            id=str(dto.id),
+            title=dto.title,
+            slug=dto.slug,
+            estimatedReadTime=dto.estimated_read_time,
+            loaded_body=dto.body,
+            excerpt=dto.excerpt,
+            toc=dto.toc,
+            createdAt=dto.created_at,
+            updatedAt=dto.updated_at,
+        )
+
+
+@strawberry.type
+class GuideSearchHit:
+    """A guide matching a search, with its relevance and a highlighted snippet.
+
+    ``fuzzy`` hits did not match the words of the query but have a similar
+    title, slug or category name; their rank is that similarity.
+    """
+
+    guide: UserGuide
+    rank: float
+    snippet: str
+    fuzzy: bool
@@ -0,0 +1,35 @@
+from typing import Awaitable, Callable, Generic, List, Optional, TypeVar
+
+import strawberry
+
+NodeType = TypeVar("NodeType")
+
+
+@strawberry.type
+class PageInfo:
+    hasNextPage: bool
+    hasPreviousPage: bool
+    startCursor: Optional[str]
+    endCursor: Optional[str]
+
+
+@strawberry.type
+class Edge(Generic[NodeType]):
+    cursor: str
+    node: NodeType
+
+
+@strawberry.type
+class Connection(Generic[NodeType]):
+    """Relay-style page of nodes; named ``<Node>Connection`` in the schema."""
+
+    edges: List[Edge[NodeType]]
+    pageInfo: PageInfo
+
+    # Deferred COUNT(*) so the count only runs when totalCount is selected
+    count_total: strawberry.Private[Callable[[], Awaitable[int]]]
+
+    @strawberry.field
+    async def totalCount(self) -> int:
+        """Number of nodes across all pages; only counted when selected."""
+        return await self.count_total()
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from enum import Enum
+
+import strawberry
+
+
+@strawberry.enum
+class SuggestionKind(Enum):
+    GUIDE = "guide"
+    CATEGORY = "category"
+
+
+@strawberry.type
+class Suggestion:
+    """A guide title or category name completing a typed prefix."""
+
+    kind: SuggestionKind
+    id: str
+    text: str
+    slug: str
@@ -3,11 +3,16 @@ Base repository for SQLModel entities.
 
 Provides generic CRUD operations with async SQLAlchemy sessions.
 Caller controls transaction commits/rollbacks.
+List pages use keyset pagination: rows are ordered by a unique key and the next
+page continues strictly after the key of the last row, so deep pages cost the
+same index range scan as the first one.
 """
 
-from typing import Any, Generic, List, Optional, Type, TypeVar
+from typing import Any, Generic, List, Optional, Sequence, Tuple, Type, TypeVar
 
+from sqlalchemy import func
 from sqlalchemy import select as sa_select
+from sqlalchemy import tuple_
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -54,3 +59,52 @@ class BaseRepository(Generic[T]):
         stmt = sa_select(self.model).where(getattr(self.model, field) == value)
         result = await session.execute(stmt)
         return result.scalars().first()
+
+    async def list_with_options(
+        self, session: AsyncSession, options: Sequence[Any] = (), criteria: Sequence[Any] = ()
+    ) -> List[T]:
+        """Fetch objects matching criteria, loading only what the loader options ask for."""
+        stmt = sa_select(self.model).options(*options).where(*criteria)
+        result = await session.execute(stmt)
+        return result.scalars().all()
+
+    async def list_columns(
+        self, session: AsyncSession, columns: Sequence[str], criteria: Sequence[Any] = ()
+    ) -> List[Tuple[Any, ...]]:
+        """Fetch only the given columns of objects matching criteria, as tuples."""
+        stmt = sa_select(*(getattr(self.model, column) for column in columns)).where(*criteria)
+        result = await session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
+    async def get_by_field_with_options(
+        self, session: AsyncSession, field: str, value: Any, options: Sequence[Any] = ()
+    ) -> Optional[T]:
+        """Get an object by a field value, loading only what the loader options ask for."""
+        rows = await self.list_with_options(session, options, [getattr(self.model, field) == value])
+        return rows[0] if rows else None
+
+    async def list_page_with_options(
+        self,
+        session: AsyncSession,
+        keyset: Sequence[Any],
+        first: int,
+        after: Optional[Sequence[Any]] = None,
+        options: Sequence[Any] = (),
+        criteria: Sequence[Any] = (),
+    ) -> List[T]:
+        """Fetch up to ``first + 1`` objects ordered by ``keyset``, after the ``after`` key.
+
+        The extra row only tells the caller whether another page exists.
+        """
+        stmt = sa_select(self.model).options(*options).where(*criteria)
+        if after is not None:
+            stmt = stmt.where(tuple_(*keyset) > tuple_(*after))
+        stmt = stmt.order_by(*keyset).limit(first + 1)
+        result = await session.execute(stmt)
+        return result.scalars().all()
+
+    async def count(self, session: AsyncSession, criteria: Sequence[Any] = ()) -> int:
+        """Count objects matching criteria."""
+        stmt = sa_select(func.count()).select_from(self.model).where(*criteria)
+        result = await session.execute(stmt)
+        return result.scalar_one()
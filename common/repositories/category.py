@@ -1,17 +1,23 @@
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence, Tuple
 
 from fastapi import HTTPException
+from sqlalchemy import select as sa_select
+from sqlalchemy.orm import selectinload
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..domain.dtos.category import (
     CategoryCreateDTO,
     CategoryReadDTO,
     CategoryUpdateDTO,
+    CategoryWithGuidesDTO,
 )
-from ..domain.models import Category
+from ..domain.models import Category, UserGuide
 from ..repositories.base import BaseRepository
 from ..utils.time import utcnow
 
+# Sort key of category pages; slugs are unique and already indexed
+CATEGORY_KEYSET = (Category.slug,)
+
 
 class CategoryRepository(BaseRepository[Category]):
     def __init__(self):
@@ -49,6 +55,33 @@ class CategoryRepository(BaseRepository[Category]):
         rows = await self.list(session)
         return [CategoryReadDTO.model_validate(r) for r in rows]
 
+    async def list_read_with_guide_ids(self, session: AsyncSession) -> List[CategoryWithGuidesDTO]:
+        """Return all categories as DTOs with the IDs of their guides."""
+        stmt = sa_select(Category).options(selectinload(Category.guides).load_only(UserGuide.id))
+        result = await session.execute(stmt)
+        return [
+            CategoryWithGuidesDTO(
+                id=category.id,
+                name=category.name,
+                description=category.description,
+                slug=category.slug,
+                created_at=category.created_at,
+                updated_at=category.updated_at,
+                guide_ids=[guide.id for guide in category.guides],
+            )
+            for category in result.scalars().all()
+        ]
+
+    async def list_page(
+        self,
+        session: AsyncSession,
+        first: int,
+        after: Optional[Tuple[str]] = None,
+        options: Sequence[Any] = (),
+    ) -> List[Category]:
+        """Fetch up to ``first + 1`` categories after the given slug, in slug order."""
+        return await self.list_page_with_options(session, CATEGORY_KEYSET, first, after, options)
+
     async def get_read(self, session: AsyncSession, id: str) -> Optional[CategoryReadDTO]:
         obj = await self.get(session, id)
         return CategoryReadDTO.model_validate(obj) if obj else None
@@ -0,0 +1,85 @@
+"""
+Hand-written SQL for the hottest reads, run on the raw asyncpg connection.
+
+Going through the ORM, every row is hydrated into a model instance (identity
+map, attribute instrumentation, a second SELECT for the categories) and then
+copied field by field into a DTO that is validated again. Here each read is one
+statement, prepared and cached per connection by asyncpg, whose ``Record``
+objects are mapped straight into the same DTOs the ``GuideRepository`` and
+``CategoryRepository`` methods return, without re-validating them.
+
+The statements run on the connection of the caller's session, so they follow
+its read replica routing. json and jsonb values arrive decoded: SQLAlchemy's
+asyncpg dialect registers codecs for them on every connection it opens.
+Enabled with ``FAST_READ_PATH``; ``scripts/benchmark_fast_reads.py`` compares
+both paths.
+"""
+
+from typing import Any, List, Optional
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..domain.dtos.category import CategoryWithGuidesDTO
+from ..domain.dtos.guide import GuideReadDTO, GuideSummaryDTO
+
+GUIDE_BY_SLUG = """
+SELECT g.id, g.title, g.slug, g.body, g.estimated_read_time, g.created_at, g.updated_at,
+    g.excerpt, g.word_count, g.toc,
+    ARRAY(SELECT l.category_id FROM guidecategorylink AS l WHERE l.guide_id = g.id)
+        AS category_ids
+FROM userguide AS g
+WHERE g.slug = $1
+"""
+
+GUIDE_SUMMARIES = """
+SELECT g.id, g.title, g.slug, g.created_at, g.updated_at,
+    ARRAY(SELECT l.category_id FROM guidecategorylink AS l WHERE l.guide_id = g.id)
+        AS category_ids
+FROM userguide AS g
+"""
+
+GUIDE_SUMMARIES_BY_CATEGORY_SLUG = GUIDE_SUMMARIES + """WHERE EXISTS (
+    SELECT 1 FROM guidecategorylink AS l JOIN category AS c ON c.id = l.category_id
+    WHERE l.guide_id = g.id AND c.slug = $1
+)
+"""
+
+# The guide ids come from the (category_id, guide_id) index
+CATEGORIES_WITH_GUIDE_IDS = """
+SELECT c.id, c.name, c.description, c.slug, c.created_at, c.updated_at,
+    ARRAY(SELECT l.guide_id FROM guidecategorylink AS l WHERE l.category_id = c.id)
+        AS guide_ids
+FROM category AS c
+"""
+
+
+async def driver_connection(session: AsyncSession) -> Any:
+    """The asyncpg connection under the session's current connection."""
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    return raw.driver_connection
+
+
+class FastReadRepository:
+    """Raw asyncpg counterparts of the hot ``GuideRepository``/``CategoryRepository`` reads."""
+
+    async def get_guide_by_slug(self, session: AsyncSession, slug: str) -> Optional[GuideReadDTO]:
+        """Same as ``GuideRepository.get_read_by_slug``."""
+        record = await (await driver_connection(session)).fetchrow(GUIDE_BY_SLUG, slug)
+        return GuideReadDTO.model_construct(**record) if record else None
+
+    async def list_guides(
+        self, session: AsyncSession, category_slug: Optional[str] = None
+    ) -> List[GuideSummaryDTO]:
+        """Same as ``GuideRepository.list_read``."""
+        connection = await driver_connection(session)
+        if category_slug:
+            records = await connection.fetch(GUIDE_SUMMARIES_BY_CATEGORY_SLUG, category_slug)
+        else:
+            records = await connection.fetch(GUIDE_SUMMARIES)
+        return [GuideSummaryDTO.model_construct(**record) for record in records]
+
+    async def list_categories(self, session: AsyncSession) -> List[CategoryWithGuidesDTO]:
+        """Same as ``CategoryRepository.list_read_with_guide_ids``."""
+        records = await (await driver_connection(session)).fetch(CATEGORIES_WITH_GUIDE_IDS)
+        return [CategoryWithGuidesDTO.model_construct(**record) for record in records]
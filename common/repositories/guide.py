@@ -1,16 +1,51 @@
-from typing import List, Optional
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
+from sqlalchemy import Float, Select, Subquery, cast
 from sqlalchemy import delete as sa_delete
+from sqlalchemy import false, func
+from sqlalchemy import insert as sa_insert
+from sqlalchemy import null
 from sqlalchemy import select as sa_select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import union_all
+from sqlalchemy.orm import load_only, selectinload
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..domain.dtos.guide import GuideCreateDTO, GuideReadDTO, GuideUpdateDTO
+from ..core import settings
+from ..domain.dtos.guide import (
+    GuideCreateDTO,
+    GuideReadDTO,
+    GuideSummaryDTO,
+    GuideTextDTO,
+    GuideUpdateDTO,
+)
 from ..domain.models import Category as CategoryModel
+from ..domain.models import GuideRelated
 from ..domain.models import UserGuide as GuideModel
 from ..domain.models.category import GuideCategoryLink
+from ..domain.models.media import GuideMediaLink
 from ..repositories.base import BaseRepository
+from ..utils.rich_text import DerivedContent, derive_content
+from ..utils.time import utcnow
+
+# Sort key of guide pages; backed by the (created_at, id) index
+GUIDE_KEYSET = (GuideModel.created_at, GuideModel.id)
+
+# Columns of list views; the body and everything derived from it stay unloaded
+SUMMARY_COLUMNS = (
+    GuideModel.id,
+    GuideModel.title,
+    GuideModel.slug,
+    GuideModel.created_at,
+    GuideModel.updated_at,
+)
+
+# Full-text search: trigger-maintained, GIN-indexed column (not mapped on the model)
+SEARCH_CONFIG = "english"
+SEARCH_VECTOR = GuideModel.__table__.c.search_vector
+HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=20, MinWords=8"
 
 
 class GuideRepository(BaseRepository[GuideModel]):
@@ -19,12 +54,9 @@ class GuideRepository(BaseRepository[GuideModel]):
 
     async def create_from_dto(self, session: AsyncSession, dto: GuideCreateDTO) -> GuideModel:
         """Create a guide from DTO with category associations."""
-        guide = GuideModel(
-            title=dto.title,
-            slug=dto.slug,
-            body=dto.body,
-            estimated_read_time=dto.estimated_read_time,
-        )
+        guide = GuideModel(title=dto.title, slug=dto.slug)
+        derived = self._set_body(guide, dto.body)
+        guide.estimated_read_time = dto.estimated_read_time or derived.read_time
 
         # Associate with categories if provided
         if dto.category_ids:
@@ -47,18 +79,33 @@ class GuideRepository(BaseRepository[GuideModel]):
             guide.title = dto.title
         if dto.slug is not None:
             guide.slug = dto.slug
-        if dto.body is not None:
-            guide.body = dto.body
         if dto.estimated_read_time is not None:
             guide.estimated_read_time = dto.estimated_read_time
+        if dto.body is not None:
+            derived = self._set_body(guide, dto.body)
+            # A new body without a read time gets the computed one, as on create
+            if dto.estimated_read_time is None:
+                guide.estimated_read_time = derived.read_time
 
         # Update category associations if provided
         if dto.category_ids is not None:
             categories = await self._get_categories_by_ids(session, dto.category_ids)
             guide.categories = categories
 
+        guide.updated_at = utcnow()
         return guide
 
+    @staticmethod
+    def _set_body(guide: GuideModel, body: dict) -> DerivedContent:
+        """Write a body and the columns derived from it."""
+        derived = derive_content(body)
+        guide.body = body
+        guide.plaintext = derived.plaintext
+        guide.excerpt = derived.excerpt
+        guide.word_count = derived.word_count
+        guide.toc = derived.toc
+        return derived
+
     async def get_read(self, session: AsyncSession, id: UUID) -> Optional[GuideReadDTO]:
         """Get a guide as DTO with category IDs."""
         stmt = (
@@ -81,6 +128,9 @@ class GuideRepository(BaseRepository[GuideModel]):
             created_at=guide.created_at,
             updated_at=guide.updated_at,
             category_ids=[cat.id for cat in guide.categories],
+            excerpt=guide.excerpt,
+            word_count=guide.word_count,
+            toc=guide.toc,
         )
 
     async def get_read_by_slug(self, session: AsyncSession, slug: str) -> Optional[GuideReadDTO]:
@@ -105,69 +155,369 @@ class GuideRepository(BaseRepository[GuideModel]):
             created_at=guide.created_at,
             updated_at=guide.updated_at,
             category_ids=[cat.id for cat in guide.categories],
+            excerpt=guide.excerpt,
+            word_count=guide.word_count,
+            toc=guide.toc,
         )
 
     async def list_read(
         self, session: AsyncSession, category_slug: Optional[str] = None
-    ) -> List[GuideReadDTO]:
-        """List guides as DTOs, optionally filtered by category slug."""
-        stmt = sa_select(GuideModel).options(selectinload(GuideModel.categories))
+    ) -> List[GuideSummaryDTO]:
+        """List guide summaries, optionally filtered by category slug."""
+        return await self._list_summaries(session, self._category_criteria(category_slug))
+
+    async def list_text(self, session: AsyncSession) -> List[GuideTextDTO]:
+        """List the text of every guide, reading the derived plaintext instead of the body."""
+        result = await session.execute(sa_select(GuideModel).options(*self._text_options()))
+        return [self._text(guide) for guide in result.scalars().all()]
+
+    async def get_text(self, session: AsyncSession, id: UUID) -> Optional[GuideTextDTO]:
+        """Get the text of a guide."""
+        stmt = sa_select(GuideModel).options(*self._text_options()).where(GuideModel.id == id)
+        result = await session.execute(stmt)
+        guide = result.scalars().first()
+        return self._text(guide) if guide else None
+
+    @staticmethod
+    def _text_options() -> Tuple[Any, ...]:
+        return (
+            load_only(GuideModel.id, GuideModel.title, GuideModel.plaintext),
+            selectinload(GuideModel.categories).load_only(CategoryModel.id),
+        )
 
-        if category_slug:
-            stmt = stmt.where(GuideModel.categories.any(CategoryModel.slug == category_slug))
+    @staticmethod
+    def _text(guide: GuideModel) -> GuideTextDTO:
+        return GuideTextDTO(
+            id=guide.id,
+            title=guide.title,
+            plaintext=guide.plaintext,
+            category_ids=[cat.id for cat in guide.categories],
+        )
 
+    async def _list_summaries(
+        self, session: AsyncSession, criteria: Sequence[Any]
+    ) -> List[GuideSummaryDTO]:
+        """List guides matching ``criteria``, loading only the columns of a summary."""
+        stmt = (
+            sa_select(GuideModel)
+            .options(
+                load_only(*SUMMARY_COLUMNS),
+                selectinload(GuideModel.categories).load_only(CategoryModel.id),
+            )
+            .where(*criteria)
+        )
         result = await session.execute(stmt)
-        guides = result.scalars().all()
-
         return [
-            GuideReadDTO(
+            GuideSummaryDTO(
                 id=guide.id,
                 title=guide.title,
                 slug=guide.slug,
-                body=guide.body,
-                estimated_read_time=guide.estimated_read_time,
                 created_at=guide.created_at,
                 updated_at=guide.updated_at,
                 category_ids=[cat.id for cat in guide.categories],
             )
-            for guide in guides
+            for guide in result.scalars().all()
         ]
 
-    async def list_read_by_category(
-        self, session: AsyncSession, category_id: str
-    ) -> List[GuideReadDTO]:
-        """List guides for a specific category."""
+    async def list_with_options_by_category_slug(
+        self, session: AsyncSession, category_slug: str, options: Sequence[Any] = ()
+    ) -> List[GuideModel]:
+        """List guides of a category in one statement, loading only what the options ask for."""
+        return await self.list_with_options(
+            session, options, [GuideModel.categories.any(CategoryModel.slug == category_slug)]
+        )
+
+    async def list_page(
+        self,
+        session: AsyncSession,
+        first: int,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        category_slug: Optional[str] = None,
+        options: Sequence[Any] = (),
+    ) -> List[GuideModel]:
+        """Fetch up to ``first + 1`` guides after the ``(created_at, id)`` key."""
+        return await self.list_page_with_options(
+            session, GUIDE_KEYSET, first, after, options, self._category_criteria(category_slug)
+        )
+
+    async def search(
+        self,
+        session: AsyncSession,
+        query: str,
+        first: int,
+        offset: int = 0,
+        category_slug: Optional[str] = None,
+        options: Sequence[Any] = (),
+        fuzzy: bool = False,
+    ) -> List[Tuple[GuideModel, float, str, bool]]:
+        """Fetch up to ``first + 1`` guides matching ``query``, best match first.
+
+        Each row comes with its rank, a highlighted snippet of the body and
+        whether it only matched by trigram similarity. The page is ranked in a
+        subquery so snippets are only built for its rows. ``fuzzy`` also matches
+        guides whose title, slug or category names are similar to the query,
+        ranked by similarity after the full-text matches.
+        """
+        stmt = self.search_statement(query, first, offset, category_slug, options, fuzzy)
+        result = await session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
+    def search_statement(
+        self,
+        query: str,
+        first: int,
+        offset: int = 0,
+        category_slug: Optional[str] = None,
+        options: Sequence[Any] = (),
+        fuzzy: bool = False,
+    ) -> Select:
+        """The statement behind ``search``."""
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        if fuzzy:
+            matches = self._fuzzy_matches(query)
+            hits = (
+                sa_select(
+                    matches.c.id,
+                    func.coalesce(matches.c.text_rank, matches.c.similarity).label("rank"),
+                    matches.c.text_rank.is_(None).label("fuzzy"),
+                )
+                .join(GuideModel, GuideModel.id == matches.c.id)
+                .order_by(
+                    matches.c.text_rank.desc().nulls_last(),
+                    matches.c.similarity.desc(),
+                    matches.c.id,
+                )
+            )
+        else:
+            rank = func.ts_rank_cd(SEARCH_VECTOR, tsquery)
+            hits = (
+                sa_select(GuideModel.id, rank.label("rank"), false().label("fuzzy"))
+                .where(SEARCH_VECTOR.op("@@")(tsquery))
+                .order_by(rank.desc(), GuideModel.id)
+            )
+        hits = (
+            hits.where(*self._category_criteria(category_slug))
+            .offset(offset)
+            .limit(first + 1)
+            .subquery()
+        )
+        snippet = func.ts_headline(
+            SEARCH_CONFIG, func.userguide_block_text(GuideModel.body), tsquery, HEADLINE_OPTIONS
+        )
+        return (
+            sa_select(GuideModel, hits.c.rank, snippet, hits.c.fuzzy)
+            .join(hits, GuideModel.id == hits.c.id)
+            .options(*options)
+            .order_by(hits.c.fuzzy, hits.c.rank.desc(), GuideModel.id)
+        )
+
+    async def list_with_body_by_ids(
+        self, session: AsyncSession, ids: Sequence[UUID], options: Sequence[Any] = ()
+    ) -> List[Tuple[GuideModel, Any]]:
+        """Fetch guides and their body by id, in the order of ``ids``, skipping missing ones.
+
+        The body is selected as its own column, whatever the loader options defer.
+        """
+        if not ids:
+            return []
         stmt = (
-            sa_select(GuideModel)
-            .options(selectinload(GuideModel.categories))
-            .where(GuideModel.categories.any(CategoryModel.id == category_id))
+            sa_select(GuideModel, GuideModel.body).options(*options).where(GuideModel.id.in_(ids))
         )
         result = await session.execute(stmt)
-        guides = result.scalars().all()
+        rows = {guide.id: (guide, body) for guide, body in result.all()}
+        return [rows[id] for id in ids if id in rows]
 
-        return [
-            GuideReadDTO(
-                id=guide.id,
-                title=guide.title,
-                slug=guide.slug,
-                body=guide.body,
-                estimated_read_time=guide.estimated_read_time,
-                created_at=guide.created_at,
-                updated_at=guide.updated_at,
-                category_ids=[cat.id for cat in guide.categories],
-            )
-            for guide in guides
+    async def list_ids_with_block(self, session: AsyncSession, block: Dict[str, Any]) -> List[UUID]:
+        """Ids of guides with a body block containing ``block``, e.g. ``{"type": "list"}``.
+
+        A jsonb containment (@>) query, answered from the jsonb_path_ops index on body.
+        """
+        stmt = sa_select(GuideModel.id).where(GuideModel.body.contains({"blocks": [block]}))
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def replace_related(
+        self, session: AsyncSession, related: Sequence[Tuple[UUID, int, UUID, float]]
+    ) -> None:
+        """Replace all precomputed related guides with ``(guide_id, rank, related_id, score)`` rows.
+
+        Readers keep seeing the previous rows until the caller commits. The
+        guides are locked FOR KEY SHARE first, so none can be deleted until then,
+        and rows naming a guide deleted since they were computed are skipped.
+        """
+        existing = set(
+            (
+                await session.execute(sa_select(GuideModel.id).with_for_update(key_share=True))
+            ).scalars()
+        )
+        await session.execute(sa_delete(GuideRelated))
+        rows = [
+            {"guide_id": guide_id, "rank": rank, "related_id": related_id, "score": score}
+            for guide_id, rank, related_id, score in related
+            if guide_id in existing and related_id in existing
         ]
+        if rows:
+            await session.execute(sa_insert(GuideRelated), rows)
+
+    async def count_search(
+        self,
+        session: AsyncSession,
+        query: str,
+        category_slug: Optional[str] = None,
+        fuzzy: bool = False,
+        limit: Optional[int] = None,
+    ) -> int:
+        """Count guides matching ``query``, optionally only those of a category.
+
+        With ``limit`` counting stops there, for callers that only need to know
+        whether there are at least that many matches.
+        """
+        if fuzzy:
+            matches = self._fuzzy_matches(query)
+            stmt = sa_select(matches.c.id).join(GuideModel, GuideModel.id == matches.c.id)
+        else:
+            tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+            stmt = sa_select(GuideModel.id).where(SEARCH_VECTOR.op("@@")(tsquery))
+        stmt = stmt.where(*self._category_criteria(category_slug)).limit(limit)
+        result = await session.execute(sa_select(func.count()).select_from(stmt.subquery()))
+        return result.scalar_one()
+
+    @staticmethod
+    def _fuzzy_matches(query: str) -> Subquery:
+        """Full-text and trigram matches of ``query``: ``(id, text_rank, similarity)`` per guide.
+
+        ``text_rank`` is NULL for guides only similar by title, slug or category
+        name. Each branch is served by its own GIN index: ``%`` finds candidates
+        above the database's ``pg_trgm.similarity_threshold`` (0.3 by default),
+        and their similarity must also reach ``SEARCH_TRIGRAM_THRESHOLD``.
+        """
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        threshold = settings.SEARCH_TRIGRAM_THRESHOLD
+        no_rank = cast(null(), Float)
+        title_similarity = func.similarity(GuideModel.title, query)
+        slug_similarity = func.similarity(GuideModel.slug, query)
+        name_similarity = func.similarity(CategoryModel.name, query)
+        candidates = union_all(
+            sa_select(
+                GuideModel.id,
+                func.ts_rank_cd(SEARCH_VECTOR, tsquery).label("text_rank"),
+                no_rank.label("similarity"),
+            ).where(SEARCH_VECTOR.op("@@")(tsquery)),
+            sa_select(GuideModel.id, no_rank, title_similarity).where(
+                GuideModel.title.op("%")(query), title_similarity >= threshold
+            ),
+            sa_select(GuideModel.id, no_rank, slug_similarity).where(
+                GuideModel.slug.op("%")(query), slug_similarity >= threshold
+            ),
+            sa_select(GuideCategoryLink.guide_id, no_rank, name_similarity)
+            .join(CategoryModel, CategoryModel.id == GuideCategoryLink.category_id)
+            .where(CategoryModel.name.op("%")(query), name_similarity >= threshold),
+        ).subquery()
+        return (
+            sa_select(
+                candidates.c.id,
+                func.max(candidates.c.text_rank).label("text_rank"),
+                func.max(candidates.c.similarity).label("similarity"),
+            )
+            .group_by(candidates.c.id)
+            .subquery()
+        )
+
+    async def count_by_category_slug(
+        self, session: AsyncSession, category_slug: Optional[str] = None
+    ) -> int:
+        """Count guides, optionally only those of a category."""
+        return await self.count(session, self._category_criteria(category_slug))
+
+    @staticmethod
+    def _category_criteria(category_slug: Optional[str]) -> List[Any]:
+        if not category_slug:
+            return []
+        return [GuideModel.categories.any(CategoryModel.slug == category_slug)]
+
+    async def get_categories_by_guide_ids(
+        self, session: AsyncSession, guide_ids: List[UUID]
+    ) -> Dict[UUID, List[CategoryModel]]:
+        """Get categories for several guides in one query, grouped by guide ID."""
+        grouped: Dict[UUID, List[CategoryModel]] = defaultdict(list)
+        if not guide_ids:
+            return grouped
 
-    async def get_categories(self, session: AsyncSession, guide_id: UUID) -> List[CategoryModel]:
-        """Get categories for a specific guide."""
         stmt = (
-            sa_select(CategoryModel)
-            .join(GuideCategoryLink)
-            .where(GuideCategoryLink.guide_id == str(guide_id))
+            sa_select(GuideCategoryLink.guide_id, CategoryModel)
+            .join(CategoryModel, CategoryModel.id == GuideCategoryLink.category_id)
+            .where(GuideCategoryLink.guide_id.in_(guide_ids))
         )
         result = await session.execute(stmt)
-        return result.scalars().all()
+        for guide_id, category in result.all():
+            grouped[guide_id].append(category)
+        return grouped
+
+    async def list_read_by_category_ids(
+        self, session: AsyncSession, category_ids: List[UUID]
+    ) -> Dict[UUID, List[GuideReadDTO]]:
+        """List guides for several categories in one query, grouped by category ID."""
+        grouped: Dict[UUID, List[GuideReadDTO]] = defaultdict(list)
+        if not category_ids:
+            return grouped
+
+        stmt = (
+            sa_select(GuideCategoryLink.category_id, GuideModel)
+            .join(GuideModel, GuideModel.id == GuideCategoryLink.guide_id)
+            .where(GuideCategoryLink.category_id.in_(category_ids))
+        )
+        result = await session.execute(stmt)
+        for category_id, guide in result.all():
+            grouped[category_id].append(GuideReadDTO.model_validate(guide))
+        return grouped
+
+    async def list_read_by_media_ids(
+        self, session: AsyncSession, media_ids: List[UUID]
+    ) -> Dict[UUID, List[GuideReadDTO]]:
+        """List guides for several media items in one query, grouped by media ID."""
+        grouped: Dict[UUID, List[GuideReadDTO]] = defaultdict(list)
+        if not media_ids:
+            return grouped
+
+        stmt = (
+            sa_select(GuideMediaLink.media_id, GuideModel)
+            .join(GuideModel, GuideModel.id == GuideMediaLink.guide_id)
+            .where(GuideMediaLink.media_id.in_(media_ids))
+        )
+        result = await session.execute(stmt)
+        for media_id, guide in result.all():
+            grouped[media_id].append(GuideReadDTO.model_validate(guide))
+        return grouped
+
+    async def list_read_related_by_guide_ids(
+        self, session: AsyncSession, guide_ids: List[UUID]
+    ) -> Dict[UUID, List[GuideReadDTO]]:
+        """List the related guides of several guides in one query, best first, by guide ID."""
+        grouped: Dict[UUID, List[GuideReadDTO]] = defaultdict(list)
+        if not guide_ids:
+            return grouped
+
+        stmt = (
+            sa_select(GuideRelated.guide_id, GuideModel)
+            .join(GuideModel, GuideModel.id == GuideRelated.related_id)
+            .where(GuideRelated.guide_id.in_(guide_ids))
+            .order_by(GuideRelated.guide_id, GuideRelated.rank)
+        )
+        result = await session.execute(stmt)
+        for guide_id, guide in result.all():
+            grouped[guide_id].append(GuideReadDTO.model_validate(guide))
+        return grouped
+
+    async def get_bodies_by_ids(
+        self, session: AsyncSession, guide_ids: List[UUID]
+    ) -> Dict[UUID, Dict[str, Any]]:
+        """Get the bodies of several guides in one query, by guide ID."""
+        if not guide_ids:
+            return {}
+
+        stmt = sa_select(GuideModel.id, GuideModel.body).where(GuideModel.id.in_(guide_ids))
+        result = await session.execute(stmt)
+        return dict(result.all())
 
     async def _get_categories_by_ids(
         self, session: AsyncSession, category_ids: List[UUID]
@@ -181,28 +531,7 @@ class GuideRepository(BaseRepository[GuideModel]):
         return result.scalars().all()
 
     async def delete(self, session: AsyncSession, id: UUID) -> bool:
-        """Delete a guide by ID and its relationships."""
-        # Check if guide exists
-        obj = await session.get(GuideModel, id)
-        if not obj:
-            return False
-
-        # Delete guide-category relationships
-        from ..domain.models import GuideCategoryLink
-
-        stmt = sa_delete(GuideCategoryLink).where(GuideCategoryLink.guide_id == id)
-        await session.execute(stmt)
-
-        # Delete guide-media relationships
-        from ..domain.models import GuideMediaLink
-
-        stmt = sa_delete(GuideMediaLink).where(GuideMediaLink.guide_id == id)
-        await session.execute(stmt)
-
-        # Delete the guide directly with SQL
-        stmt = sa_delete(GuideModel).where(GuideModel.id == id)
-        result = await session.execute(stmt)
-
-        # Commit all deletions
+        """Delete a guide by ID; its category, media and related guide links cascade."""
+        result = await session.execute(sa_delete(GuideModel).where(GuideModel.id == id))
         await session.commit()
         return result.rowcount > 0
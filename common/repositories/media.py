@@ -1,12 +1,20 @@
-from typing import List, Optional
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
 from sqlalchemy import delete as sa_delete
+from sqlalchemy import select as sa_select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..domain.dtos.media import MediaCreateDTO, MediaReadDTO, MediaUpdateDTO
 from ..domain.models import Media as MediaModel
+from ..domain.models.media import GuideMediaLink
 from ..repositories.base import BaseRepository
+from ..utils.time import utcnow
+
+# Sort key of media pages; backed by the (created_at, id) index
+MEDIA_KEYSET = (MediaModel.created_at, MediaModel.id)
 
 
 class MediaRepository(BaseRepository[MediaModel]):
@@ -32,6 +40,7 @@ class MediaRepository(BaseRepository[MediaModel]):
         if dto.alt is not None:
             media.alt = dto.alt
 
+        media.updated_at = utcnow()
         return media
 
     async def get_read(self, session: AsyncSession, id: UUID) -> Optional[MediaReadDTO]:
@@ -50,8 +59,6 @@ class MediaRepository(BaseRepository[MediaModel]):
 
     async def list_read(self, session: AsyncSession) -> List[MediaReadDTO]:
         """List media as DTOs."""
-        from sqlalchemy import select as sa_select
-
         stmt = sa_select(MediaModel)
         result = await session.execute(stmt)
         media_list = result.scalars().all()
@@ -67,21 +74,35 @@ class MediaRepository(BaseRepository[MediaModel]):
             for media in media_list
         ]
 
-    async def delete(self, session: AsyncSession, id: UUID) -> bool:
-        """Delete media by ID and its relationships."""
-        # Check if media exists
-        obj = await session.get(MediaModel, id)
-        if not obj:
-            return False
-
-        # Delete guide-media relationships
-        from ..domain.models import GuideMediaLink
-
-        stmt = sa_delete(GuideMediaLink).where(GuideMediaLink.media_id == id)
-        await session.execute(stmt)
-
-        # Delete the media directly with SQL
-        stmt = sa_delete(MediaModel).where(MediaModel.id == id)
+    async def list_page(
+        self,
+        session: AsyncSession,
+        first: int,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        options: Sequence[Any] = (),
+    ) -> List[MediaModel]:
+        """Fetch up to ``first + 1`` media items after the ``(created_at, id)`` key."""
+        return await self.list_page_with_options(session, MEDIA_KEYSET, first, after, options)
+
+    async def list_read_by_guide_ids(
+        self, session: AsyncSession, guide_ids: List[UUID]
+    ) -> Dict[UUID, List[MediaReadDTO]]:
+        """List media for several guides in one query, grouped by guide ID."""
+        grouped: Dict[UUID, List[MediaReadDTO]] = defaultdict(list)
+        if not guide_ids:
+            return grouped
+
+        stmt = (
+            sa_select(GuideMediaLink.guide_id, MediaModel)
+            .join(MediaModel, MediaModel.id == GuideMediaLink.media_id)
+            .where(GuideMediaLink.guide_id.in_(guide_ids))
+        )
         result = await session.execute(stmt)
+        for guide_id, media in result.all():
+            grouped[guide_id].append(MediaReadDTO.model_validate(media))
+        return grouped
 
+    async def delete(self, session: AsyncSession, id: UUID) -> bool:
+        """Delete media by ID; its guide links cascade."""
+        result = await session.execute(sa_delete(MediaModel).where(MediaModel.id == id))
         return result.rowcount > 0
@@ -0,0 +1,71 @@
+"""
+Rendered HTML of guide bodies, cached by content hash.
+
+``UserGuide.bodyHtml`` is requested for the same guides over and over (server
+side rendering of every page view), while bodies only change when a guide is
+edited. The HTML is therefore cached under a hash of the body JSON: an edit
+produces a new key instead of needing an invalidation, so every body is
+rendered once per edit. Entries live in an in-process LRU, backed by Redis
+when ``REDIS_URL`` is set so a body rendered by one worker is reused by all.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+from ..core.cache import LRUCache
+from ..core.logger import get_logger
+from ..core.rate_limiting import get_redis_client
+from ..core.settings import BODY_HTML_CACHE_SIZE, BODY_HTML_REDIS_TTL
+from ..utils.rich_text import render_html
+
+logger = get_logger("body_html")
+
+# Bump when render_html output changes so cached HTML is not reused
+RENDERER_VERSION = 1
+REDIS_KEY_PREFIX = f"body_html:v{RENDERER_VERSION}:"
+
+
+def body_hash(body: Any) -> str:
+    """sha256 of the canonical JSON of a body; equal bodies hash alike whatever their key order."""
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class BodyHtmlCache:
+    """Maps body hashes to rendered HTML."""
+
+    def __init__(self, maxsize: int = BODY_HTML_CACHE_SIZE, ttl: int = BODY_HTML_REDIS_TTL):
+        self.cache: LRUCache[str, str] = LRUCache(maxsize)
+        self.ttl = ttl
+
+    async def render(self, body: Any) -> str:
+        """HTML of a body, rendered only when neither this process nor Redis has it."""
+        key = body_hash(body)
+        html = self.cache.get(key)
+        if html is not None:
+            return html
+
+        redis_client = get_redis_client()
+        if redis_client is not None:
+            try:
+                value = await redis_client.get(REDIS_KEY_PREFIX + key)
+            except Exception as e:
+                logger.warning(f"Failed to read rendered body from Redis: {e}")
+                redis_client, value = None, None
+            if value is not None:
+                html = value.decode() if isinstance(value, bytes) else value
+                self.cache.set(key, html)
+                return html
+
+        html = render_html(body)
+        self.cache.set(key, html)
+        if redis_client is not None:
+            try:
+                await redis_client.set(REDIS_KEY_PREFIX + key, html, ex=self.ttl)
+            except Exception as e:
+                logger.warning(f"Failed to write rendered body to Redis: {e}")
+        return html
+
+
+body_html_cache = BodyHtmlCache()
@@ -1,18 +1,25 @@
+from typing import Any, Optional, Sequence, Tuple
+
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from ..core import events, settings
 from ..domain.dtos.category import (
     CategoryCreateDTO,
     CategoryReadDTO,
     CategoryUpdateDTO,
+    CategoryWithGuidesDTO,
 )
+from ..domain.models import Category
 from ..repositories.category import CategoryRepository
+from ..repositories.fast_read import FastReadRepository
 
 
 class CategoryService:
     def __init__(self, repo: CategoryRepository | None = None):
         self.repo = repo or CategoryRepository()
+        self.fast_repo = FastReadRepository()
 
     async def create_category(
         self, session: AsyncSession, dto: CategoryCreateDTO
@@ -24,6 +31,7 @@ class CategoryService:
         except IntegrityError:
             await session.rollback()
             raise HTTPException(status_code=409, detail="Slug already exists")
+        await events.publish("category", "created", obj.id)
         return CategoryReadDTO.model_validate(obj)
 
     async def update_category(
@@ -36,6 +44,7 @@ class CategoryService:
         except IntegrityError:
             await session.rollback()
             raise HTTPException(status_code=409, detail="Slug already exists")
+        await events.publish("category", "updated", obj.id)
         return CategoryReadDTO.model_validate(obj)
 
     async def delete_category(self, session: AsyncSession, id: str) -> None:
@@ -45,9 +54,12 @@ class CategoryService:
         except IntegrityError:
             await session.rollback()
             raise HTTPException(status_code=500, detail="Failed to delete category")
+        await events.publish("category", "deleted", id)
 
-    async def list_categories(self, session: AsyncSession) -> list[CategoryReadDTO]:
-        return await self.repo.list_read(session)
+    async def list_categories(self, session: AsyncSession) -> list[CategoryWithGuidesDTO]:
+        if settings.FAST_READ_PATH:
+            return await self.fast_repo.list_categories(session)
+        return await self.repo.list_read_with_guide_ids(session)
 
     async def get_category(self, session: AsyncSession, id: str) -> CategoryReadDTO | None:
         return await self.repo.get_read(session, id)
@@ -56,3 +68,29 @@ class CategoryService:
         self, session: AsyncSession, slug: str
     ) -> CategoryReadDTO | None:
         return await self.repo.get_read_by_slug(session, slug)
+
+    async def list_categories_for_selection(
+        self, session: AsyncSession, options: Sequence[Any] = ()
+    ) -> list[Category]:
+        """List category rows loaded with GraphQL lookahead options."""
+        return await self.repo.list_with_options(session, options)
+
+    async def get_category_by_slug_for_selection(
+        self, session: AsyncSession, slug: str, options: Sequence[Any] = ()
+    ) -> Category | None:
+        """Get a category row by slug loaded with GraphQL lookahead options."""
+        return await self.repo.get_by_field_with_options(session, "slug", slug, options)
+
+    async def list_categories_page_for_selection(
+        self,
+        session: AsyncSession,
+        first: int,
+        after: Optional[Tuple[str]] = None,
+        options: Sequence[Any] = (),
+    ) -> list[Category]:
+        """List a page of category rows (in slug order) loaded with GraphQL lookahead options."""
+        return await self.repo.list_page(session, first, after, options)
+
+    async def count_categories(self, session: AsyncSession) -> int:
+        """Count all categories."""
+        return await self.repo.count(session)
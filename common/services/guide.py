@@ -1,20 +1,36 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from ..core import events, settings
+from ..domain.dtos.category import CategoryReadDTO
 from ..domain.dtos.guide import (
     GuideCreateDTO,
     GuideReadDTO,
+    GuideSummaryDTO,
     GuideUpdateDTO,
 )
+from ..domain.models import UserGuide
+from ..repositories.category import CategoryRepository
+from ..repositories.fast_read import FastReadRepository
 from ..repositories.guide import GuideRepository
+from ..utils.rich_text import block_text
+from .search_index import guide_search_index, highlight, tokenize
 
 
 class GuideService:
-    def __init__(self, repo: GuideRepository | None = None):
+    def __init__(
+        self,
+        repo: GuideRepository | None = None,
+        category_repo: CategoryRepository | None = None,
+    ):
         self.repo = repo or GuideRepository()
+        self.category_repo = category_repo or CategoryRepository()
+        self.fast_repo = FastReadRepository()
 
     async def create_guide(self, session: AsyncSession, dto: GuideCreateDTO) -> GuideReadDTO:
         """Create a new guide with rich text content."""
@@ -22,6 +38,7 @@ class GuideService:
         try:
             await session.commit()
             await session.refresh(obj)
+            await events.publish("guide", "created", obj.id)
             # Reload with categories to get the full DTO
             return await self.repo.get_read(session, obj.id)
         except IntegrityError:
@@ -38,6 +55,7 @@ class GuideService:
         try:
             await session.commit()
             await session.refresh(obj)
+            await events.publish("guide", "updated", obj.id)
             # Reload with categories to get the full DTO
             return await self.repo.get_read(session, obj.id)
         except IntegrityError:
@@ -55,27 +73,151 @@ class GuideService:
         except IntegrityError:
             await session.rollback()
             raise HTTPException(status_code=500, detail="Failed to delete guide")
+        await events.publish("guide", "deleted", id)
 
     async def list_guides(
         self, session: AsyncSession, category_slug: str | None = None
-    ) -> list[GuideReadDTO]:
+    ) -> list[GuideSummaryDTO]:
         """List guides, optionally filtered by category slug."""
+        if settings.FAST_READ_PATH:
+            return await self.fast_repo.list_guides(session, category_slug)
         return await self.repo.list_read(session, category_slug)
 
+    async def count_guides(self, session: AsyncSession, category_slug: str | None = None) -> int:
+        """Count guides, optionally filtered by category slug."""
+        return await self.repo.count_by_category_slug(session, category_slug)
+
     async def get_guide(self, session: AsyncSession, id: UUID) -> GuideReadDTO | None:
         """Get a guide by ID."""
         return await self.repo.get_read(session, id)
 
     async def get_guide_by_slug(self, session: AsyncSession, slug: str) -> GuideReadDTO | None:
         """Get a guide by slug."""
+        if settings.FAST_READ_PATH:
+            return await self.fast_repo.get_guide_by_slug(session, slug)
         return await self.repo.get_read_by_slug(session, slug)
 
-    async def list_guides_by_category(
-        self, session: AsyncSession, category_id: str
-    ) -> list[GuideReadDTO]:
-        """List guides for a specific category."""
-        return await self.repo.list_read_by_category(session, category_id)
+    async def get_categories_for_guides(
+        self, session: AsyncSession, guide_ids: List[UUID]
+    ) -> Dict[UUID, List[CategoryReadDTO]]:
+        """Get categories for several guides, grouped by guide ID."""
+        grouped = await self.repo.get_categories_by_guide_ids(session, guide_ids)
+        return {
+            guide_id: [CategoryReadDTO.model_validate(c) for c in categories]
+            for guide_id, categories in grouped.items()
+        }
+
+    async def list_guides_by_categories(
+        self, session: AsyncSession, category_ids: List[UUID]
+    ) -> Dict[UUID, List[GuideReadDTO]]:
+        """List guides for several categories, grouped by category ID."""
+        return await self.repo.list_read_by_category_ids(session, category_ids)
+
+    async def list_guides_by_media(
+        self, session: AsyncSession, media_ids: List[UUID]
+    ) -> Dict[UUID, List[GuideReadDTO]]:
+        """List guides for several media items, grouped by media ID."""
+        return await self.repo.list_read_by_media_ids(session, media_ids)
+
+    async def list_related_guides(
+        self, session: AsyncSession, guide_ids: List[UUID]
+    ) -> Dict[UUID, List[GuideReadDTO]]:
+        """List the related guides of several guides, best first, grouped by guide ID."""
+        return await self.repo.list_read_related_by_guide_ids(session, guide_ids)
+
+    async def get_bodies(
+        self, session: AsyncSession, guide_ids: List[UUID]
+    ) -> Dict[UUID, Dict[str, Any]]:
+        """Get the bodies of several guides, by guide ID."""
+        return await self.repo.get_bodies_by_ids(session, guide_ids)
+
+    async def list_guides_for_selection(
+        self,
+        session: AsyncSession,
+        options: Sequence[Any] = (),
+        category_slug: str | None = None,
+    ) -> List[UserGuide]:
+        """List guide rows loaded with GraphQL lookahead options."""
+        if category_slug:
+            return await self.repo.list_with_options_by_category_slug(
+                session, category_slug, options
+            )
+        return await self.repo.list_with_options(session, options)
+
+    async def get_guide_by_slug_for_selection(
+        self, session: AsyncSession, slug: str, options: Sequence[Any] = ()
+    ) -> Optional[UserGuide]:
+        """Get a guide row by slug loaded with GraphQL lookahead options."""
+        return await self.repo.get_by_field_with_options(session, "slug", slug, options)
+
+    async def list_guides_page_for_selection(
+        self,
+        session: AsyncSession,
+        first: int,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        options: Sequence[Any] = (),
+        category_slug: str | None = None,
+    ) -> List[UserGuide]:
+        """List a page of guide rows loaded with GraphQL lookahead options."""
+        return await self.repo.list_page(session, first, after, category_slug, options)
+
+    async def needs_fuzzy_search(
+        self, session: AsyncSession, query: str, category_slug: str | None = None
+    ) -> bool:
+        """Whether full-text search finds too few guides, so trigram matches are added."""
+        minimum = settings.SEARCH_FUZZY_MIN_RESULTS
+        if minimum <= 0:
+            return False
+        found = await self.repo.count_search(session, query, category_slug, limit=minimum)
+        return found < minimum
+
+    async def search_guides_for_selection(
+        self,
+        session: AsyncSession,
+        query: str,
+        first: int,
+        offset: int = 0,
+        options: Sequence[Any] = (),
+        category_slug: str | None = None,
+        fuzzy: bool = False,
+    ) -> List[Tuple[UserGuide, float, str, bool]]:
+        """Search a page of guide rows, with rank and snippet, loaded with lookahead options."""
+        return await self.repo.search(session, query, first, offset, category_slug, options, fuzzy)
+
+    async def count_search_results(
+        self,
+        session: AsyncSession,
+        query: str,
+        category_slug: str | None = None,
+        fuzzy: bool = False,
+    ) -> int:
+        """Count guides matching a search query."""
+        return await self.repo.count_search(session, query, category_slug, fuzzy)
+
+    async def search_guides_in_memory(
+        self,
+        session: AsyncSession,
+        query: str,
+        first: int,
+        offset: int = 0,
+        options: Sequence[Any] = (),
+        category_slug: str | None = None,
+    ) -> Tuple[List[Tuple[UserGuide, float, str, bool]], int]:
+        """Search with the in-process BM25 index, loading only the rows of the page.
 
-    async def get_guide_categories(self, session: AsyncSession, guide_id: str) -> list:
-        """Get categories for a specific guide."""
-        return await self.repo.get_categories(session, guide_id)
+        Returns rows like ``search_guides_for_selection`` and the number of matches.
+        """
+        category_id = None
+        if category_slug:
+            category = await self.category_repo.get_by_field(session, "slug", category_slug)
+            if category is None:
+                return [], 0
+            category_id = category.id
+        hits, total = await guide_search_index.search(query, first + 1, offset, category_id)
+        rows = await self.repo.list_with_body_by_ids(session, [id for id, _ in hits], options)
+        scores = dict(hits)
+        terms = tokenize(query)
+        return [
+            (guide, scores[guide.id], highlight(block_text(body), terms), False)
+            for guide, body in rows
+        ], total
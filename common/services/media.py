@@ -1,5 +1,6 @@
 import time
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException, UploadFile
@@ -7,6 +8,7 @@ from google.cloud import storage
 from sqlalchemy import select as sa_select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from ..core import events
 from ..core.settings import GCS_BUCKET_NAME
 from ..domain.dtos.media import MediaCreateDTO, MediaReadDTO
 from ..domain.models import Media as MediaModel
@@ -60,6 +62,7 @@ class MediaService:
             media = await self.repo.create_from_dto(session, media_dto)
             await session.commit()
             await session.refresh(media)
+            await events.publish("media", "created", media.id)
 
             # If guide_id is provided, attach media to guide
             if guide_id:
@@ -79,6 +82,26 @@ class MediaService:
         """List all media."""
         return await self.repo.list_read(session)
 
+    async def list_media_for_selection(
+        self, session: AsyncSession, options: Sequence[Any] = ()
+    ) -> List[MediaModel]:
+        """List media rows loaded with GraphQL lookahead options."""
+        return await self.repo.list_with_options(session, options)
+
+    async def list_media_page_for_selection(
+        self,
+        session: AsyncSession,
+        first: int,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        options: Sequence[Any] = (),
+    ) -> List[MediaModel]:
+        """List a page of media rows loaded with GraphQL lookahead options."""
+        return await self.repo.list_page(session, first, after, options)
+
+    async def count_media(self, session: AsyncSession) -> int:
+        """Count all media."""
+        return await self.repo.count(session)
+
     async def delete_media(self, session: AsyncSession, id: UUID) -> None:
         """Delete media from both database and Google Cloud Storage."""
         media = await self.repo.get(session, id)
@@ -97,6 +120,7 @@ class MediaService:
             # Delete from database
             await self.repo.delete(session, id)
             await session.commit()
+            await events.publish("media", "deleted", id)
 
         except Exception as e:
             await session.rollback()
@@ -118,6 +142,7 @@ class MediaService:
         link = GuideMediaLink(media_id=media_id, guide_id=guide_id)
         session.add(link)
         await session.commit()
+        await events.publish("media", "updated", media_id)
 
     async def detach_from_guide(
         self, session: AsyncSession, media_id: UUID, guide_id: UUID
@@ -132,6 +157,7 @@ class MediaService:
         )
         await session.execute(stmt)
         await session.commit()
+        await events.publish("media", "updated", media_id)
 
     async def get_guide_media(self, session: AsyncSession, guide_id: UUID) -> List[MediaReadDTO]:
         """Get all media attached to a specific guide."""
@@ -145,18 +171,11 @@ class MediaService:
 
         return [MediaReadDTO.model_validate(media) for media in media_list]
 
-    async def get_media_guides(self, session: AsyncSession, media_id: UUID) -> List:
-        """Get all guides attached to a specific media."""
-        from sqlalchemy import select as sa_select
-
-        from ..domain.dtos.guide import GuideReadDTO
-        from ..domain.models import GuideMediaLink, UserGuide
-
-        stmt = sa_select(UserGuide).join(GuideMediaLink).where(GuideMediaLink.media_id == media_id)
-        result = await session.execute(stmt)
-        guides_list = result.scalars().all()
-
-        return [GuideReadDTO.model_validate(guide) for guide in guides_list]
+    async def get_media_for_guides(
+        self, session: AsyncSession, guide_ids: List[UUID]
+    ) -> Dict[UUID, List[MediaReadDTO]]:
+        """Get media for several guides, grouped by guide ID."""
+        return await self.repo.list_read_by_guide_ids(session, guide_ids)
 
     def get_optimized_url(self, url: str, width: int = None, height: int = None) -> str:
         """Get optimized image URL from Google Cloud Storage."""
@@ -0,0 +1,177 @@
+"""
+Precomputed related guides.
+
+Guide pages show a rail of related guides, so instead of comparing guides per
+request a background job (``scripts/refresh_related_guides.py``) compares all
+of them at once and stores the best ``RELATED_GUIDES_COUNT`` of each in
+``guide_related``; ``UserGuide.related`` then reads them with one indexed
+query.
+
+Guides are compared by the cosine similarity of their TF-IDF vectors (title
+and body terms, as indexed for search), plus ``RELATED_GUIDES_CATEGORY_BOOST``
+times the Jaccard similarity of their category sets. Vectors are sparse: a
+guide only stores weights for its own terms, in CSR-style NumPy arrays, and an
+inverted (CSC) copy yields for one guide its dot product with every guide
+sharing a term in a single vectorized pass.
+"""
+
+from typing import Hashable, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core import settings
+from ..core.logger import get_logger
+from ..repositories.guide import GuideRepository
+from .search_index import guide_tokens
+
+logger = get_logger("related")
+
+# Terms in more than this share of guides say nothing about relatedness
+MAX_DOCUMENT_FREQUENCY = 0.5
+
+
+class SparseRows:
+    """Rows of a sparse matrix (CSR) together with its columns (CSC).
+
+    ``row_pointers``/``row_columns``/``row_values`` hold the non-zero entries of
+    each row, ``column_pointers``/``column_rows``/``column_values`` those of
+    each column.
+    """
+
+    def __init__(self, rows: np.ndarray, columns: np.ndarray, values: np.ndarray, shape):
+        row_count, column_count = shape
+        order = np.lexsort((columns, rows))
+        self.row_pointers = _pointers(rows, row_count)
+        self.row_columns = columns[order]
+        self.row_values = values[order]
+        order = np.argsort(columns, kind="stable")
+        self.column_pointers = _pointers(columns, column_count)
+        self.column_rows = rows[order]
+        self.column_values = values[order]
+        self.shape = shape
+
+    def row(self, row: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Columns and values of the non-zero entries of a row."""
+        start, end = self.row_pointers[row], self.row_pointers[row + 1]
+        return self.row_columns[start:end], self.row_values[start:end]
+
+    def products(self, row: int) -> np.ndarray:
+        """Dot product of a row with every row (dense, one value per row)."""
+        columns, values = self.row(row)
+        starts = self.column_pointers[columns]
+        lengths = self.column_pointers[columns + 1] - starts
+        # Positions of all entries of the row's columns, without a Python loop
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        positions = offsets + np.arange(lengths.sum())
+        weights = self.column_values[positions] * np.repeat(values, lengths)
+        products = np.bincount(
+            self.column_rows[positions], weights=weights, minlength=self.shape[0]
+        )
+        # bincount of no entries at all is an integer array
+        return products.astype(float, copy=False)
+
+
+def _pointers(indices: np.ndarray, count: int) -> np.ndarray:
+    return np.concatenate(([0], np.cumsum(np.bincount(indices, minlength=count))))
+
+
+def tfidf_vectors(documents: Sequence[Sequence[str]]) -> SparseRows:
+    """L2-normalized TF-IDF vectors (sublinear term frequency, smoothed IDF) of token lists.
+
+    Terms of a single document or of more than ``MAX_DOCUMENT_FREQUENCY`` of them
+    are dropped after normalizing, since they cannot or should not make two
+    documents similar.
+    """
+    vocabulary = {}
+    rows, columns, counts = [], [], []
+    for row, tokens in enumerate(documents):
+        terms, term_counts = np.unique(
+            np.array([vocabulary.setdefault(token, len(vocabulary)) for token in tokens], int),
+            return_counts=True,
+        )
+        rows.append(np.full(len(terms), row))
+        columns.append(terms)
+        counts.append(term_counts)
+    if not vocabulary:
+        return SparseRows(*(np.empty(0, int),) * 2, np.empty(0), (len(documents), 0))
+    rows, columns = np.concatenate(rows), np.concatenate(columns)
+    counts = np.concatenate(counts).astype(float)
+
+    document_frequency = np.bincount(columns, minlength=len(vocabulary))
+    idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+    values = (1 + np.log(counts)) * idf[columns]
+    norms = np.sqrt(np.bincount(rows, weights=values**2, minlength=len(documents)))
+    values /= norms[rows]
+
+    frequency = document_frequency[columns]
+    keep = (frequency > 1) & (frequency <= MAX_DOCUMENT_FREQUENCY * len(documents))
+    return SparseRows(rows[keep], columns[keep], values[keep], (len(documents), len(vocabulary)))
+
+
+def group_memberships(groups: Sequence[Iterable[Hashable]]) -> SparseRows:
+    """Binary document x group matrix."""
+    ids = {}
+    rows, columns = [], []
+    for row, document_groups in enumerate(groups):
+        for group in dict.fromkeys(document_groups):
+            rows.append(row)
+            columns.append(ids.setdefault(group, len(ids)))
+    rows, columns = np.array(rows, int), np.array(columns, int)
+    return SparseRows(rows, columns, np.ones(len(rows)), (len(groups), len(ids)))
+
+
+def related_documents(
+    documents: Sequence[Tuple[Hashable, Sequence[str], Iterable[Hashable]]],
+    count: int,
+    group_boost: float = 0.0,
+) -> List[Tuple[Hashable, int, Hashable, float]]:
+    """``(key, rank, related key, score)`` of the ``count`` most similar documents of each.
+
+    ``documents`` are ``(key, tokens, groups)``. The score is the cosine
+    similarity of their TF-IDF vectors plus ``group_boost`` times the Jaccard
+    similarity of their groups; documents scoring 0 are never related.
+    Equal scores are ordered by position in ``documents``.
+    """
+    keys = [key for key, _, _ in documents]
+    vectors = tfidf_vectors([tokens for _, tokens, _ in documents])
+    groups = group_memberships([document_groups for _, _, document_groups in documents])
+    group_sizes = np.diff(groups.row_pointers)
+
+    related = []
+    for row in range(len(documents)):
+        scores = vectors.products(row)
+        if group_boost and group_sizes[row]:
+            shared = groups.products(row)
+            union = group_sizes[row] + group_sizes - shared
+            scores += group_boost * np.divide(
+                shared, union, out=np.zeros(len(keys)), where=shared > 0
+            )
+        scores[row] = 0
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > count:
+            threshold = -np.partition(-scores[candidates], count - 1)[count - 1]
+            candidates = candidates[scores[candidates] >= threshold]
+        best = candidates[np.lexsort((candidates, -scores[candidates]))][:count]
+        related.extend(
+            (keys[row], rank, keys[other], float(scores[other]))
+            for rank, other in enumerate(best, start=1)
+        )
+    return related
+
+
+async def refresh_related_guides(session: AsyncSession, repo: GuideRepository | None = None) -> int:
+    """Recompute the related guides of every guide and replace the stored ones.
+
+    Returns the number of stored pairs. The caller commits.
+    """
+    repo = repo or GuideRepository()
+    guides = await repo.list_text(session)
+    related = related_documents(
+        [(guide.id, guide_tokens(guide), guide.category_ids) for guide in guides],
+        settings.RELATED_GUIDES_COUNT,
+        settings.RELATED_GUIDES_CATEGORY_BOOST,
+    )
+    await repo.replace_related(session, related)
+    logger.info("Related guides refreshed", extra={"guides": len(guides), "pairs": len(related)})
+    return len(related)
@@ -0,0 +1,359 @@
+"""
+In-process BM25 search over guides.
+
+With ``SEARCH_BACKEND=memory`` (for deployments that cannot rely on the
+database for search) ``searchGuides`` ranks guides with an inverted index held
+by each process instead of Postgres full-text search. Every term maps to a
+posting list of two compact NumPy arrays, document slots and term
+frequencies, so scoring a query is a few vectorized operations over the
+candidate documents only.
+
+The index is built once from ``GuideRepository.list_text`` and then kept
+current by content change events: a created or updated guide is re-indexed and
+a deleted one removed, without full rebuilds. Events from other instances only
+arrive through Redis; without it the content poll's ``REFRESHED`` event, which
+does not say what changed, rebuilds the whole index instead.
+"""
+
+import asyncio
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from ..core.db import get_read_session
+from ..core.events import REFRESHED, ContentChanged
+from ..core.logger import get_logger
+from ..domain.dtos.guide import GuideTextDTO
+from ..repositories.guide import GuideRepository
+
+logger = get_logger("search_index")
+
+TOKEN_PATTERN = re.compile(r"\w+")
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from how if in into is it its no not of on or "
+    "so such that the their then there these they this to was will with".split()
+)
+# Title terms count as if they appeared this many times in the body
+TITLE_WEIGHT = 3
+
+EMPTY_DOCS = np.empty(0, dtype=np.int32)
+EMPTY_FREQS = np.empty(0, dtype=np.float32)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words of ``text`` without stop words."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def highlight(text: str, terms: Iterable[str], max_words: int = 20) -> str:
+    """Up to ``max_words`` words of ``text`` around the first of ``terms``, matches in <b></b>.
+
+    Like ``ts_headline`` the start of the text is returned when no term occurs.
+    """
+    terms = set(terms)
+    words = text.split()
+    matches = [
+        any(token in terms for token in TOKEN_PATTERN.findall(word.lower())) for word in words
+    ]
+    first = matches.index(True) if True in matches else 0
+    start = max(0, min(first - max_words // 4, len(words) - max_words))
+    return " ".join(
+        f"<b>{word}</b>" if matched else word
+        for word, matched in zip(
+            words[start : start + max_words], matches[start : start + max_words]
+        )
+    )
+
+
+class BM25Index:
+    """Inverted index ranking documents by Okapi BM25.
+
+    Documents are identified by a hashable key and may belong to groups that
+    searches can be restricted to. Each document gets an integer slot; posting
+    lists hold slots (int32) and term frequencies (float32), and document
+    lengths live in one array indexed by slot. Slots of removed documents are
+    reused.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all documents."""
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._groups: Dict[Hashable, np.ndarray] = {}
+        self._slots: Dict[Hashable, int] = {}
+        self._keys: List[Optional[Hashable]] = []
+        self._doc_terms: List[Tuple[str, ...]] = []
+        self._doc_groups: List[Tuple[Hashable, ...]] = []
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._total_length = 0.0
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slots
+
+    def stats(self) -> Dict[str, int]:
+        """Document, term and posting counts, e.g. for logging."""
+        return {
+            "documents": len(self._slots),
+            "terms": len(self._postings),
+            "postings": sum(len(docs) for docs, _ in self._postings.values()),
+        }
+
+    def rebuild(
+        self, documents: Iterable[Tuple[Hashable, Iterable[str], Iterable[Hashable]]]
+    ) -> None:
+        """Replace the whole index with ``(key, tokens, groups)`` documents.
+
+        Posting lists are collected in Python lists and converted to arrays once,
+        which is much cheaper than adding the documents one by one.
+        """
+        self.clear()
+        postings = defaultdict(lambda: ([], []))
+        groups = defaultdict(list)
+        lengths = []
+        for key, tokens, doc_groups in documents:
+            if key in self._slots:
+                raise ValueError(f"Duplicate document key: {key!r}")
+            slot = len(self._keys)
+            counts = Counter(tokens)
+            for term, count in counts.items():
+                docs, freqs = postings[term]
+                docs.append(slot)
+                freqs.append(count)
+            doc_groups = tuple(dict.fromkeys(doc_groups))
+            for group in doc_groups:
+                groups[group].append(slot)
+            self._slots[key] = slot
+            self._keys.append(key)
+            self._doc_terms.append(tuple(counts))
+            self._doc_groups.append(doc_groups)
+            lengths.append(sum(counts.values()))
+
+        self._postings = {
+            term: (np.array(docs, dtype=np.int32), np.array(freqs, dtype=np.float32))
+            for term, (docs, freqs) in postings.items()
+        }
+        self._groups = {group: np.array(docs, dtype=np.int32) for group, docs in groups.items()}
+        self._lengths = np.array(lengths, dtype=np.float32)
+        self._total_length = float(sum(lengths))
+
+    def add(self, key: Hashable, tokens: Iterable[str], groups: Iterable[Hashable] = ()) -> None:
+        """Index a document, replacing the one with the same key if any."""
+        self.remove(key)
+        counts = Counter(tokens)
+        doc_groups = tuple(dict.fromkeys(groups))
+        slot = self._free.pop() if self._free else self._new_slot()
+        for term, count in counts.items():
+            docs, freqs = self._postings.get(term, (EMPTY_DOCS, EMPTY_FREQS))
+            self._postings[term] = (
+                np.append(docs, np.int32(slot)),
+                np.append(freqs, np.float32(count)),
+            )
+        for group in doc_groups:
+            self._groups[group] = np.append(self._groups.get(group, EMPTY_DOCS), np.int32(slot))
+        self._slots[key] = slot
+        self._keys[slot] = key
+        self._doc_terms[slot] = tuple(counts)
+        self._doc_groups[slot] = doc_groups
+        self._lengths[slot] = sum(counts.values())
+        self._total_length += float(self._lengths[slot])
+
+    def remove(self, key: Hashable) -> bool:
+        """Drop a document; returns whether it was indexed."""
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return False
+        for term in self._doc_terms[slot]:
+            docs, freqs = self._postings[term]
+            keep = docs != slot
+            if keep.any():
+                self._postings[term] = (docs[keep], freqs[keep])
+            else:
+                del self._postings[term]
+        for group in self._doc_groups[slot]:
+            self._drop_from_group(group, slot)
+        self._total_length -= float(self._lengths[slot])
+        self._lengths[slot] = 0
+        self._keys[slot] = None
+        self._doc_terms[slot] = ()
+        self._doc_groups[slot] = ()
+        self._free.append(slot)
+        return True
+
+    def remove_group(self, group: Hashable) -> None:
+        """Forget a group; its documents stay indexed."""
+        for slot in self._groups.pop(group, EMPTY_DOCS).tolist():
+            self._doc_groups[slot] = tuple(g for g in self._doc_groups[slot] if g != group)
+
+    def search(
+        self,
+        tokens: Iterable[str],
+        limit: int,
+        offset: int = 0,
+        group: Optional[Hashable] = None,
+    ) -> Tuple[List[Tuple[Hashable, float]], int]:
+        """Up to ``limit`` ``(key, score)`` pairs after ``offset``, best first, and the match count.
+
+        A document matches when it contains any of the tokens. Equal scores are
+        ordered by slot so pages do not overlap.
+        """
+        terms = [term for term in dict.fromkeys(tokens) if term in self._postings]
+        if not terms:
+            return [], 0
+
+        count = len(self._slots)
+        average_length = self._total_length / count
+        slots = []
+        scores = []
+        for term in terms:
+            docs, freqs = self._postings[term]
+            idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            norms = self.k1 * (1 - self.b + self.b * self._lengths[docs] / average_length)
+            slots.append(docs)
+            scores.append(idf * freqs * (self.k1 + 1) / (freqs + norms))
+        slots = np.concatenate(slots)
+        scores = np.concatenate(scores)
+        if len(terms) > 1 and len(slots) * 8 > len(self._lengths):
+            # Sum the per-term scores of each document; with many candidates one
+            # pass over all slots is cheaper than sorting the candidates
+            scores = np.bincount(slots, weights=scores, minlength=len(self._lengths))
+            slots = np.flatnonzero(scores > 0)
+            scores = scores[slots]
+        elif len(terms) > 1:
+            slots, inverse = np.unique(slots, return_inverse=True)
+            scores = np.bincount(inverse, weights=scores)
+        if group is not None:
+            keep = np.isin(slots, self._groups.get(group, EMPTY_DOCS))
+            slots, scores = slots[keep], scores[keep]
+
+        total = len(slots)
+        end = min(offset + limit, total)
+        if offset >= end:
+            return [], total
+        if end < total:
+            # Only the documents scoring at least the end-th best need sorting
+            threshold = np.partition(scores, total - end)[total - end]
+            candidates = np.flatnonzero(scores >= threshold)
+            slots, scores = slots[candidates], scores[candidates]
+        order = np.lexsort((slots, -scores))[offset:end]
+        page = [
+            (self._keys[slot], float(score)) for slot, score in zip(slots[order], scores[order])
+        ]
+        return page, total
+
+    def _new_slot(self) -> int:
+        slot = len(self._keys)
+        self._keys.append(None)
+        self._doc_terms.append(())
+        self._doc_groups.append(())
+        if slot >= len(self._lengths):
+            grown = np.zeros(max(16, 2 * len(self._lengths)), dtype=np.float32)
+            grown[: len(self._lengths)] = self._lengths
+            self._lengths = grown
+        return slot
+
+    def _drop_from_group(self, group: Hashable, slot: int) -> None:
+        docs = self._groups[group]
+        docs = docs[docs != slot]
+        if len(docs):
+            self._groups[group] = docs
+        else:
+            del self._groups[group]
+
+
+def guide_tokens(guide: GuideTextDTO) -> List[str]:
+    """Indexed terms of a guide: its title (weighted) and the text of its body blocks."""
+    return tokenize(guide.title) * TITLE_WEIGHT + tokenize(guide.plaintext)
+
+
+class GuideSearchIndex:
+    """BM25 index of all guides, grouped by category id.
+
+    Built from the database on first use (or at startup) and then updated from
+    content change events, or rebuilt on ``REFRESHED``. Events arriving while
+    the index is being built are applied once it is ready.
+    """
+
+    def __init__(self, repo: GuideRepository | None = None):
+        self.repo = repo or GuideRepository()
+        self.index = BM25Index()
+        self.ready = False
+        self._lock = asyncio.Lock()
+        self._pending: List[ContentChanged] = []
+
+    async def ensure_built(self) -> None:
+        """Build the index from the database unless it already is."""
+        if self.ready:
+            return
+        async with self._lock:
+            if self.ready:
+                return
+            await self._load()
+        await self._apply_pending()
+
+    async def rebuild(self) -> None:
+        """Rebuild the index from the database, replacing it once loaded."""
+        async with self._lock:
+            await self._load()
+        await self._apply_pending()
+
+    async def _load(self) -> None:
+        async with get_read_session() as session:
+            guides = await self.repo.list_text(session)
+        self.index.rebuild((guide.id, guide_tokens(guide), guide.category_ids) for guide in guides)
+        self.ready = True
+        logger.info("Guide search index built", extra=self.index.stats())
+
+    async def _apply_pending(self) -> None:
+        pending, self._pending = self._pending, []
+        for event in pending:
+            await self.handle_content_change(event)
+
+    async def search(
+        self,
+        query: str,
+        first: int,
+        offset: int = 0,
+        category_id: Optional[UUID] = None,
+    ) -> Tuple[List[Tuple[UUID, float]], int]:
+        """``(guide id, score)`` pairs of a page of matches, best first, and the match count."""
+        await self.ensure_built()
+        return self.index.search(tokenize(query), first, offset, category_id)
+
+    async def handle_content_change(self, event: ContentChanged) -> None:
+        if self._lock.locked():
+            # Being built from rows that may predate the event: apply afterwards
+            self._pending.append(event)
+            return
+        if not self.ready:
+            # Nothing to update; the index will be built from current rows
+            return
+        if event == REFRESHED:
+            await self.rebuild()
+        elif event.entity == "guide":
+            guide_id = UUID(event.id)
+            if event.action == "deleted":
+                self.index.remove(guide_id)
+                return
+            async with get_read_session() as session:
+                guide = await self.repo.get_text(session, guide_id)
+            if guide is None:
+                self.index.remove(guide_id)
+            else:
+                self.index.add(guide.id, guide_tokens(guide), guide.category_ids)
+        elif event.entity == "category" and event.action == "deleted":
+            self.index.remove_group(UUID(event.id))
+
+
+guide_search_index = GuideSearchIndex()
@@ -0,0 +1,229 @@
+"""
+Typeahead suggestions for guide titles and category names.
+
+Every keystroke in the help widget's search box asks for suggestions, so they
+are answered from memory without touching the database. Normalized titles and
+names are kept in sorted arrays and a prefix is found with two binary
+searches, a compact stand-in for a prefix trie. The arrays are filled from the
+database once (at startup or on first use) and then kept current by content
+change events. Events from other instances only arrive through Redis; without
+it the content poll's ``REFRESHED`` event reloads everything instead.
+"""
+
+import asyncio
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Tuple
+from uuid import UUID
+
+from ..core.db import get_read_session
+from ..core.events import REFRESHED, ContentChanged
+from ..core.logger import get_logger
+from ..repositories.category import CategoryRepository
+from ..repositories.guide import GuideRepository
+
+logger = get_logger("suggestions")
+
+NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize(text: str) -> str:
+    """Casefolded words of ``text`` without accents or punctuation, separated by single spaces."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return NON_WORD.sub(" ", stripped.casefold()).strip()
+
+
+class PrefixIndex:
+    """Values found by a prefix of their normalized text.
+
+    A value is indexed under its whole text and under each later word, so
+    "pass" finds "Reset your password"; values whose text starts with the
+    prefix come first. Each tier is a sorted list of keys with the values in a
+    parallel list.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all values."""
+        # (keys, values) of whole texts, then of the words after the first one
+        self._tiers: Tuple[Tuple[List[str], List[Hashable]], ...] = (([], []), ([], []))
+        self._texts: Dict[Hashable, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._texts
+
+    def rebuild(self, items: Iterable[Tuple[Hashable, str]]) -> None:
+        """Replace all values with ``(value, text)`` items, sorting each tier once."""
+        self.clear()
+        entries = ([], [])
+        for value, text in items:
+            text = normalize(text)
+            self._texts[value] = text
+            for tier, key in self._keys(text):
+                entries[tier].append((key, value))
+        for (keys, values), tier_entries in zip(self._tiers, entries):
+            tier_entries.sort(key=lambda entry: entry[0])
+            keys.extend(key for key, _ in tier_entries)
+            values.extend(value for _, value in tier_entries)
+
+    def add(self, value: Hashable, text: str) -> None:
+        """Index a value, replacing its previous text if any."""
+        self.remove(value)
+        text = normalize(text)
+        self._texts[value] = text
+        for tier, key in self._keys(text):
+            keys, values = self._tiers[tier]
+            position = bisect_right(keys, key)
+            keys.insert(position, key)
+            values.insert(position, value)
+
+    def remove(self, value: Hashable) -> bool:
+        """Drop a value; returns whether it was indexed."""
+        text = self._texts.pop(value, None)
+        if text is None:
+            return False
+        for tier, key in self._keys(text):
+            keys, values = self._tiers[tier]
+            position = bisect_left(keys, key)
+            while values[position] != value:
+                position += 1
+            del keys[position]
+            del values[position]
+        return True
+
+    def search(self, prefix: str, limit: int) -> List[Hashable]:
+        """Up to ``limit`` distinct values with a text or word starting with ``prefix``."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        found: Dict[Hashable, None] = {}
+        for keys, values in self._tiers:
+            position = bisect_left(keys, prefix)
+            end = bisect_left(keys, prefix + "\U0010ffff", position)
+            for index in range(position, end):
+                found[values[index]] = None
+                if len(found) == limit:
+                    return list(found)
+        return list(found)
+
+    @staticmethod
+    def _keys(text: str) -> Iterable[Tuple[int, str]]:
+        if not text:
+            return
+        yield 0, text
+        for match in re.finditer(" ", text):
+            yield 1, text[match.end() :]
+
+
+@dataclass(frozen=True)
+class TitleSuggestion:
+    kind: str  # "guide" or "category"
+    id: UUID
+    text: str
+    slug: str
+
+
+class TitleSuggestions:
+    """Suggestions over all guide titles and category names of this process.
+
+    Built from the database on first use (or at startup) and then updated from
+    content change events, or rebuilt on ``REFRESHED``; looking up suggestions
+    never queries the database.
+    """
+
+    def __init__(
+        self,
+        guide_repo: GuideRepository | None = None,
+        category_repo: CategoryRepository | None = None,
+    ):
+        self.guide_repo = guide_repo or GuideRepository()
+        self.category_repo = category_repo or CategoryRepository()
+        self.index = PrefixIndex()
+        self.suggestions: Dict[Tuple[str, UUID], TitleSuggestion] = {}
+        self.ready = False
+        self._lock = asyncio.Lock()
+        self._pending: List[ContentChanged] = []
+
+    async def ensure_built(self) -> None:
+        """Load all titles and names unless they already are."""
+        if self.ready:
+            return
+        async with self._lock:
+            if self.ready:
+                return
+            await self._load()
+        await self._apply_pending()
+
+    async def rebuild(self) -> None:
+        """Reload all titles and names, replacing the current ones once loaded."""
+        async with self._lock:
+            await self._load()
+        await self._apply_pending()
+
+    async def _load(self) -> None:
+        async with get_read_session() as session:
+            guides = await self.guide_repo.list_columns(session, ("id", "title", "slug"))
+            categories = await self.category_repo.list_columns(session, ("id", "name", "slug"))
+        self.suggestions = {
+            (kind, id): TitleSuggestion(kind, id, text, slug)
+            for kind, rows in (("guide", guides), ("category", categories))
+            for id, text, slug in rows
+        }
+        self.index.rebuild((key, item.text) for key, item in self.suggestions.items())
+        self.ready = True
+        logger.info(
+            "Title suggestions built",
+            extra={"guides": len(guides), "categories": len(categories)},
+        )
+
+    async def _apply_pending(self) -> None:
+        pending, self._pending = self._pending, []
+        for event in pending:
+            await self.handle_content_change(event)
+
+    async def suggest(self, prefix: str, limit: int) -> List[TitleSuggestion]:
+        """Guides and categories whose title or name, or one of its words, starts with a prefix."""
+        await self.ensure_built()
+        return [self.suggestions[key] for key in self.index.search(prefix, limit)]
+
+    async def handle_content_change(self, event: ContentChanged) -> None:
+        if event.entity not in ("guide", "category") and event != REFRESHED:
+            return
+        if self._lock.locked():
+            # Being built from rows that may predate the event: apply afterwards
+            self._pending.append(event)
+            return
+        if not self.ready:
+            # Nothing to update; suggestions will be built from current rows
+            return
+        if event == REFRESHED:
+            await self.rebuild()
+            return
+        key = (event.entity, UUID(event.id))
+        row = None
+        if event.action != "deleted":
+            repo, columns = (
+                (self.guide_repo, ("id", "title", "slug"))
+                if event.entity == "guide"
+                else (self.category_repo, ("id", "name", "slug"))
+            )
+            async with get_read_session() as session:
+                rows = await repo.list_columns(session, columns, [repo.model.id == key[1]])
+            row = rows[0] if rows else None
+        if row is None:
+            self.index.remove(key)
+            self.suggestions.pop(key, None)
+            return
+        self.suggestions[key] = TitleSuggestion(event.entity, *row)
+        self.index.add(key, row[1])
+
+
+title_suggestions = TitleSuggestions()
@@ -0,0 +1,48 @@
+"""
+Opaque cursors for keyset pagination.
+
+A cursor is the URL-safe base64 encoding of the JSON list of sort-key values of
+a row. Clients must treat it as opaque; the server decodes it back into the
+values of the keyset (e.g. ``(created_at, id)``) to continue after that row.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, Sequence, Tuple
+from uuid import UUID
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort-key values of a row into an opaque cursor."""
+    payload = json.dumps([_serialize(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, parsers: Sequence[Callable[[Any], Any]]) -> Tuple[Any, ...]:
+    """Decode a cursor into its sort-key values, parsing each with ``parsers``.
+
+    Raises ValueError for anything that was not produced by ``encode_cursor``
+    for a keyset of the same shape.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(parsers):
+        raise ValueError("Invalid cursor")
+
+    try:
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
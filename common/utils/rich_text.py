@@ -0,0 +1,142 @@
+"""
+Helpers for guide bodies in the rich text format checked by
+``CommonValidators.validate_rich_text_body``: ``{"blocks": [...]}`` where each
+block has a ``type`` (``heading``, ``paragraph`` or ``list``) and either a
+``text`` or an ``items`` array.
+
+``derive_content`` computes what list views and tables of contents need from
+a body; repositories store it whenever the body is written. ``render_html``
+turns a body into HTML for clients that do not render blocks themselves.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from html import escape
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+def block_texts(body: Any, block_types: Optional[Sequence[str]] = None) -> Iterator[str]:
+    """Text of the blocks of the given types (all blocks when None) and their list items, in order.
+
+    Mirrors the ``userguide_block_text`` SQL function behind full-text search.
+    """
+    blocks = body.get("blocks") if isinstance(body, dict) else None
+    if not isinstance(blocks, list):
+        return
+    for block in blocks:
+        if not isinstance(block, dict):
+            continue
+        if block_types is not None and block.get("type") not in block_types:
+            continue
+        if isinstance(block.get("text"), str):
+            yield block["text"]
+        if isinstance(block.get("items"), list):
+            yield from (str(item) for item in block["items"] if item is not None)
+
+
+def block_text(body: Any, block_types: Optional[Sequence[str]] = None) -> str:
+    """``block_texts`` joined by spaces."""
+    return " ".join(block_texts(body, block_types))
+
+
+# Characters of plain text kept in a guide's excerpt
+EXCERPT_LENGTH = 200
+# Reading speed behind the default estimated read time
+WORDS_PER_MINUTE = 200
+MAX_READ_TIME = 300
+
+NON_ANCHOR = re.compile(r"[^a-z0-9]+")
+
+
+@dataclass(frozen=True)
+class DerivedContent:
+    """Values derived from a guide body, stored next to it so readers need not walk it."""
+
+    plaintext: str
+    excerpt: str
+    word_count: int
+    toc: List[Dict[str, Any]]
+
+    @property
+    def read_time(self) -> int:
+        """Minutes to read ``word_count`` words, between 1 and ``MAX_READ_TIME``."""
+        return min(MAX_READ_TIME, max(1, math.ceil(self.word_count / WORDS_PER_MINUTE)))
+
+
+def excerpt(text: str, length: int = EXCERPT_LENGTH) -> str:
+    """The first ``length`` characters of ``text``, cut at a word boundary, "…" when cut."""
+    text = " ".join(text.split())
+    if len(text) <= length:
+        return text
+    cut = text[: length + 1].rsplit(" ", 1)[0] if " " in text[:length] else text[:length]
+    return cut.rstrip(" ,.;:") + "…"
+
+
+def _blocks(body: Any) -> List[Dict[str, Any]]:
+    blocks = body.get("blocks") if isinstance(body, dict) else None
+    return (
+        [block for block in blocks if isinstance(block, dict)] if isinstance(blocks, list) else []
+    )
+
+
+def _headings(body: Any) -> Iterator[Tuple[Dict[str, Any], int, str]]:
+    """Heading blocks with text, their level (1-6) and an anchor unique within the body."""
+    anchors: Dict[str, int] = {}
+    for block in _blocks(body):
+        text = block.get("text")
+        if block.get("type") != "heading" or not isinstance(text, str) or not text.strip():
+            continue
+        anchor = NON_ANCHOR.sub("-", text.lower()).strip("-") or "section"
+        anchors[anchor] = anchors.get(anchor, 0) + 1
+        if anchors[anchor] > 1:
+            anchor = f"{anchor}-{anchors[anchor]}"
+        level = block.get("level")
+        yield block, min(6, max(1, level)) if isinstance(level, int) else 1, anchor
+
+
+def table_of_contents(body: Any) -> List[Dict[str, Any]]:
+    """``{"level", "text", "anchor"}`` of the heading blocks, anchors unique within the body."""
+    return [
+        {"level": level, "text": block["text"], "anchor": anchor}
+        for block, level, anchor in _headings(body)
+    ]
+
+
+def render_html(body: Any) -> str:
+    """HTML of the heading, paragraph and list blocks; other blocks are skipped.
+
+    Text is escaped, headings carry the ``toc`` anchors as ids and lists are
+    unordered unless the block sets ``"ordered": true``.
+    """
+    headings = {id(block): (level, anchor) for block, level, anchor in _headings(body)}
+    parts = []
+    for block in _blocks(body):
+        kind, text = block.get("type"), block.get("text")
+        if kind == "heading" and id(block) in headings:
+            level, anchor = headings[id(block)]
+            parts.append(f'<h{level} id="{anchor}">{escape(text)}</h{level}>')
+        elif kind == "paragraph" and isinstance(text, str):
+            parts.append(f"<p>{escape(text)}</p>")
+        elif kind == "list" and isinstance(block.get("items"), list):
+            tag = "ol" if block.get("ordered") is True else "ul"
+            items = "".join(
+                f"<li>{escape(str(item))}</li>" for item in block["items"] if item is not None
+            )
+            parts.append(f"<{tag}>{items}</{tag}>")
+    return "".join(parts)
+
+
+def derive_content(body: Any) -> DerivedContent:
+    """Plain text, excerpt, word count and table of contents of a body.
+
+    The excerpt skips headings, which the title and the table of contents
+    already show, unless the body has nothing else.
+    """
+    plaintext = block_text(body)
+    return DerivedContent(
+        plaintext=plaintext,
+        excerpt=excerpt(block_text(body, ("paragraph", "list")) or plaintext),
+        word_count=len(plaintext.split()),
+        toc=table_of_contents(body),
+    )
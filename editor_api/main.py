@@ -3,13 +3,18 @@ Help Center Editor API - Cloud Run
 A dedicated service for editor operations (REST API)
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+from common.core import events
+from common.core.db import check_replica_pinning, pin_primary
 from common.core.logger import setup_logging
 from common.core.middleware import RequestLoggingMiddleware
 from common.core.rate_limiting import setup_rate_limiting
 from common.core.settings import ALLOWED_ORIGINS, ENVIRONMENT, LOG_LEVEL
+from common.domain.extensions.response_cache import response_cache
 from common.domain.rest import (
     dev_editor_router,
     guide_editor_router,
@@ -18,10 +23,25 @@ from common.domain.rest import (
 
 setup_logging(LOG_LEVEL)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Purge shared (Redis) GraphQL responses as soon as a write commits, even
+    # when no GraphQL instance is running to receive the event
+    events.subscribe(response_cache.handle_content_change)
+    # Reads that follow a write go to the primary until the replicas catch up
+    events.subscribe(pin_primary)
+    check_replica_pinning()
+    yield
+    events.unsubscribe(pin_primary)
+    events.unsubscribe(response_cache.handle_content_change)
+
+
 app = FastAPI(
     title="Help Center Editor API",
     description="Editor API for help center content management",
     version="1.0.0",
+    lifespan=lifespan,
 )
 app.add_middleware(RequestLoggingMiddleware)
 app.add_middleware(
@@ -1,20 +1,50 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 import strawberry
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from lia import HTTPException
 from pydantic import ValidationError
 from strawberry.fastapi import GraphQLRouter
-
-from common.core.db import get_session
+from strawberry.schema.config import StrawberryConfig
+from strawberry.utils import IS_GQL_33
+
+from common.core import events
+from common.core.db import (
+    RequestSession,
+    check_replica_pinning,
+    get_read_session_factory,
+    pin_primary,
+)
 from common.core.logger import get_correlation_id, get_logger, setup_logging
 from common.core.middleware import RequestLoggingMiddleware
 from common.core.rate_limiting import limiter, setup_rate_limiting
-from common.core.settings import ALLOWED_ORIGINS, ENVIRONMENT, LOG_LEVEL
+from common.core.settings import (
+    ALLOWED_ORIGINS,
+    CONTENT_POLL_SECONDS,
+    ENVIRONMENT,
+    GRAPHQL_BATCH_MAX_OPERATIONS,
+    GRAPHQL_INCREMENTAL_DELIVERY,
+    LOG_LEVEL,
+    SEARCH_BACKEND,
+)
 from common.core.validation import create_error_response, handle_validation_error
+from common.domain.extensions import (
+    DocumentCacheExtension,
+    PersistedQueryExtension,
+    QueryCostExtension,
+    ResponseCacheExtension,
+    TracingExtension,
+)
+from common.domain.extensions.document_cache import document_cache
+from common.domain.extensions.response_cache import response_cache
 from common.domain.resolvers import Mutation, Query
+from common.domain.resolvers.loaders import create_loaders
+from common.services.search_index import guide_search_index
+from common.services.suggestions import title_suggestions
 
 setup_logging(LOG_LEVEL)
 
@@ -24,8 +54,55 @@ async def lifespan(app: FastAPI):
     setup_logging(LOG_LEVEL)
     logger = get_logger("startup")
     logger.info("Application starting up", extra={"environment": ENVIRONMENT})
+    if GRAPHQL_INCREMENTAL_DELIVERY and not IS_GQL_33:
+        logger.warning("GraphQL @defer/@stream disabled: graphql-core>=3.3 is not installed")
+    if not events.is_distributed():
+        # State derived from content is then only refreshed by the content poll
+        logger.warning(
+            "REDIS_URL is not set: content changes made through other instances are only "
+            + (
+                f"noticed by polling the database every {CONTENT_POLL_SECONDS:g}s"
+                if CONTENT_POLL_SECONDS > 0
+                else "noticed after a restart (CONTENT_POLL_SECONDS=0)"
+            ),
+            extra={
+                "stale_until_noticed": ["cached responses", "title suggestions"]
+                + (["in-memory search index"] if SEARCH_BACKEND == "memory" else [])
+            },
+        )
+
+    # Editor writes published by other instances pin reads to the primary while
+    # replicas catch up, and flush cached responses
+    events.subscribe(pin_primary)
+    check_replica_pinning()
+    events.subscribe(response_cache.handle_content_change)
+    # Typeahead suggestions are answered from memory and follow content changes
+    events.subscribe(title_suggestions.handle_content_change)
+    try:
+        await title_suggestions.ensure_built()
+    except Exception as e:
+        logger.warning(f"Title suggestions not built at startup: {e}")
+    if SEARCH_BACKEND == "memory":
+        # Guide edits update the in-process search index; it is built up front so
+        # the first search does not pay for it
+        events.subscribe(guide_search_index.handle_content_change)
+        try:
+            await guide_search_index.ensure_built()
+        except Exception as e:
+            logger.warning(f"Guide search index not built at startup: {e}")
+    listener = asyncio.create_task(events.listen())
     yield
-    logger.info("Application shutting down")
+    listener.cancel()
+    with suppress(asyncio.CancelledError):
+        await listener
+    events.unsubscribe(guide_search_index.handle_content_change)
+    events.unsubscribe(title_suggestions.handle_content_change)
+    events.unsubscribe(response_cache.handle_content_change)
+    events.unsubscribe(pin_primary)
+    logger.info(
+        "Application shutting down",
+        extra={"graphql_document_cache": document_cache.stats()},
+    )
 
 
 app = FastAPI(
@@ -100,14 +177,57 @@ async def general_exception_handler(request: Request, exc: Exception):
 # GraphQL setup
 # ------------------------------
 
-schema = strawberry.Schema(query=Query, mutation=Mutation)
+schema = strawberry.Schema(
+    query=Query,
+    mutation=Mutation,
+    extensions=[
+        TracingExtension,
+        PersistedQueryExtension,
+        DocumentCacheExtension,
+        QueryCostExtension,
+        ResponseCacheExtension,
+    ],
+    # A JSON array of operations is executed concurrently with one shared context
+    config=StrawberryConfig(
+        batching_config=(
+            {"max_operations": GRAPHQL_BATCH_MAX_OPERATIONS}
+            if GRAPHQL_BATCH_MAX_OPERATIONS > 0
+            else None
+        ),
+        # @defer/@stream results are sent as multipart/mixed; needs graphql-core>=3.3
+        enable_experimental_incremental_execution=GRAPHQL_INCREMENTAL_DELIVERY and IS_GQL_33,
+    ),
+)
 
 
 async def get_context():
-    return {"get_session": get_session}
-
-
-graphql_app = GraphQLRouter(
+    # One lazily opened session per request, shared by all resolvers, loaders and every
+    # operation of a batched request
+    # The API only reads, so the session autocommits and comes from a replica when
+    # one is configured
+    request_session = RequestSession(get_read_session_factory())
+    try:
+        yield {"get_session": request_session, "loaders": create_loaders(request_session)}
+    finally:
+        await request_session.close()
+
+
+class HelpCenterGraphQLRouter(GraphQLRouter):
+    def parse_json(self, data):
+        request_data = super().parse_json(data)
+        # Strawberry assumes every operation of a batch is an object
+        if isinstance(request_data, list) and not all(isinstance(op, dict) for op in request_data):
+            raise HTTPException(400, "Each operation of a batch must be a JSON object")
+        return request_data
+
+    def should_render_graphql_ide(self, request) -> bool:
+        # Persisted-query GETs carry only a hash, no query; execute them instead of serving GraphiQL
+        if "extensions" in request.query_params:
+            return False
+        return super().should_render_graphql_ide(request)
+
+
+graphql_app = HelpCenterGraphQLRouter(
     schema,
     allow_queries_via_get=True,
     context_getter=get_context,
@@ -0,0 +1,128 @@
+"""add guide derived content
+
+Revision ID: a7b9c1d3e5f7
+Revises: f6a8b0c2d4e6
+Create Date: 2026-10-17 17:11:52.604127
+
+"""
+
+import re
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "a7b9c1d3e5f7"
+down_revision: Union[str, Sequence[str], None] = "f6a8b0c2d4e6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# The derivation as ``common.utils.rich_text.derive_content`` did it when this
+# revision was written, copied so later changes to the app cannot change what
+# this migration computes
+EXCERPT_LENGTH = 200
+NON_ANCHOR = re.compile(r"[^a-z0-9]+")
+
+
+def blocks(body: Any) -> List[Dict[str, Any]]:
+    items = body.get("blocks") if isinstance(body, dict) else None
+    return [block for block in items if isinstance(block, dict)] if isinstance(items, list) else []
+
+
+def block_texts(body: Any, block_types: Optional[Sequence[str]] = None) -> Iterator[str]:
+    for block in blocks(body):
+        if block_types is not None and block.get("type") not in block_types:
+            continue
+        if isinstance(block.get("text"), str):
+            yield block["text"]
+        if isinstance(block.get("items"), list):
+            yield from (str(item) for item in block["items"] if item is not None)
+
+
+def excerpt(text: str) -> str:
+    text = " ".join(text.split())
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    if " " in text[:EXCERPT_LENGTH]:
+        cut = text[: EXCERPT_LENGTH + 1].rsplit(" ", 1)[0]
+    else:
+        cut = text[:EXCERPT_LENGTH]
+    return cut.rstrip(" ,.;:") + "…"
+
+
+def table_of_contents(body: Any) -> List[Dict[str, Any]]:
+    toc, anchors = [], {}
+    for block in blocks(body):
+        text = block.get("text")
+        if block.get("type") != "heading" or not isinstance(text, str) or not text.strip():
+            continue
+        anchor = NON_ANCHOR.sub("-", text.lower()).strip("-") or "section"
+        anchors[anchor] = anchors.get(anchor, 0) + 1
+        if anchors[anchor] > 1:
+            anchor = f"{anchor}-{anchors[anchor]}"
+        level = block.get("level")
+        level = min(6, max(1, level)) if isinstance(level, int) else 1
+        toc.append({"level": level, "text": text, "anchor": anchor})
+    return toc
+
+
+def derived_values(body: Any) -> Dict[str, Any]:
+    plaintext = " ".join(block_texts(body))
+    return {
+        "plaintext": plaintext,
+        "excerpt": excerpt(" ".join(block_texts(body, ("paragraph", "list"))) or plaintext),
+        "word_count": len(plaintext.split()),
+        "toc": table_of_contents(body),
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("userguide", sa.Column("plaintext", sa.Text(), server_default="", nullable=False))
+    op.add_column("userguide", sa.Column("excerpt", sa.Text(), server_default="", nullable=False))
+    op.add_column(
+        "userguide", sa.Column("word_count", sa.Integer(), server_default="0", nullable=False)
+    )
+    op.add_column(
+        "userguide",
+        sa.Column(
+            "toc", postgresql.JSON(astext_type=sa.Text()), server_default="[]", nullable=False
+        ),
+    )
+
+    # Existing guides get the values the repository computes on write
+    guides = sa.table(
+        "userguide",
+        sa.column("id", sa.Uuid()),
+        sa.column("body", postgresql.JSON()),
+        sa.column("plaintext", sa.Text()),
+        sa.column("excerpt", sa.Text()),
+        sa.column("word_count", sa.Integer()),
+        sa.column("toc", postgresql.JSON()),
+    )
+    connection = op.get_bind()
+    update = (
+        guides.update()
+        .where(guides.c.id == sa.bindparam("guide_id"))
+        .values(
+            plaintext=sa.bindparam("plaintext"),
+            excerpt=sa.bindparam("excerpt"),
+            word_count=sa.bindparam("word_count"),
+            toc=sa.bindparam("toc", type_=postgresql.JSON()),
+        )
+    )
+    rows = connection.execute(sa.select(guides.c.id, guides.c.body)).yield_per(BACKFILL_BATCH_SIZE)
+    for batch in rows.partitions():
+        connection.execute(update, [{"guide_id": id, **derived_values(body)} for id, body in batch])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("userguide", "toc")
+    op.drop_column("userguide", "word_count")
+    op.drop_column("userguide", "excerpt")
+    op.drop_column("userguide", "plaintext")
@@ -0,0 +1,210 @@
+"""convert guide body to jsonb
+
+Revision ID: b8c0d2e4f6a8
+Revises: a7b9c1d3e5f7
+Create Date: 2026-10-17 18:40:19.372915
+
+"""
+
+from typing import Sequence, Union
+from uuid import UUID
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b8c0d2e4f6a8"
+down_revision: Union[str, Sequence[str], None] = "a7b9c1d3e5f7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The search functions of d4e6f8a0b2c4 for a body of type "{json}" (json or
+# jsonb, whose functions are named alike)
+BLOCK_TEXT_FUNCTION = """
+    CREATE OR REPLACE FUNCTION userguide_block_text(body {json}, block_types text[] DEFAULT NULL)
+    RETURNS text LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+        SELECT coalesce(
+            string_agg(texts.text, ' ' ORDER BY blocks.position, texts.position), ''
+        )
+        FROM {json}_array_elements(
+            CASE WHEN {json}_typeof(body -> 'blocks') = 'array'
+            THEN body -> 'blocks' ELSE '[]' END
+        ) WITH ORDINALITY AS blocks(block, position)
+        CROSS JOIN LATERAL (
+            SELECT blocks.block ->> 'text', 0
+            WHERE {json}_typeof(blocks.block) = 'object' AND blocks.block ->> 'text' IS NOT NULL
+            UNION ALL
+            SELECT item, position
+            FROM {json}_array_elements_text(
+                CASE WHEN {json}_typeof(blocks.block) = 'object'
+                    AND {json}_typeof(blocks.block -> 'items') = 'array'
+                THEN blocks.block -> 'items' ELSE '[]' END
+            ) WITH ORDINALITY AS items(item, position)
+        ) AS texts(text, position)
+        WHERE block_types IS NULL OR blocks.block ->> 'type' = ANY (block_types)
+    $$
+"""
+SEARCH_VECTOR_FUNCTION = """
+    CREATE OR REPLACE FUNCTION userguide_search_vector(title text, body {json})
+    RETURNS tsvector LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+        SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+            || setweight(
+                to_tsvector('english', userguide_block_text(body, ARRAY['heading'])), 'B'
+            )
+            || setweight(
+                to_tsvector('english', userguide_block_text(body, ARRAY['paragraph', 'list'])),
+                'C'
+            )
+    $$
+"""
+
+
+# Keeps the new columns current while they are backfilled
+SYNC_FUNCTION = """
+    CREATE FUNCTION userguide_body_jsonb_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.body_jsonb := NEW.body::jsonb;
+        NEW.search_vector_jsonb := userguide_search_vector(NEW.title, NEW.body::jsonb);
+        RETURN NEW;
+    END
+    $$
+"""
+SYNC_TRIGGER = """
+    CREATE TRIGGER userguide_body_jsonb_sync BEFORE INSERT OR UPDATE ON userguide
+    FOR EACH ROW EXECUTE FUNCTION userguide_body_jsonb_sync()
+"""
+# Maintains search_vector from now on, as the generated column did (see models/guide.py)
+SEARCH_VECTOR_UPDATE_FUNCTION = """
+    CREATE FUNCTION userguide_search_vector_update() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_vector := userguide_search_vector(NEW.title, NEW.body);
+        RETURN NEW;
+    END
+    $$
+"""
+SEARCH_VECTOR_UPDATE_TRIGGER = """
+    CREATE TRIGGER userguide_search_vector_update BEFORE INSERT OR UPDATE OF title, body
+    ON userguide FOR EACH ROW EXECUTE FUNCTION userguide_search_vector_update()
+"""
+BACKFILL_BATCH = sa.text("""
+    WITH batch AS (SELECT id FROM userguide WHERE id > :after ORDER BY id LIMIT :size)
+    UPDATE userguide SET body_jsonb = body::jsonb
+    FROM batch WHERE userguide.id = batch.id
+    RETURNING userguide.id
+""")
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill() -> None:
+    """Fill the new columns of rows older than the sync trigger, committing every batch."""
+    connection = op.get_bind()
+    after = UUID(int=0)
+    while True:
+        ids = connection.execute(
+            BACKFILL_BATCH, {"after": after, "size": BACKFILL_BATCH_SIZE}
+        ).scalars()
+        after = max(ids, default=None)
+        if after is None:
+            return
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    ALTER COLUMN ... TYPE would rewrite userguide under an ACCESS EXCLUSIVE
+    lock, and so would re-adding the generated search_vector, which depends
+    on the body type; search would also run without its GIN index until it
+    was rebuilt. Instead jsonb copies of both columns are added, kept current
+    by a trigger, backfilled in batches and indexed concurrently. A short
+    final step then swaps them in by dropping and renaming columns, which
+    only changes the catalog. From then on search_vector is maintained by a
+    trigger instead of being generated: a generated column cannot be added
+    without a rewrite.
+    """
+    op.execute(BLOCK_TEXT_FUNCTION.format(json="jsonb"))
+    op.execute(SEARCH_VECTOR_FUNCTION.format(json="jsonb"))
+    op.add_column("userguide", sa.Column("body_jsonb", postgresql.JSONB(), nullable=True))
+    op.add_column(
+        "userguide", sa.Column("search_vector_jsonb", postgresql.TSVECTOR(), nullable=True)
+    )
+    op.execute(SYNC_FUNCTION)
+    op.execute(SYNC_TRIGGER)
+
+    # Committed first, so writers see the trigger before the backfill starts
+    with op.get_context().autocommit_block():
+        backfill()
+        op.create_index(
+            "ix_userguide_search_vector_jsonb",
+            "userguide",
+            ["search_vector_jsonb"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        # Containment (@>) queries such as guides with a block of some type
+        op.create_index(
+            "ix_userguide_body_path_ops",
+            "userguide",
+            ["body_jsonb"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"body_jsonb": "jsonb_path_ops"},
+            postgresql_concurrently=True,
+        )
+        # Validated without blocking writes, so SET NOT NULL below needs no scan
+        op.execute(
+            "ALTER TABLE userguide ADD CONSTRAINT userguide_body_jsonb_not_null "
+            "CHECK (body_jsonb IS NOT NULL) NOT VALID"
+        )
+        op.execute("ALTER TABLE userguide VALIDATE CONSTRAINT userguide_body_jsonb_not_null")
+
+    op.execute("LOCK TABLE userguide IN ACCESS EXCLUSIVE MODE")
+    op.alter_column("userguide", "body_jsonb", nullable=False)
+    op.drop_constraint("userguide_body_jsonb_not_null", "userguide", type_="check")
+    op.execute("DROP TRIGGER userguide_body_jsonb_sync ON userguide")
+    op.execute("DROP FUNCTION userguide_body_jsonb_sync()")
+    op.drop_index("ix_userguide_search_vector", table_name="userguide", postgresql_using="gin")
+    op.drop_column("userguide", "search_vector")
+    op.drop_column("userguide", "body")
+    op.execute("DROP FUNCTION userguide_search_vector(text, json)")
+    op.execute("DROP FUNCTION userguide_block_text(json, text[])")
+    op.alter_column("userguide", "body_jsonb", new_column_name="body")
+    op.alter_column("userguide", "search_vector_jsonb", new_column_name="search_vector")
+    op.execute("ALTER INDEX ix_userguide_search_vector_jsonb RENAME TO ix_userguide_search_vector")
+    op.execute(SEARCH_VECTOR_UPDATE_FUNCTION)
+    op.execute(SEARCH_VECTOR_UPDATE_TRIGGER)
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Converts the body back in place and re-adds the generated search_vector,
+    both rewriting userguide under an ACCESS EXCLUSIVE lock.
+    """
+    op.drop_index("ix_userguide_body_path_ops", table_name="userguide", postgresql_using="gin")
+    op.execute("DROP TRIGGER userguide_search_vector_update ON userguide")
+    op.execute("DROP FUNCTION userguide_search_vector_update()")
+    op.drop_index("ix_userguide_search_vector", table_name="userguide", postgresql_using="gin")
+    op.drop_column("userguide", "search_vector")
+    op.execute("DROP FUNCTION userguide_search_vector(text, jsonb)")
+    op.execute("DROP FUNCTION userguide_block_text(jsonb, text[])")
+    op.execute("ALTER TABLE userguide ALTER COLUMN body TYPE json USING body::json")
+    op.execute(BLOCK_TEXT_FUNCTION.format(json="json"))
+    op.execute(SEARCH_VECTOR_FUNCTION.format(json="json"))
+    op.add_column(
+        "userguide",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("userguide_search_vector(title, body)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_userguide_search_vector",
+        "userguide",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
@@ -0,0 +1,31 @@
+"""add keyset pagination indexes
+
+Revision ID: c3d5e7f9a1b2
+Revises: a9ae45e04cf3
+Create Date: 2026-10-17 09:12:41.503218
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d5e7f9a1b2"
+down_revision: Union[str, Sequence[str], None] = "a9ae45e04cf3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Guides and media are paginated by (created_at, id); categories use the
+    # existing unique index on slug
+    op.create_index("ix_userguide_created_at_id", "userguide", ["created_at", "id"], unique=False)
+    op.create_index("ix_media_created_at_id", "media", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_media_created_at_id", table_name="media")
+    op.drop_index("ix_userguide_created_at_id", table_name="userguide")
@@ -0,0 +1,65 @@
+"""add link reverse indexes and cascades
+
+Revision ID: c9d1e3f5a7b9
+Revises: b8c0d2e4f6a8
+Create Date: 2026-10-17 19:52:06.845190
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c9d1e3f5a7b9"
+down_revision: Union[str, Sequence[str], None] = "b8c0d2e4f6a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referenced table) of the link table foreign keys, named as
+# Postgres named them in the init migration
+FOREIGN_KEYS = [
+    ("guidecategorylink", "guide_id", "userguide"),
+    ("guidecategorylink", "category_id", "category"),
+    ("guidemedialink", "guide_id", "userguide"),
+    ("guidemedialink", "media_id", "media"),
+]
+# The primary keys lead with guide_id; these serve lookups from the other side
+REVERSE_INDEXES = [
+    ("ix_guidecategorylink_category_id_guide_id", "guidecategorylink", ["category_id", "guide_id"]),
+    ("ix_guidemedialink_media_id_guide_id", "guidemedialink", ["media_id", "guide_id"]),
+]
+
+
+def replace_foreign_keys(ondelete: Union[str, None]) -> None:
+    """Recreate the link table foreign keys with the given ON DELETE action.
+
+    The new constraints are added NOT VALID, which only needs brief locks, and
+    committed before they are validated in autocommit mode: VALIDATE CONSTRAINT
+    checks the existing rows under SHARE UPDATE EXCLUSIVE and ROW SHARE locks,
+    which do not block writes to the link or referenced tables.
+    """
+    for table, column, referenced in FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(
+            name, table, referenced, [column], ["id"], ondelete=ondelete, postgresql_not_valid=True
+        )
+    with op.get_context().autocommit_block():
+        for table, column, _ in FOREIGN_KEYS:
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_fkey")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    replace_foreign_keys("CASCADE")
+    with op.get_context().autocommit_block():
+        for name, table, columns in REVERSE_INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in REVERSE_INDEXES:
+        op.drop_index(name, table_name=table)
+    replace_foreign_keys(None)
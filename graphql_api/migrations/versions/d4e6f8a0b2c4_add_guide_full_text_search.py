@@ -0,0 +1,86 @@
+"""add guide full text search
+
+Revision ID: d4e6f8a0b2c4
+Revises: c3d5e7f9a1b2
+Create Date: 2026-10-17 11:03:27.118402
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e6f8a0b2c4"
+down_revision: Union[str, Sequence[str], None] = "c3d5e7f9a1b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Text of the body blocks of the given types (all blocks when NULL), in order
+    op.execute("""
+        CREATE OR REPLACE FUNCTION userguide_block_text(body json, block_types text[] DEFAULT NULL)
+        RETURNS text LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT coalesce(
+                string_agg(texts.text, ' ' ORDER BY blocks.position, texts.position), ''
+            )
+            FROM json_array_elements(
+                CASE WHEN json_typeof(body -> 'blocks') = 'array'
+                THEN body -> 'blocks' ELSE '[]' END
+            ) WITH ORDINALITY AS blocks(block, position)
+            CROSS JOIN LATERAL (
+                SELECT blocks.block ->> 'text', 0
+                WHERE json_typeof(blocks.block) = 'object' AND blocks.block ->> 'text' IS NOT NULL
+                UNION ALL
+                SELECT item, position
+                FROM json_array_elements_text(
+                    CASE WHEN json_typeof(blocks.block) = 'object'
+                        AND json_typeof(blocks.block -> 'items') = 'array'
+                    THEN blocks.block -> 'items' ELSE '[]' END
+                ) WITH ORDINALITY AS items(item, position)
+            ) AS texts(text, position)
+            WHERE block_types IS NULL OR blocks.block ->> 'type' = ANY (block_types)
+        $$
+        """)
+    # Title weighs most, then headings, then paragraphs and list items
+    op.execute("""
+        CREATE OR REPLACE FUNCTION userguide_search_vector(title text, body json)
+        RETURNS tsvector LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+                || setweight(
+                    to_tsvector('english', userguide_block_text(body, ARRAY['heading'])), 'B'
+                )
+                || setweight(
+                    to_tsvector('english', userguide_block_text(body, ARRAY['paragraph', 'list'])),
+                    'C'
+                )
+        $$
+        """)
+    op.add_column(
+        "userguide",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("userguide_search_vector(title, body)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_userguide_search_vector",
+        "userguide",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_userguide_search_vector", table_name="userguide", postgresql_using="gin")
+    op.drop_column("userguide", "search_vector")
+    op.execute("DROP FUNCTION userguide_search_vector(text, json)")
+    op.execute("DROP FUNCTION userguide_block_text(json, text[])")
@@ -0,0 +1,55 @@
+"""add trigram search indexes
+
+Revision ID: e5f7a9b1c3d5
+Revises: d4e6f8a0b2c4
+Create Date: 2026-10-17 14:26:08.730914
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f7a9b1c3d5"
+down_revision: Union[str, Sequence[str], None] = "d4e6f8a0b2c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Fuzzy search falls back to trigram similarity of titles, slugs and category names
+    op.create_index(
+        "ix_userguide_title_trgm",
+        "userguide",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_userguide_slug_trgm",
+        "userguide",
+        ["slug"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"slug": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_category_name_trgm",
+        "category",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_category_name_trgm", table_name="category", postgresql_using="gin")
+    op.drop_index("ix_userguide_slug_trgm", table_name="userguide", postgresql_using="gin")
+    op.drop_index("ix_userguide_title_trgm", table_name="userguide", postgresql_using="gin")
+    # The extension is left installed; other objects may depend on it
@@ -0,0 +1,43 @@
+"""add guide related
+
+Revision ID: f6a8b0c2d4e6
+Revises: e5f7a9b1c3d5
+Create Date: 2026-10-17 16:02:41.218305
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a8b0c2d4e6"
+down_revision: Union[str, Sequence[str], None] = "e5f7a9b1c3d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Precomputed by scripts/refresh_related_guides.py, read through the primary key
+    op.create_table(
+        "guide_related",
+        sa.Column("guide_id", sa.Uuid(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("related_id", sa.Uuid(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["guide_id"], ["userguide.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["related_id"], ["userguide.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("guide_id", "rank"),
+    )
+    # Deleting a guide cascades to the rows pointing at it
+    op.create_index(
+        op.f("ix_guide_related_related_id"), "guide_related", ["related_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_guide_related_related_id"), table_name="guide_related")
+    op.drop_table("guide_related")
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Benchmark guide bodies stored as json against jsonb.
+
+Fills two scratch tables with the same generated bodies (100k by default),
+one json and one jsonb with the jsonb_path_ops GIN index userguide.body has,
+and compares:
+
+- read: extracting values from every body inside Postgres, which parses json
+  text on every access but reads jsonb as is
+- serialization: sending bodies to the client as text and decoding them in
+  Python, where json is sent verbatim and jsonb is printed first
+- containment: finding guides with a block of some type or embedding some
+  media, a full scan over json and an index lookup with jsonb @>
+
+Prints the median timings and exits non-zero when a containment query does not
+use the GIN index. The scratch tables are dropped afterwards unless --keep is
+given.
+
+    python scripts/benchmark_body_jsonb.py --guides 100000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.core.db import close_engine, get_engine  # noqa: E402
+
+TABLES = {"json": "bench_body_json", "jsonb": "bench_body_jsonb"}
+INDEX = "ix_bench_body_jsonb_path_ops"
+RUNS = 5
+FETCH_ROWS = 1000
+
+SEED = """
+INSERT INTO {table} (id, body)
+SELECT i, CAST(jsonb_build_object('blocks', jsonb_build_array(
+    jsonb_build_object('type', 'heading', 'level', 1, 'text', 'Set up feature ' || i),
+    jsonb_build_object('type', 'paragraph', 'text', repeat('Step by step setup text. ', 8)),
+    jsonb_build_object('type', 'list', 'items', jsonb_build_array('Open settings', 'Save')),
+    jsonb_build_object('type', 'heading', 'level', 2, 'text', 'Troubleshooting'),
+    jsonb_build_object('type', 'paragraph', 'text', repeat('If it fails, retry. ', 8))
+) || CASE WHEN i % 100 = 0 THEN jsonb_build_array(
+    jsonb_build_object('type', 'image', 'media_id', 'media-' || (i / 100) % 50)
+) ELSE '[]' END) AS {json})
+FROM generate_series(1, $1) AS i
+"""
+
+# Statements run against both tables: (name, json statement, jsonb statement)
+READS = [
+    (
+        "read: count blocks",
+        "SELECT sum(json_array_length(body -> 'blocks')) FROM bench_body_json",
+        "SELECT sum(jsonb_array_length(body -> 'blocks')) FROM bench_body_jsonb",
+    ),
+    (
+        "read: first heading",
+        "SELECT count(DISTINCT body -> 'blocks' -> 0 ->> 'text') FROM bench_body_json",
+        "SELECT count(DISTINCT body -> 'blocks' -> 0 ->> 'text') FROM bench_body_jsonb",
+    ),
+    (
+        "serialize: body as text",
+        "SELECT sum(length(body::text)) FROM bench_body_json",
+        "SELECT sum(length(body::text)) FROM bench_body_jsonb",
+    ),
+]
+CONTAINMENT = [
+    (
+        "blocks of type image",
+        "SELECT count(*) FROM bench_body_json WHERE EXISTS (SELECT 1 FROM"
+        " json_array_elements(body -> 'blocks') AS block WHERE block ->> 'type' = 'image')",
+        """SELECT count(*) FROM bench_body_jsonb WHERE body @> '{"blocks": [{"type": "image"}]}'""",
+    ),
+    (
+        "embeds media-7",
+        "SELECT count(*) FROM bench_body_json WHERE EXISTS (SELECT 1 FROM"
+        " json_array_elements(body -> 'blocks') AS block WHERE block ->> 'media_id' = 'media-7')",
+        """SELECT count(*) FROM bench_body_jsonb"""
+        """ WHERE body @> '{"blocks": [{"media_id": "media-7"}]}'""",
+    ),
+]
+
+
+async def seed(guides: int) -> None:
+    started = time.perf_counter()
+    async with get_engine().begin() as conn:
+        for json_type, table in TABLES.items():
+            await conn.exec_driver_sql(f"DROP TABLE IF EXISTS {table}")
+            await conn.exec_driver_sql(
+                f"CREATE UNLOGGED TABLE {table} (id integer PRIMARY KEY, body {json_type} NOT NULL)"
+            )
+            await conn.exec_driver_sql(SEED.format(table=table, json=json_type), (guides,))
+        await conn.exec_driver_sql(
+            f"CREATE INDEX {INDEX} ON {TABLES['jsonb']} USING gin (body jsonb_path_ops)"
+        )
+    async with get_engine().connect() as conn:
+        await conn.exec_driver_sql(f"ANALYZE {', '.join(TABLES.values())}")
+        sizes = await conn.exec_driver_sql(
+            "SELECT "
+            + ", ".join(f"pg_size_pretty(pg_total_relation_size('{t}'))" for t in TABLES.values())
+        )
+        json_size, jsonb_size = sizes.one()
+    print(
+        f"Seeded {guides} bodies per table in {time.perf_counter() - started:.1f}s"
+        f" (json {json_size}, jsonb {jsonb_size} with index)"
+    )
+
+
+async def cleanup() -> None:
+    async with get_engine().begin() as conn:
+        for table in TABLES.values():
+            await conn.exec_driver_sql(f"DROP TABLE IF EXISTS {table}")
+
+
+def used_indexes(plan: dict) -> set:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= used_indexes(child)
+    return names
+
+
+async def execution_time(sql: str) -> tuple:
+    """Median server-side execution time (ms) over ``RUNS`` and the indexes of the last plan."""
+    timings = []
+    async with get_engine().connect() as conn:
+        for _ in range(RUNS):
+            result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")
+            plan = result.scalar_one()
+            plan = plan[0] if isinstance(plan, list) else json.loads(plan)[0]
+            timings.append(plan["Execution Time"])
+    return statistics.median(timings), used_indexes(plan["Plan"])
+
+
+async def fetch_time(table: str) -> float:
+    """Median time (ms) to fetch ``FETCH_ROWS`` bodies as text and decode them in Python."""
+    timings = []
+    async with get_engine().connect() as conn:
+        for _ in range(RUNS):
+            started = time.perf_counter()
+            result = await conn.exec_driver_sql(
+                f"SELECT body::text FROM {table} ORDER BY id LIMIT {FETCH_ROWS}"
+            )
+            bodies = [json.loads(text) for text in result.scalars()]
+            timings.append((time.perf_counter() - started) * 1000)
+            assert len(bodies) == FETCH_ROWS
+    return statistics.median(timings)
+
+
+def report(name: str, json_ms: float, jsonb_ms: float, note: str = "") -> None:
+    print(
+        f"{name:<32} json {json_ms:>9.2f} ms  jsonb {jsonb_ms:>9.2f} ms"
+        f"  x{json_ms / jsonb_ms if jsonb_ms else float('inf'):>6.1f}  {note}"
+    )
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--guides", type=int, default=100_000, help="bodies to generate")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch tables")
+    args = parser.parse_args()
+
+    await seed(args.guides)
+    ok = True
+    try:
+        for name, json_sql, jsonb_sql in READS:
+            json_ms, _ = await execution_time(json_sql)
+            jsonb_ms, _ = await execution_time(jsonb_sql)
+            report(name, json_ms, jsonb_ms)
+        report(
+            f"fetch + decode {FETCH_ROWS} bodies",
+            await fetch_time(TABLES["json"]),
+            await fetch_time(TABLES["jsonb"]),
+        )
+        for name, json_sql, jsonb_sql in CONTAINMENT:
+            json_ms, _ = await execution_time(json_sql)
+            jsonb_ms, indexes = await execution_time(jsonb_sql)
+            used = INDEX in indexes
+            ok = ok and used
+            report(name, json_ms, jsonb_ms, "[ok]" if used else f"[MISSING {INDEX}]")
+    finally:
+        if not args.keep:
+            await cleanup()
+        close_engine()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Benchmark the raw asyncpg read path against the ORM repositories.
+
+Seeds a migrated database with synthetic guides (10k by default) in a few
+categories, then times the hot editor reads both ways, each in a read session
+like the REST routes use: a guide by slug, the guide list, a category's guides
+and the category list with guide ids. Prints median wall-clock timings,
+including the mapping into DTOs, and exits non-zero when the two paths return
+different results. Seeded rows are removed afterwards unless --keep is given.
+
+    python scripts/benchmark_fast_reads.py --guides 10000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text  # noqa: E402
+
+from common.core.db import close_engine, get_engine, get_read_session, get_session  # noqa: E402
+from common.repositories.category import CategoryRepository  # noqa: E402
+from common.repositories.fast_read import FastReadRepository  # noqa: E402
+from common.repositories.guide import GuideRepository  # noqa: E402
+from common.utils.rich_text import derive_content  # noqa: E402
+
+SLUG_PREFIX = "bench-read-"
+CATEGORIES = 20
+RUNS = 20
+
+BODY = {
+    "blocks": [
+        {"type": "heading", "level": 1, "text": "Set up the feature"},
+        {"type": "paragraph", "text": "Step by step setup text. " * 40},
+        {"type": "list", "items": ["Open settings", "Choose a plan", "Save"]},
+        {"type": "heading", "level": 2, "text": "Troubleshooting"},
+        {"type": "paragraph", "text": "If it fails, retry. " * 40},
+    ]
+}
+
+SEED_GUIDES = """
+INSERT INTO userguide (id, title, slug, body, estimated_read_time, created_at,
+    plaintext, excerpt, word_count, toc)
+SELECT gen_random_uuid(), 'Guide ' || i, :prefix || 'guide-' || i, CAST(:body AS jsonb), 2,
+    now() - i * interval '1 minute', :plaintext, :excerpt, :word_count, CAST(:toc AS json)
+FROM generate_series(1, :guides) AS i
+"""
+
+SEED_CATEGORIES = """
+INSERT INTO category (id, name, slug, created_at)
+SELECT gen_random_uuid(), 'Category ' || i, :prefix || 'category-' || i, now()
+FROM generate_series(1, :categories) AS i
+"""
+
+# Every guide in one category, every tenth in a second one
+LINK_GUIDES = """
+INSERT INTO guidecategorylink (guide_id, category_id)
+SELECT guide.id, category.id
+FROM userguide AS guide
+CROSS JOIN LATERAL (SELECT CAST(substr(guide.slug, :skip) AS integer) AS i) AS n
+JOIN category ON category.slug IN (
+    :prefix || 'category-' || (1 + n.i % :categories),
+    CASE WHEN n.i % 10 = 0 THEN :prefix || 'category-' || (1 + (n.i / 10 + 1) % :categories) END
+)
+WHERE guide.slug LIKE :prefix || 'guide-%'
+"""
+
+CLEANUP = [
+    "DELETE FROM userguide WHERE slug LIKE :prefix || '%'",
+    "DELETE FROM category WHERE slug LIKE :prefix || '%'",
+]
+
+
+async def seed(guides: int) -> None:
+    derived = derive_content(BODY)
+    params = {
+        "prefix": SLUG_PREFIX,
+        "guides": guides,
+        "categories": CATEGORIES,
+        "body": json.dumps(BODY),
+        "plaintext": derived.plaintext,
+        "excerpt": derived.excerpt,
+        "word_count": derived.word_count,
+        "toc": json.dumps(derived.toc),
+    }
+    started = time.perf_counter()
+    async with get_session() as session:
+        await session.execute(text(SEED_GUIDES), params)
+        await session.execute(text(SEED_CATEGORIES), params)
+        await session.execute(
+            text(LINK_GUIDES), {**params, "skip": len(SLUG_PREFIX) + len("guide-") + 1}
+        )
+    async with get_engine().connect() as conn:
+        await conn.execute(text("ANALYZE userguide, category, guidecategorylink"))
+    print(f"Seeded {guides} guides in {time.perf_counter() - started:.1f}s")
+
+
+async def cleanup() -> None:
+    async with get_session() as session:
+        for statement in CLEANUP:
+            await session.execute(text(statement), {"prefix": SLUG_PREFIX})
+
+
+async def timed(read) -> tuple:
+    """Median wall-clock time (ms) of ``read(session)`` over ``RUNS`` and its last result.
+
+    All runs share one connection after a warm-up run, as requests do on a
+    pooled connection whose statements are already prepared.
+    """
+    timings = []
+    async with get_read_session() as session:
+        result = await read(session)
+        for _ in range(RUNS):
+            session.expunge_all()
+            started = time.perf_counter()
+            result = await read(session)
+            timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def comparable(result):
+    """Results as dicts with sorted lists of ids; neither path orders its lists."""
+    if result is None:
+        return None
+    if isinstance(result, list):
+        return sorted((comparable(item) for item in result), key=lambda item: str(item["id"]))
+    data = result.model_dump()
+    for key in ("category_ids", "guide_ids"):
+        if key in data:
+            data[key] = sorted(data[key], key=str)
+    return data
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--guides", type=int, default=10_000, help="guides to generate")
+    parser.add_argument("--keep", action="store_true", help="keep the generated rows")
+    args = parser.parse_args()
+
+    guides, categories, fast = GuideRepository(), CategoryRepository(), FastReadRepository()
+    slug = f"{SLUG_PREFIX}guide-{args.guides // 2}"
+    category_slug = f"{SLUG_PREFIX}category-1"
+    reads = [
+        (
+            "guide by slug",
+            lambda s: guides.get_read_by_slug(s, slug),
+            lambda s: fast.get_guide_by_slug(s, slug),
+        ),
+        ("guide list", lambda s: guides.list_read(s), lambda s: fast.list_guides(s)),
+        (
+            "guides of a category",
+            lambda s: guides.list_read(s, category_slug),
+            lambda s: fast.list_guides(s, category_slug),
+        ),
+        (
+            "categories + guide ids",
+            lambda s: categories.list_read_with_guide_ids(s),
+            lambda s: fast.list_categories(s),
+        ),
+    ]
+
+    await seed(args.guides)
+    ok = True
+    try:
+        for name, orm_read, fast_read in reads:
+            orm_ms, orm_result = await timed(orm_read)
+            fast_ms, fast_result = await timed(fast_read)
+            same = comparable(orm_result) == comparable(fast_result)
+            ok = ok and same
+            rows = len(orm_result) if isinstance(orm_result, list) else 1
+            print(
+                f"{name:<24} {rows:>7} rows  orm {orm_ms:>9.2f} ms  asyncpg {fast_ms:>9.2f} ms"
+                f"  x{orm_ms / fast_ms:>5.1f}  [{'ok' if same else 'RESULTS DIFFER'}]"
+            )
+    finally:
+        if not args.keep:
+            await cleanup()
+        close_engine()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
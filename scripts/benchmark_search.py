@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Benchmark guide search on a large generated corpus.
+
+Seeds a migrated database with synthetic guides (100k by default), then runs
+the statements behind ``searchGuides`` under EXPLAIN ANALYZE: full-text search,
+the trigram fallback and the bounded count deciding between them. Prints the
+timings and the indexes each plan used, and exits non-zero when a plan does
+not use the index it is expected to. The in-process BM25 index
+(SEARCH_BACKEND=memory) is then built from the same rows and timed. Seeded
+rows are removed afterwards unless --keep is given.
+
+    python scripts/benchmark_search.py --guides 100000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text  # noqa: E402
+
+from common.core.db import close_engine, get_engine, get_session  # noqa: E402
+from common.repositories.guide import GuideRepository  # noqa: E402
+from common.services.search_index import GuideSearchIndex  # noqa: E402
+
+SLUG_PREFIX = "bench-"
+WORDS = [
+    "billing", "invoice", "password", "account", "export", "import", "webhook", "report",
+    "dashboard", "integration", "permission", "subscription", "refund", "payment", "profile",
+    "notification", "calendar", "schedule", "template", "workspace",
+]  # fmt: skip
+
+SEED_GUIDES = """
+INSERT INTO userguide (id, title, slug, body, estimated_read_time, created_at)
+SELECT
+    gen_random_uuid(),
+    initcap(w1) || ' ' || w2 || ' guide ' || i,
+    :prefix || w1 || '-' || w2 || '-' || i,
+    jsonb_build_object('blocks', jsonb_build_array(
+        jsonb_build_object('type', 'heading', 'level', 1, 'text', 'Set up ' || w1),
+        jsonb_build_object('type', 'paragraph', 'text',
+            'How the ' || w1 || ' and ' || w2 || ' settings work, step ' || i || '.'),
+        jsonb_build_object('type', 'list', 'items', jsonb_build_array(w2, w3))
+    )),
+    1 + i % 10,
+    now() - i * interval '1 minute'
+FROM generate_series(1, :guides) AS i,
+    LATERAL (SELECT
+        (CAST(:words AS text[]))[1 + i % :n] AS w1,
+        (CAST(:words AS text[]))[1 + (i / :n) % :n] AS w2,
+        (CAST(:words AS text[]))[1 + (i / (:n * :n)) % :n] AS w3
+    ) AS words
+"""
+
+SEED_CATEGORIES = """
+INSERT INTO category (id, name, slug, created_at)
+SELECT gen_random_uuid(), initcap(word) || ' help', :prefix || word, now()
+FROM unnest(CAST(:words AS text[])) AS word
+"""
+
+LINK_GUIDES = """
+INSERT INTO guidecategorylink (guide_id, category_id)
+SELECT guide.id, category.id
+FROM userguide AS guide
+JOIN category ON category.slug = :prefix || split_part(substr(guide.slug, :skip), '-', 1)
+WHERE guide.slug LIKE :prefix || '%'
+"""
+
+CLEANUP = [
+    "DELETE FROM guidecategorylink WHERE guide_id IN "
+    "(SELECT id FROM userguide WHERE slug LIKE :prefix || '%')",
+    "DELETE FROM userguide WHERE slug LIKE :prefix || '%'",
+    "DELETE FROM category WHERE slug LIKE :prefix || '%'",
+]
+
+
+async def seed(guides: int) -> None:
+    params = {"prefix": SLUG_PREFIX, "words": WORDS, "n": len(WORDS), "guides": guides}
+    started = time.perf_counter()
+    async with get_session() as session:
+        await session.execute(text(SEED_GUIDES), params)
+        await session.execute(text(SEED_CATEGORIES), params)
+        await session.execute(text(LINK_GUIDES), {**params, "skip": len(SLUG_PREFIX) + 1})
+    async with get_engine().connect() as conn:
+        await conn.execute(text("ANALYZE userguide, category, guidecategorylink"))
+    print(f"Seeded {guides} guides in {time.perf_counter() - started:.1f}s")
+
+
+async def cleanup() -> None:
+    async with get_session() as session:
+        for statement in CLEANUP:
+            await session.execute(text(statement), {"prefix": SLUG_PREFIX})
+
+
+def used_indexes(plan: dict) -> set:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= used_indexes(child)
+    return names
+
+
+async def explain(name: str, stmt, expected: set) -> bool:
+    engine = get_engine()
+    compiled = stmt.compile(dialect=engine.dialect)
+    params = tuple(compiled.params[key] for key in compiled.positiontup)
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {compiled}", params
+        )
+        plan = result.scalar_one()
+    plan = plan[0] if isinstance(plan, list) else json.loads(plan)[0]
+    indexes = used_indexes(plan["Plan"])
+    missing = expected - indexes
+    status = "ok" if not missing else f"MISSING {', '.join(sorted(missing))}"
+    print(
+        f"{name:<28} {plan['Execution Time']:>9.2f} ms  "
+        f"indexes: {', '.join(sorted(indexes)) or '-'}  [{status}]"
+    )
+    return not missing
+
+
+async def time_memory_index(queries, runs: int = 100) -> None:
+    index = GuideSearchIndex()
+    started = time.perf_counter()
+    await index.ensure_built()
+    print(f"BM25 index built in {time.perf_counter() - started:.1f}s: {index.index.stats()}")
+    for query in queries:
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            _, total = await index.search(query, 21)
+            timings.append((time.perf_counter() - started) * 1000)
+        print(
+            f"BM25 {query!r:<22} {statistics.median(timings):>9.3f} ms median, "
+            f"{max(timings):.3f} ms max, {total} matches"
+        )
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--guides", type=int, default=100_000, help="guides to generate")
+    parser.add_argument("--keep", action="store_true", help="keep the generated rows")
+    args = parser.parse_args()
+
+    repo = GuideRepository()
+    await seed(args.guides)
+    try:
+        checks = [
+            await explain(
+                "full-text",
+                repo.search_statement("webhook report", 20),
+                {"ix_userguide_search_vector"},
+            ),
+            await explain(
+                "full-text + category",
+                repo.search_statement("webhook report", 20, category_slug=SLUG_PREFIX + "refund"),
+                {"ix_userguide_search_vector"},
+            ),
+            await explain(
+                "trigram fallback",
+                repo.search_statement("webhok", 20, fuzzy=True),
+                {
+                    "ix_userguide_search_vector",
+                    "ix_userguide_title_trgm",
+                    "ix_userguide_slug_trgm",
+                    "ix_category_name_trgm",
+                },
+            ),
+        ]
+        await time_memory_index(["webhook report", "refund", "calendar template workspace"])
+    finally:
+        if not args.keep:
+            await cleanup()
+        close_engine()
+    return 0 if all(checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
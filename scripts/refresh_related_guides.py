@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Recompute the related guides shown on guide pages.
+
+Compares every guide with every other one (TF-IDF cosine similarity of their
+text, boosted by shared categories) and replaces the ``guide_related`` table
+in one transaction. Meant to run as a scheduled job, e.g. nightly or after
+bulk imports; ``UserGuide.related`` only reads what it stored.
+
+    python scripts/refresh_related_guides.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.core.db import close_engine, get_session  # noqa: E402
+from common.services.related import refresh_related_guides  # noqa: E402
+
+
+async def main() -> int:
+    started = time.perf_counter()
+    try:
+        async with get_session() as session:
+            pairs = await refresh_related_guides(session)
+            await session.commit()
+    finally:
+        close_engine()
+    print(f"Stored {pairs} related guide pairs in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
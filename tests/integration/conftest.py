@@ -83,6 +83,11 @@ async def cleanup_database(test_session):
             pass
         await session.commit()
 
+    # Truncation bypasses the editor write paths, so no invalidation event is sent
+    from common.domain.extensions.response_cache import response_cache
+
+    await response_cache.clear()
+
 
 @pytest_asyncio.fixture
 async def client():
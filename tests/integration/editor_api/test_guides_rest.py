@@ -76,7 +76,10 @@ async def test_list_and_fetch_by_slug(editor_client, editor_headers):
     assert resp.status_code == 200
     items = resp.json()
     assert isinstance(items, list)
-    assert any(g["slug"] == unique_slug for g in items)
+    listed = next(g for g in items if g["slug"] == unique_slug)
+    # Listings are summaries; the body is only returned for a single guide
+    assert "body" not in listed
+    assert listed["category_ids"] == []
 
     # Fetch by slug
     resp2 = await editor_client.get(f"/dev-editor/guides/slug/{unique_slug}", headers=editor_headers)
@@ -115,6 +118,61 @@ async def test_update_guide(editor_client, editor_headers):
     assert updated["body"]["blocks"][0]["text"] == "Updated content"
 
 
+@pytest.mark.asyncio
+async def test_derived_content_follows_the_body(editor_client, editor_headers):
+    import uuid
+    payload = {
+        "title": "Billing Setup",
+        "slug": f"billing-setup-{uuid.uuid4().hex[:8]}",
+        "body": {
+            "blocks": [
+                {"type": "heading", "level": 1, "text": "Add a card"},
+                {"type": "paragraph", "text": " ".join(["word"] * 250)},
+            ]
+        },
+    }
+    # Read time defaults to the computed one
+    resp = await editor_client.post("/dev-editor/guides", json=payload, headers=editor_headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["estimated_read_time"] == 2
+    assert data["word_count"] == 253
+    assert data["excerpt"].startswith("word word") and data["excerpt"].endswith("…")
+    assert data["toc"] == [{"level": 1, "text": "Add a card", "anchor": "add-a-card"}]
+
+    update_payload = {
+        "body": {
+            "blocks": [
+                {"type": "heading", "level": 2, "text": "Remove a card"},
+                {"type": "paragraph", "text": "Open billing settings."},
+            ]
+        }
+    }
+    resp = await editor_client.put(
+        f"/dev-editor/guides/{data['id']}", json=update_payload, headers=editor_headers
+    )
+    assert resp.status_code == 200
+    updated = resp.json()
+    assert updated["excerpt"] == "Open billing settings."
+    assert updated["word_count"] == 6
+    assert updated["toc"] == [{"level": 2, "text": "Remove a card", "anchor": "remove-a-card"}]
+    # A new body without a read time gets the computed one
+    assert updated["estimated_read_time"] == 1
+
+    # An explicit read time wins over the computed one
+    update_payload["estimated_read_time"] = 5
+    resp = await editor_client.put(
+        f"/dev-editor/guides/{data['id']}", json=update_payload, headers=editor_headers
+    )
+    assert resp.json()["estimated_read_time"] == 5
+
+    # Other edits keep the current read time
+    resp = await editor_client.put(
+        f"/dev-editor/guides/{data['id']}", json={"title": "Cards"}, headers=editor_headers
+    )
+    assert resp.json()["estimated_read_time"] == 5
+
+
 @pytest.mark.asyncio
 async def test_delete_guide(editor_client, editor_headers):
     import uuid
@@ -138,3 +196,56 @@ async def test_delete_guide(editor_client, editor_headers):
     # Verify it's deleted
     resp3 = await editor_client.get(f"/dev-editor/guides/{guide_id}", headers=editor_headers)
     assert resp3.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_fast_read_path_matches_orm(editor_client, editor_headers, monkeypatch):
+    import uuid
+    from common.core import settings
+
+    suffix = uuid.uuid4().hex[:8]
+    category = {"name": "Fast reads", "slug": f"fast-reads-{suffix}", "description": None}
+    resp = await editor_client.post("/dev-editor/categories", json=category, headers=editor_headers)
+    assert resp.status_code == 200
+    category_id = resp.json()["id"]
+    for slug, category_ids in ((f"fast-a-{suffix}", [category_id]), (f"fast-b-{suffix}", [])):
+        payload = {
+            "title": slug,
+            "slug": slug,
+            "body": {"blocks": [{"type": "heading", "level": 1, "text": "Fast"}]},
+            "category_ids": category_ids,
+        }
+        resp = await editor_client.post("/dev-editor/guides", json=payload, headers=editor_headers)
+        assert resp.status_code == 200
+
+    paths = [
+        f"/dev-editor/guides/slug/fast-a-{suffix}",
+        "/dev-editor/guides",
+        f"/dev-editor/guides?category_slug=fast-reads-{suffix}",
+        "/dev-editor/categories",
+        "/dev-editor/guides/slug/missing",
+    ]
+
+    async def responses():
+        result = []
+        for path in paths:
+            resp = await editor_client.get(path, headers=editor_headers)
+            data = resp.json()
+            if isinstance(data, list):
+                data = sorted(data, key=lambda item: item["id"])
+            result.append((resp.status_code, data))
+        return result
+
+    monkeypatch.setattr(settings, "FAST_READ_PATH", False)
+    orm = await responses()
+    monkeypatch.setattr(settings, "FAST_READ_PATH", True)
+    fast = await responses()
+
+    assert fast == orm
+    guide, _, by_category, categories, missing = orm
+    assert guide[1]["category_ids"] == [category_id]
+    assert guide[1]["toc"][0]["text"] == "Fast"
+    assert [g["slug"] for g in by_category[1]] == [f"fast-a-{suffix}"]
+    listed = next(c for c in categories[1] if c["id"] == category_id)
+    assert listed["guide_ids"] == [guide[1]["id"]]
+    assert missing[0] == 404
@@ -178,6 +178,41 @@ async def test_delete_media(editor_client, editor_headers):
     assert resp2.status_code == 404
 
 
+@pytest.mark.asyncio
+async def test_delete_attached_media(editor_client, editor_headers):
+    import uuid
+    # Create a guide with media attached
+    unique_slug = f"delete-attached-media-{uuid.uuid4().hex[:8]}"
+    guide_payload = {
+        "title": "Delete Attached Media",
+        "slug": unique_slug,
+        "body": {"blocks": [{"type": "paragraph", "text": "Test content"}]},
+        "estimated_read_time": 2,
+        "category_ids": []
+    }
+    guide_resp = await editor_client.post("/dev-editor/guides", json=guide_payload, headers=editor_headers)
+    assert guide_resp.status_code == 200
+    guide_id = guide_resp.json()["id"]
+
+    files = {"file": ("attached.jpg", io.BytesIO(b"attached image"), "image/jpeg")}
+    data = {"alt": "Attached image", "guide_id": guide_id}
+    media_resp = await editor_client.post("/dev-editor/media/upload", files=files, data=data, headers=editor_headers)
+    assert media_resp.status_code == 200
+    media_id = media_resp.json()["id"]
+
+    # Deleting the media drops its guide link along with it
+    resp = await editor_client.delete(f"/dev-editor/media/{media_id}", headers=editor_headers)
+    assert resp.status_code == 200
+
+    resp2 = await editor_client.get(f"/dev-editor/guides/{guide_id}/media", headers=editor_headers)
+    assert resp2.status_code == 200
+    assert media_id not in [m["id"] for m in resp2.json()]
+
+    # And deleting the guide no longer needs its links removed first
+    resp3 = await editor_client.delete(f"/dev-editor/guides/{guide_id}", headers=editor_headers)
+    assert resp3.status_code == 200
+
+
 @pytest.mark.asyncio
 async def test_upload_invalid_file_type(editor_client, editor_headers):
     # Try to upload a non-image file
@@ -15,6 +15,40 @@ async def test_graphql_empty_categories(client):
     response = await client.post("/graphql", json={"query": query})
     assert response.status_code == 200
     data = response.json()["data"]
-    print(response.json())
     assert "categories" in data
-    assert data["categories"] == []
\ No newline at end of file
+    assert data["categories"] == []
+
+
+@pytest.mark.asyncio
+async def test_graphql_categories_query_reads_only_category_table(client, test_session):
+    from sqlalchemy import event
+
+    from common.core.db import get_engine
+    from common.domain.models import Category, GuideCategoryLink, UserGuide
+
+    category = Category(name="Billing", slug="billing", description="Invoices")
+    guide = UserGuide(title="Pay", slug="pay", body={"blocks": []}, estimated_read_time=1)
+    test_session.add_all([category, guide])
+    await test_session.flush()
+    test_session.add(GuideCategoryLink(guide_id=guide.id, category_id=category.id))
+    await test_session.commit()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lower())
+
+    engine = get_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = await client.post("/graphql", json={"query": "{ categories { name } }"})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.json()["data"] == {"categories": [{"name": "Billing"}]}
+    queries = [s for s in statements if s.lstrip().startswith("select")]
+    # One statement, on the category table only: the guides relationship is never touched
+    assert len(queries) == 1
+    assert "from category" in queries[0]
+    assert "userguide" not in queries[0] and "guidecategorylink" not in queries[0]
+    assert "description" not in queries[0]
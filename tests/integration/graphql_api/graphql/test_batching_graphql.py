@@ -0,0 +1,41 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_graphql_batch_returns_results_in_order(client, test_session):
+    from common.domain.models import Category
+
+    test_session.add(Category(name="Billing", slug="billing"))
+    await test_session.commit()
+
+    operations = [
+        {"query": "{ categories { slug } }"},
+        {
+            "query": "query ($slug: String!) { category(slug: $slug) { name } }",
+            "variables": {"slug": "billing"},
+        },
+        {"query": "{ nope }"},
+    ]
+    response = await client.post("/graphql", json=operations)
+    assert response.status_code == 200
+    results = response.json()
+    assert isinstance(results, list)
+    assert results[0]["data"] == {"categories": [{"slug": "billing"}]}
+    assert results[1]["data"] == {"category": {"name": "Billing"}}
+    # A failing operation does not affect the others
+    assert results[2]["errors"]
+
+
+@pytest.mark.asyncio
+async def test_graphql_batch_rejects_too_many_operations(client):
+    from common.core.settings import GRAPHQL_BATCH_MAX_OPERATIONS
+
+    operations = [{"query": "{ categories { slug } }"}] * (GRAPHQL_BATCH_MAX_OPERATIONS + 1)
+    response = await client.post("/graphql", json=operations)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_graphql_batch_rejects_non_object_operations(client):
+    response = await client.post("/graphql", json=[1, 2])
+    assert response.status_code == 400
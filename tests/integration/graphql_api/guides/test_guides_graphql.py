@@ -1,4 +1,5 @@
 import pytest
+from strawberry.utils import IS_GQL_33
 
 
 @pytest.mark.asyncio
@@ -92,7 +93,7 @@ async def test_graphql_guide_body_structure(client):
     response = await client.post("/graphql", json={"query": query, "variables": variables})
     assert response.status_code == 200
     data = response.json()
-    
+
     if data["data"]["guide"]:
         body = data["data"]["guide"]["body"]
         assert isinstance(body, dict)
@@ -124,7 +125,7 @@ async def test_graphql_guide_with_media(client):
     response = await client.post("/graphql", json={"query": query, "variables": variables})
     assert response.status_code == 200
     data = response.json()
-    
+
     if data["data"]["guide"]:
         guide = data["data"]["guide"]
         assert "media" in guide
@@ -134,3 +135,570 @@ async def test_graphql_guide_with_media(client):
             assert "url" in media
             assert "alt" in media
             assert "createdAt" in media
+
+
+@pytest.mark.asyncio
+async def test_graphql_guides_connection_query(client, test_session):
+    from common.domain.models import UserGuide
+
+    slugs = [f"guide-{i}" for i in range(7)]
+    test_session.add_all(
+        UserGuide(title=slug, slug=slug, body={"blocks": []}, estimated_read_time=1)
+        for slug in slugs
+    )
+    await test_session.commit()
+
+    query = """
+    query ($first: Int!, $after: String) {
+      guidesConnection(first: $first, after: $after) {
+        totalCount
+        edges {
+          cursor
+          node {
+            id
+            slug
+          }
+        }
+        pageInfo {
+          hasNextPage
+          hasPreviousPage
+          endCursor
+        }
+      }
+    }
+    """
+
+    async def fetch_page(after):
+        variables = {"first": 5, "after": after}
+        response = await client.post("/graphql", json={"query": query, "variables": variables})
+        assert response.status_code == 200
+        data = response.json()
+        assert "errors" not in data
+        return data["data"]["guidesConnection"]
+
+    first_page = await fetch_page(None)
+    assert first_page["totalCount"] == 7
+    assert len(first_page["edges"]) == 5
+    assert first_page["pageInfo"]["hasNextPage"] is True
+    assert first_page["pageInfo"]["hasPreviousPage"] is False
+    assert first_page["pageInfo"]["endCursor"] == first_page["edges"][-1]["cursor"]
+
+    second_page = await fetch_page(first_page["pageInfo"]["endCursor"])
+    assert len(second_page["edges"]) == 2
+    assert second_page["pageInfo"]["hasNextPage"] is False
+    assert second_page["pageInfo"]["hasPreviousPage"] is True
+
+    # The second page continues the first with no overlap and no gap
+    seen = [edge["node"]["slug"] for edge in first_page["edges"] + second_page["edges"]]
+    assert sorted(seen) == sorted(slugs)
+    assert len(set(seen)) == len(slugs)
+
+
+@pytest.mark.asyncio
+async def test_graphql_guides_connection_rejects_invalid_cursor(client):
+    query = '{ guidesConnection(after: "not-a-cursor") { totalCount } }'
+    response = await client.post("/graphql", json={"query": query})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["errors"][0]["message"] == "Invalid cursor"
+
+
+@pytest.mark.asyncio
+async def test_graphql_search_guides_query(client, test_session):
+    from common.domain.models import Category, GuideCategoryLink, UserGuide
+
+    def body(heading, paragraph):
+        return {
+            "blocks": [
+                {"type": "heading", "level": 1, "text": heading},
+                {"type": "paragraph", "text": paragraph},
+            ]
+        }
+
+    billing = Category(name="Billing", slug="billing", description="Invoices")
+    guides = [
+        UserGuide(
+            title="Download invoices",
+            slug="download-invoices",
+            body=body("Invoices", "Every invoice can be downloaded as a PDF."),
+            estimated_read_time=1,
+        ),
+        UserGuide(
+            title="Change your plan",
+            slug="change-plan",
+            body=body("Plans", "A new invoice is issued when the plan changes."),
+            estimated_read_time=1,
+        ),
+        UserGuide(
+            title="Reset your password",
+            slug="reset-password",
+            body=body("Passwords", "Use the link in the email."),
+            estimated_read_time=1,
+        ),
+    ]
+    test_session.add_all([billing, *guides])
+    await test_session.flush()
+    test_session.add(GuideCategoryLink(guide_id=guides[1].id, category_id=billing.id))
+    await test_session.commit()
+
+    query = """
+    query ($query: String!, $first: Int!, $after: String, $categorySlug: String) {
+      searchGuides(query: $query, first: $first, after: $after, categorySlug: $categorySlug) {
+        totalCount
+        edges {
+          cursor
+          node {
+            rank
+            snippet
+            guide {
+              slug
+            }
+          }
+        }
+        pageInfo {
+          hasNextPage
+          hasPreviousPage
+          endCursor
+        }
+      }
+    }
+    """
+
+    async def search(**variables):
+        variables = {"first": 10, "after": None, "categorySlug": None, **variables}
+        response = await client.post("/graphql", json={"query": query, "variables": variables})
+        assert response.status_code == 200
+        data = response.json()
+        assert "errors" not in data
+        return data["data"]["searchGuides"]
+
+    result = await search(query="invoice")
+    slugs = [edge["node"]["guide"]["slug"] for edge in result["edges"]]
+    # The title match ranks above the paragraph-only match
+    assert slugs == ["download-invoices", "change-plan"]
+    assert result["totalCount"] == 2
+    assert "<b>invoice</b>" in result["edges"][1]["node"]["snippet"]
+
+    first_page = await search(query="invoice", first=1)
+    assert first_page["pageInfo"]["hasNextPage"] is True
+    second_page = await search(query="invoice", first=1, after=first_page["pageInfo"]["endCursor"])
+    assert [edge["node"]["guide"]["slug"] for edge in second_page["edges"]] == ["change-plan"]
+    assert second_page["pageInfo"]["hasNextPage"] is False
+    assert second_page["pageInfo"]["hasPreviousPage"] is True
+
+    filtered = await search(query="invoice", categorySlug="billing")
+    assert [edge["node"]["guide"]["slug"] for edge in filtered["edges"]] == ["change-plan"]
+    assert filtered["totalCount"] == 1
+
+
+@pytest.mark.asyncio
+async def test_graphql_search_guides_falls_back_to_similar_names(client, test_session):
+    from common.domain.models import Category, GuideCategoryLink, UserGuide
+
+    billing = Category(name="Billing", slug="billing", description="Invoices")
+    plan = UserGuide(
+        title="Change your plan",
+        slug="change-plan",
+        body={"blocks": [{"type": "paragraph", "text": "Pick a new plan."}]},
+        estimated_read_time=1,
+    )
+    password = UserGuide(
+        title="Reset your password",
+        slug="reset-password",
+        body={"blocks": [{"type": "paragraph", "text": "Use the link in the email."}]},
+        estimated_read_time=1,
+    )
+    test_session.add_all([billing, plan, password])
+    await test_session.flush()
+    test_session.add(GuideCategoryLink(guide_id=plan.id, category_id=billing.id))
+    await test_session.commit()
+
+    query = """
+    query ($query: String!) {
+      searchGuides(query: $query) {
+        totalCount
+        edges {
+          node {
+            fuzzy
+            guide {
+              slug
+            }
+          }
+        }
+      }
+    }
+    """
+
+    async def search(text):
+        variables = {"query": text}
+        response = await client.post("/graphql", json={"query": query, "variables": variables})
+        assert response.status_code == 200
+        data = response.json()
+        assert "errors" not in data
+        return data["data"]["searchGuides"]
+
+    # Misspelt words match no lexeme but are similar to a slug or a category name
+    result = await search("pasword")
+    assert [edge["node"]["guide"]["slug"] for edge in result["edges"]] == ["reset-password"]
+    assert result["edges"][0]["node"]["fuzzy"] is True
+    assert result["totalCount"] == 1
+
+    result = await search("biling")
+    assert [edge["node"]["guide"]["slug"] for edge in result["edges"]] == ["change-plan"]
+
+    # Full-text matches come first and are not fuzzy
+    result = await search("plan")
+    assert result["edges"][0]["node"] == {"fuzzy": False, "guide": {"slug": "change-plan"}}
+
+
+@pytest.mark.asyncio
+async def test_graphql_search_guides_in_memory(
+    client, editor_client, editor_headers, test_session, monkeypatch
+):
+    from common.core import events, settings
+    from common.domain.extensions.response_cache import response_cache
+    from common.domain.models import Category, GuideCategoryLink, UserGuide
+    from common.services import guide as guide_service
+    from common.services.search_index import GuideSearchIndex
+
+    index = GuideSearchIndex()
+    monkeypatch.setattr(settings, "SEARCH_BACKEND", "memory")
+    monkeypatch.setattr(guide_service, "guide_search_index", index)
+
+    def body(text):
+        return {"blocks": [{"type": "paragraph", "text": text}]}
+
+    billing = Category(name="Billing", slug="billing", description="Invoices")
+    guides = [
+        UserGuide(
+            title="Invoice downloads",
+            slug="download-invoices",
+            body=body("Every invoice can be downloaded as a PDF."),
+            plaintext="Every invoice can be downloaded as a PDF.",
+            estimated_read_time=1,
+        ),
+        UserGuide(
+            title="Change your plan",
+            slug="change-plan",
+            body=body("A new invoice is issued when the plan changes."),
+            plaintext="A new invoice is issued when the plan changes.",
+            estimated_read_time=1,
+        ),
+    ]
+    test_session.add_all([billing, *guides])
+    await test_session.flush()
+    test_session.add(GuideCategoryLink(guide_id=guides[1].id, category_id=billing.id))
+    deleted_id, billing_id = guides[0].id, billing.id
+    await test_session.commit()
+
+    query = """
+    query ($query: String!, $categorySlug: String) {
+      searchGuides(query: $query, first: 10, categorySlug: $categorySlug) {
+        totalCount
+        edges { node { rank snippet fuzzy guide { slug } } }
+      }
+    }
+    """
+
+    async def search(**variables):
+        response = await client.post("/graphql", json={"query": query, "variables": variables})
+        assert response.status_code == 200
+        data = response.json()
+        assert "errors" not in data
+        return data["data"]["searchGuides"]
+
+    result = await search(query="invoice")
+    assert [edge["node"]["guide"]["slug"] for edge in result["edges"]] == [
+        "download-invoices",
+        "change-plan",
+    ]
+    assert result["totalCount"] == 2
+    assert "<b>invoice</b>" in result["edges"][1]["node"]["snippet"]
+    assert result["edges"][0]["node"]["fuzzy"] is False
+
+    filtered = await search(query="invoice", categorySlug="billing")
+    assert [edge["node"]["guide"]["slug"] for edge in filtered["edges"]] == ["change-plan"]
+    assert (await search(query="invoice", categorySlug="missing"))["totalCount"] == 0
+
+    # Editor writes update the index without a rebuild (and flush cached responses,
+    # as subscribed by the GraphQL API lifespan)
+    events.subscribe(index.handle_content_change)
+    events.subscribe(response_cache.handle_content_change)
+    try:
+        response = await editor_client.delete(
+            f"/dev-editor/guides/{deleted_id}", headers=editor_headers
+        )
+        assert response.status_code == 200
+        response = await editor_client.post(
+            "/dev-editor/guides",
+            json={
+                "title": "Refunds",
+                "slug": "refunds",
+                "body": body("Refunds are credited to the next invoice."),
+                "estimated_read_time": 1,
+                "category_ids": [str(billing_id)],
+            },
+            headers=editor_headers,
+        )
+        assert response.status_code == 200
+    finally:
+        events.unsubscribe(response_cache.handle_content_change)
+        events.unsubscribe(index.handle_content_change)
+
+    result = await search(query="invoice", categorySlug="billing")
+    assert sorted(edge["node"]["guide"]["slug"] for edge in result["edges"]) == [
+        "change-plan",
+        "refunds",
+    ]
+    assert result["totalCount"] == 2
+
+
+@pytest.mark.asyncio
+async def test_graphql_suggest_query(client, test_session, monkeypatch):
+    from common.domain.models import Category, UserGuide
+    from common.domain.resolvers import suggestion
+    from common.services.suggestions import TitleSuggestions
+
+    monkeypatch.setattr(suggestion, "title_suggestions", TitleSuggestions())
+    test_session.add_all(
+        [
+            Category(name="Passwords", slug="passwords", description="Sign-in help"),
+            UserGuide(
+                title="Reset your password",
+                slug="reset-password",
+                body={"blocks": [{"type": "paragraph", "text": "Use the link."}]},
+                estimated_read_time=1,
+            ),
+        ]
+    )
+    await test_session.commit()
+
+    query = """
+    query ($prefix: String!, $limit: Int!) {
+      suggest(prefix: $prefix, limit: $limit) { kind text slug }
+    }
+    """
+
+    async def suggest(prefix, limit=10):
+        response = await client.post(
+            "/graphql", json={"query": query, "variables": {"prefix": prefix, "limit": limit}}
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    data = await suggest("PASS")
+    assert data["data"]["suggest"] == [
+        {"kind": "CATEGORY", "text": "Passwords", "slug": "passwords"},
+        {"kind": "GUIDE", "text": "Reset your password", "slug": "reset-password"},
+    ]
+    assert (await suggest("pass", 1))["data"]["suggest"] == [
+        {"kind": "CATEGORY", "text": "Passwords", "slug": "passwords"}
+    ]
+    assert (await suggest("zz"))["data"]["suggest"] == []
+    assert (await suggest("pass", 0))["errors"][0]["message"] == "limit must be between 1 and 20"
+
+
+@pytest.mark.asyncio
+async def test_graphql_guide_related_query(client, test_session):
+    from common.domain.models import UserGuide
+    from common.repositories.guide import GuideRepository
+    from common.services.related import refresh_related_guides
+
+    def guide(slug, text):
+        body = {"blocks": [{"type": "paragraph", "text": text}]}
+        return UserGuide(title=slug, slug=slug, body=body, plaintext=text, estimated_read_time=1)
+
+    guides = [
+        guide("update-card", "Update the payment card used for invoices"),
+        guide("download-invoices", "Download invoices and the payment history"),
+        guide("expired-card", "What happens when a payment card expires"),
+        guide("export-reports", "Export reports as CSV"),
+    ]
+    expired_id = guides[2].id
+    test_session.add_all(guides)
+    await test_session.commit()
+
+    await refresh_related_guides(test_session)
+    await test_session.commit()
+
+    query = """
+    query ($slug: String!, $first: Int!) {
+      guide(slug: $slug) { slug related(first: $first) { slug related(first: 1) { slug } } }
+    }
+    """
+
+    async def related(slug, first=5):
+        response = await client.post(
+            "/graphql", json={"query": query, "variables": {"slug": slug, "first": first}}
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    data = await related("update-card")
+    assert [item["slug"] for item in data["data"]["guide"]["related"]] == [
+        "expired-card",
+        "download-invoices",
+    ]
+    assert data["data"]["guide"]["related"][0]["related"] == [{"slug": "update-card"}]
+    assert len((await related("update-card", 1))["data"]["guide"]["related"]) == 1
+    assert (await related("export-reports"))["data"]["guide"]["related"] == []
+    assert (await related("update-card", 0))["errors"][0]["message"] == "first must be positive"
+
+    # Rows of a deleted guide go with it
+    await GuideRepository().delete(test_session, expired_id)
+    data = await related("download-invoices")
+    assert [item["slug"] for item in data["data"]["guide"]["related"]] == ["update-card"]
+
+
+@pytest.mark.asyncio
+async def test_replace_related_skips_guides_deleted_meanwhile(test_session, test_engine):
+    from sqlalchemy import select, text
+    from sqlalchemy.exc import DBAPIError
+
+    from common.domain.models import GuideRelated, UserGuide
+    from common.repositories.guide import GuideRepository
+
+    guides = [
+        UserGuide(title=slug, slug=slug, body={"blocks": []}, estimated_read_time=1)
+        for slug in ("kept", "other", "deleted")
+    ]
+    kept, other, deleted = (guide.id for guide in guides)
+    test_session.add_all(guides)
+    await test_session.commit()
+    repo = GuideRepository()
+    # Computed while "deleted" still existed
+    related = [(kept, 1, deleted, 0.9), (kept, 2, other, 0.5), (deleted, 1, kept, 0.9)]
+    await repo.delete(test_session, deleted)
+    await test_session.commit()
+
+    await repo.replace_related(test_session, related)
+    # The remaining guides cannot be deleted before the new rows are committed
+    async with test_engine.connect() as conn:
+        await conn.execute(text("SET lock_timeout = '100ms'"))
+        with pytest.raises(DBAPIError, match="lock timeout"):
+            await conn.execute(text("DELETE FROM userguide WHERE id = :id"), {"id": other})
+    await test_session.commit()
+
+    rows = (
+        await test_session.execute(select(GuideRelated.guide_id, GuideRelated.related_id))
+    ).all()
+    assert rows == [(kept, other)]
+
+
+@pytest.mark.asyncio
+async def test_graphql_guide_excerpt_and_toc(client, test_session):
+    from common.domain.dtos.guide import GuideCreateDTO
+    from common.services.guide import GuideService
+
+    body = {
+        "blocks": [
+            {"type": "heading", "level": 1, "text": "Export reports"},
+            {"type": "paragraph", "text": "Download any report as CSV."},
+        ]
+    }
+    await GuideService().create_guide(
+        test_session, GuideCreateDTO(title="Exports", slug="exports", body=body)
+    )
+
+    query = "{ guides { slug excerpt toc estimatedReadTime } }"
+    response = await client.post("/graphql", json={"query": query})
+    assert response.status_code == 200
+    assert response.json()["data"]["guides"] == [
+        {
+            "slug": "exports",
+            "excerpt": "Download any report as CSV.",
+            "toc": [{"level": 1, "text": "Export reports", "anchor": "export-reports"}],
+            "estimatedReadTime": 1,
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_graphql_guide_body_html(client, test_session):
+    from common.domain.models import UserGuide
+
+    body = {
+        "blocks": [
+            {"type": "heading", "level": 1, "text": "Refunds"},
+            {"type": "list", "items": ["Open <Billing>", "Choose a payment"]},
+        ]
+    }
+    test_session.add(UserGuide(title="Refunds", slug="refunds", body=body, estimated_read_time=1))
+    await test_session.commit()
+
+    query = '{ guide(slug: "refunds") { bodyHtml } }'
+    response = await client.post("/graphql", json={"query": query})
+    assert response.status_code == 200
+    assert response.json()["data"]["guide"]["bodyHtml"] == (
+        '<h1 id="refunds">Refunds</h1>'
+        "<ul><li>Open &lt;Billing&gt;</li><li>Choose a payment</li></ul>"
+    )
+
+
+@pytest.mark.asyncio
+async def test_guides_with_block_containment(test_session):
+    from common.domain.models import UserGuide
+    from common.repositories.guide import GuideRepository
+
+    def guide(slug, *blocks):
+        return UserGuide(
+            title=slug, slug=slug, body={"blocks": list(blocks)}, estimated_read_time=1
+        )
+
+    image = {"type": "image", "media_id": "logo", "alt": "Logo"}
+    guides = [
+        guide("with-image", {"type": "paragraph", "text": "See below."}, image),
+        guide("with-list", {"type": "list", "items": ["a", "b"]}),
+    ]
+    ids = [item.id for item in guides]
+    test_session.add_all(guides)
+    await test_session.commit()
+
+    repo = GuideRepository()
+    assert await repo.list_ids_with_block(test_session, {"type": "image"}) == [ids[0]]
+    assert await repo.list_ids_with_block(test_session, {"media_id": "logo"}) == [ids[0]]
+    assert await repo.list_ids_with_block(test_session, {"type": "list"}) == [ids[1]]
+    assert await repo.list_ids_with_block(test_session, {"type": "video"}) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not IS_GQL_33, reason="@defer needs graphql-core>=3.3")
+async def test_graphql_deferred_selections_are_loaded_with_the_deferred_payload(test_session):
+    import strawberry
+    from strawberry.schema.config import StrawberryConfig
+
+    from common.core.db import RequestSession, get_read_session_factory
+    from common.domain.models import Media, UserGuide
+    from common.domain.resolvers import Query
+    from common.domain.resolvers.loaders import create_loaders
+
+    body = {"blocks": [{"type": "paragraph", "text": "Later"}]}
+    guide = UserGuide(title="Defer", slug="defer", body=body, estimated_read_time=1)
+    guide.media = [Media(url="https://example.com/a.png", alt="A")]
+    test_session.add(guide)
+    await test_session.commit()
+
+    schema = strawberry.Schema(
+        query=Query, config=StrawberryConfig(enable_experimental_incremental_execution=True)
+    )
+    request_session = RequestSession(get_read_session_factory())
+    try:
+        result = await schema.execute(
+            '{ guide(slug: "defer") { title ... @defer { body media { alt } } } }',
+            context_value={
+                "get_session": request_session,
+                "loaders": create_loaders(request_session),
+            },
+        )
+        initial = result.initial_result
+        payloads = [
+            item.data
+            async for subsequent in result.subsequent_results
+            for item in subsequent.incremental or ()
+        ]
+    finally:
+        await request_session.close()
+
+    assert not initial.errors
+    assert initial.data == {"guide": {"title": "Defer"}}
+    assert payloads == [{"body": body, "media": [{"alt": "A"}]}]
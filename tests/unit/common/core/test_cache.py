@@ -0,0 +1,43 @@
+"""Unit tests for the in-process LRU cache."""
+
+import pytest
+
+from common.core.cache import LRUCache
+
+
+class TestLRUCache:
+    """Test eviction order and hit/miss counting."""
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+
+    def test_counts_hits_and_misses(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+        assert cache.stats() == {"size": 1, "maxsize": 2, "hits": 1, "misses": 1}
+
+    def test_peek_leaves_order_and_counters_alone(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        assert cache.peek("a") == 1
+        cache.set("c", 3)
+
+        assert "a" not in cache
+        assert cache.stats()["hits"] == 0
+
+    def test_rejects_non_positive_size(self):
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
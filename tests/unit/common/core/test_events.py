@@ -0,0 +1,73 @@
+"""Unit tests for content change events - Redis is disabled, dispatch is local."""
+
+import asyncio
+
+import pytest
+
+from common.core import events
+
+
+@pytest.fixture(autouse=True)
+def no_redis(monkeypatch):
+    monkeypatch.setattr(events, "get_redis_client", lambda: None)
+
+
+class TestEvents:
+    """Test local dispatch of published content changes."""
+
+    @pytest.mark.asyncio
+    async def test_publish_dispatches_to_subscribers(self):
+        received = []
+
+        async def handler(event):
+            received.append(event)
+
+        events.subscribe(handler)
+        try:
+            await events.publish("guide", "updated", 42)
+        finally:
+            events.unsubscribe(handler)
+
+        assert received == [events.ContentChanged(entity="guide", action="updated", id="42")]
+
+    @pytest.mark.asyncio
+    async def test_failing_handler_does_not_break_publish(self):
+        received = []
+
+        def broken(event):
+            raise RuntimeError("boom")
+
+        events.subscribe(broken)
+        events.subscribe(received.append)
+        try:
+            await events.publish("media", "deleted", "m1")
+        finally:
+            events.unsubscribe(broken)
+            events.unsubscribe(received.append)
+
+        assert len(received) == 1
+
+    @pytest.mark.asyncio
+    async def test_listen_without_redis_dispatches_refresh_when_content_version_changes(
+        self, monkeypatch
+    ):
+        versions = iter(["1/a", "1/a", "2/b"])
+
+        async def content_version():
+            return next(versions, "2/b")
+
+        received = []
+        monkeypatch.setattr(events, "content_version", content_version)
+        events.subscribe(received.append)
+        listener = asyncio.create_task(events.listen(poll_interval=0.001))
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            listener.cancel()
+            events.unsubscribe(received.append)
+
+        assert received == [events.REFRESHED]
+
+    @pytest.mark.asyncio
+    async def test_listen_without_redis_returns_when_polling_is_disabled(self):
+        await asyncio.wait_for(events.listen(poll_interval=0), timeout=1)
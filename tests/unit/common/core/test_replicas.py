@@ -0,0 +1,84 @@
+"""Unit tests for read-replica routing - engines are created but never reach a server."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from common.core import db, settings
+from common.core.db import ReplicaSet
+
+
+def new_engine(port):
+    return create_async_engine(f"postgresql+asyncpg://u:p@127.0.0.1:{port}/db", poolclass=NullPool)
+
+
+@pytest.fixture
+def engines():
+    engines = [new_engine(1), new_engine(2)]
+    yield engines
+    for engine in engines:
+        engine.sync_engine.dispose()
+
+
+@pytest.fixture
+def routed(monkeypatch, engines):
+    """Route reads over ``engines`` with a separate primary."""
+    primary = new_engine(3)
+    monkeypatch.setattr(db, "_engine", primary)
+    monkeypatch.setattr(db, "_replicas", ReplicaSet(engines, eject_seconds=60))
+    monkeypatch.setattr(db, "_primary_pinned_until", 0.0)
+    yield primary
+    primary.sync_engine.dispose()
+
+
+class TestReplicaRouting:
+    """Test round-robin, ejection, read-your-writes pinning and autocommit reads."""
+
+    def test_replicas_are_used_round_robin(self, routed, engines):
+        chosen = [db.get_read_engine() for _ in range(4)]
+        assert chosen == [engines[0], engines[1], engines[0], engines[1]]
+
+    def test_ejected_replica_is_skipped(self, routed, engines):
+        db.get_replicas().eject(engines[0].sync_engine)
+
+        assert [db.get_read_engine() for _ in range(3)] == [engines[1]] * 3
+
+        db.get_replicas().eject(engines[1].sync_engine)
+        assert db.get_read_engine() is routed
+
+    def test_reads_are_pinned_to_primary_after_a_write(self, routed, monkeypatch):
+        monkeypatch.setattr(settings, "DATABASE_REPLICA_PIN_SECONDS", 60)
+        db.pin_primary()
+
+        assert db.get_read_engine() is routed
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_is_ejected(self, routed, engines):
+        with pytest.raises(OSError):
+            async with engines[0].connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        assert db.get_read_engine() is engines[1]
+        assert db.get_read_engine() is engines[1]
+
+    def test_read_sessions_autocommit(self, routed, monkeypatch):
+        monkeypatch.setattr(db, "_read_session_factories", {})
+        monkeypatch.setattr(db, "_async_session_factory", None)
+
+        read_bind = db.get_read_session_factory().kw["bind"]
+        write_bind = db.get_async_session_factory().kw["bind"]
+
+        assert read_bind.get_execution_options()["isolation_level"] == "AUTOCOMMIT"
+        assert "isolation_level" not in write_bind.get_execution_options()
+
+    @pytest.mark.parametrize("redis_url, warned", [(None, True), ("redis://redis:6379", False)])
+    def test_replica_pinning_without_redis_is_reported(self, monkeypatch, redis_url, warned):
+        warnings = []
+        monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", ["postgresql+asyncpg://replica"])
+        monkeypatch.setattr(settings, "REDIS_URL", redis_url)
+        monkeypatch.setattr(db.logger, "warning", warnings.append)
+
+        db.check_replica_pinning()
+
+        assert bool(warnings) == warned
@@ -0,0 +1,58 @@
+"""Unit tests for the request-scoped session - the session factory is mocked."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from common.core.db import RequestSession
+
+
+@pytest.fixture
+def session_factory(mock_session):
+    """Session factory returning the shared mock session."""
+    return MagicMock(return_value=mock_session)
+
+
+class TestRequestSession:
+    """Test lazy opening and single close of the shared session."""
+
+    @pytest.mark.asyncio
+    async def test_session_is_opened_lazily_and_shared(self, session_factory, mock_session):
+        request_session = RequestSession(session_factory)
+        assert not request_session.is_open
+        session_factory.assert_not_called()
+
+        async with request_session() as first:
+            pass
+        async with request_session() as second:
+            pass
+
+        assert first is second is mock_session
+        session_factory.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_close_commits_once(self, session_factory, mock_session):
+        request_session = RequestSession(session_factory)
+        async with request_session():
+            pass
+
+        await request_session.close()
+        await request_session.close()
+
+        mock_session.commit.assert_awaited_once()
+        mock_session.close.assert_awaited_once()
+        assert not request_session.is_open
+
+    @pytest.mark.asyncio
+    async def test_close_without_use_does_nothing(self, session_factory):
+        await RequestSession(session_factory).close()
+        session_factory.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_error_rolls_back_shared_transaction(self, session_factory, mock_session):
+        request_session = RequestSession(session_factory)
+        with pytest.raises(ValueError):
+            async with request_session():
+                raise ValueError("boom")
+
+        mock_session.rollback.assert_awaited_once()
@@ -0,0 +1,62 @@
+"""Unit tests for the parsed-and-validated document cache - tiny schema, no database."""
+
+from functools import partial
+from unittest.mock import patch
+
+import pytest
+import strawberry
+
+from common.core.cache import LRUCache
+from common.domain.extensions.document_cache import DocumentCacheExtension
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def hello(self) -> str:
+        return "world"
+
+
+@pytest.fixture
+def cache():
+    return LRUCache(maxsize=10)
+
+
+@pytest.fixture
+def schema(cache):
+    return strawberry.Schema(query=Query, extensions=[partial(DocumentCacheExtension, cache=cache)])
+
+
+class TestDocumentCache:
+    """Test that repeated query text is parsed and validated once."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_is_parsed_and_validated_once(self, schema, cache):
+        with patch("strawberry.schema.schema.parse", wraps=strawberry.schema.schema.parse) as parse:
+            with patch(
+                "strawberry.schema.schema.validate_document",
+                wraps=strawberry.schema.schema.validate_document,
+            ) as validate:
+                for _ in range(3):
+                    result = await schema.execute("{ hello }")
+                    assert result.data == {"hello": "world"}
+
+        assert parse.call_count == 1
+        assert validate.call_count == 1
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_validation_errors_are_replayed(self, schema):
+        first = await schema.execute("{ missing }")
+        second = await schema.execute("{ missing }")
+
+        assert first.errors and second.errors
+        assert second.errors[0].message == first.errors[0].message
+
+    @pytest.mark.asyncio
+    async def test_parse_errors_are_not_cached(self, schema, cache):
+        result = await schema.execute("{ hello")
+
+        assert result.errors
+        assert len(cache) == 0
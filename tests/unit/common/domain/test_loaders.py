@@ -0,0 +1,128 @@
+"""Unit tests for GraphQL DataLoaders - services are mocked, no database."""
+
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock
+from uuid import UUID, uuid4
+
+import pytest
+
+from common.domain.dtos.guide import GuideReadDTO
+from common.domain.resolvers import loaders as loaders_module
+from common.domain.resolvers.loaders import create_loaders
+from common.domain.schema.guide import UserGuide
+
+
+@pytest.fixture
+def session_opens(mock_session):
+    """Session factory that records how many sessions were opened."""
+    opened = []
+
+    @asynccontextmanager
+    async def get_session():
+        opened.append(mock_session)
+        yield mock_session
+
+    return get_session, opened
+
+
+class TestLoaders:
+    """Test batching and key ordering of the relationship loaders."""
+
+    @pytest.mark.asyncio
+    async def test_guide_categories_batches_into_one_call(self, monkeypatch, session_opens):
+        get_session, opened = session_opens
+        first, second, missing = uuid4(), uuid4(), uuid4()
+        batch = AsyncMock(return_value={first: ["a"], second: ["b", "c"]})
+        monkeypatch.setattr(loaders_module.guide_service, "get_categories_for_guides", batch)
+
+        loaders = create_loaders(get_session)
+        result = await loaders.guide_categories.load_many([second, missing, first])
+
+        assert result == [["b", "c"], [], ["a"]]
+        batch.assert_awaited_once()
+        assert len(opened) == 1
+
+    @pytest.mark.asyncio
+    async def test_loaders_are_not_shared_between_requests(self, monkeypatch, session_opens):
+        get_session, _ = session_opens
+        key = uuid4()
+        batch = AsyncMock(return_value={key: ["guide"]})
+        monkeypatch.setattr(loaders_module.guide_service, "list_guides_by_categories", batch)
+
+        await create_loaders(get_session).category_guides.load(key)
+        await create_loaders(get_session).category_guides.load(key)
+
+        assert batch.await_count == 2
+
+
+def guide_type(**values):
+    return UserGuide(
+        id=str(uuid4()),
+        title="Guide",
+        slug="guide",
+        estimatedReadTime=1,
+        excerpt="",
+        toc=[],
+        createdAt=datetime(2026, 1, 1),
+        updatedAt=None,
+        **{"loaded_body": {}, **values},
+    )
+
+
+class FakeInfo:
+    def __init__(self, loaders):
+        self.context = {"loaders": loaders}
+
+
+class TestRelationshipFields:
+    """Relationship fields return prefetched lists and fall back to the loaders otherwise."""
+
+    @pytest.mark.asyncio
+    async def test_prefetched_empty_list_skips_the_loader(self):
+        loaders = AsyncMock()
+        guide = guide_type(prefetched_categories=[], prefetched_related=[])
+
+        assert await guide.categories(FakeInfo(loaders)) == []
+        assert await guide.related(FakeInfo(loaders)) == []
+        loaders.guide_categories.load.assert_not_called()
+        loaders.guide_related.load.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_not_prefetched_uses_the_loader(self, monkeypatch, session_opens):
+        get_session, opened = session_opens
+        guide = guide_type()
+        related = [
+            GuideReadDTO(
+                id=uuid4(),
+                title=f"Related {i}",
+                slug=f"related-{i}",
+                body={},
+                estimated_read_time=1,
+                created_at=datetime(2026, 1, 1),
+                updated_at=None,
+            )
+            for i in range(3)
+        ]
+        batch = AsyncMock(return_value={UUID(guide.id): related})
+        monkeypatch.setattr(loaders_module.guide_service, "list_related_guides", batch)
+
+        result = await guide.related(FakeInfo(create_loaders(get_session)), first=2)
+
+        assert [g.slug for g in result] == ["related-0", "related-1"]
+        batch.assert_awaited_once()
+        assert len(opened) == 1
+
+    @pytest.mark.asyncio
+    async def test_body_left_out_by_the_lookahead_uses_the_loader(self, monkeypatch, session_opens):
+        get_session, opened = session_opens
+        guide = guide_type(loaded_body=None)
+        body = {"blocks": [{"type": "paragraph", "text": "Hi"}]}
+        batch = AsyncMock(return_value={UUID(guide.id): body})
+        monkeypatch.setattr(loaders_module.guide_service, "get_bodies", batch)
+        info = FakeInfo(create_loaders(get_session))
+
+        assert await guide.body(info) == body
+        assert await guide.bodyHtml(info) == "<p>Hi</p>"
+        batch.assert_awaited_once()
+        assert len(opened) == 1
@@ -0,0 +1,86 @@
+"""Unit tests for automatic persisted queries - run against a tiny schema, no database."""
+
+from functools import partial
+
+import pytest
+import strawberry
+
+from common.domain.extensions import persisted_queries
+from common.domain.extensions.persisted_queries import (
+    PersistedQueryExtension,
+    PersistedQueryRegistry,
+    hash_query,
+)
+
+QUERY = "{ hello }"
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def hello(self) -> str:
+        return "world"
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(persisted_queries, "get_redis_client", lambda: None)
+    return PersistedQueryRegistry(maxsize=10)
+
+
+@pytest.fixture
+def schema(registry):
+    return strawberry.Schema(
+        query=Query,
+        extensions=[partial(PersistedQueryExtension, registry=registry, max_query_length=100)],
+    )
+
+
+def persisted(sha256_hash):
+    return {"persistedQuery": {"version": 1, "sha256Hash": sha256_hash}}
+
+
+class TestPersistedQueries:
+    """Test the APQ miss / register / hit round trip."""
+
+    @pytest.mark.asyncio
+    async def test_unknown_hash_is_not_found(self, schema):
+        result = await schema.execute(None, operation_extensions=persisted(hash_query(QUERY)))
+
+        assert result.errors[0].message == "PersistedQueryNotFound"
+        assert result.errors[0].extensions == {"code": "PERSISTED_QUERY_NOT_FOUND"}
+
+    @pytest.mark.asyncio
+    async def test_registered_query_resolves_by_hash(self, schema):
+        sha256_hash = hash_query(QUERY)
+        registered = await schema.execute(QUERY, operation_extensions=persisted(sha256_hash))
+        result = await schema.execute(None, operation_extensions=persisted(sha256_hash))
+
+        assert registered.data == {"hello": "world"}
+        assert result.errors is None
+        assert result.data == {"hello": "world"}
+
+    @pytest.mark.asyncio
+    async def test_mismatched_hash_is_rejected(self, schema):
+        result = await schema.execute(QUERY, operation_extensions=persisted("0" * 64))
+
+        assert result.errors[0].message == "provided sha does not match query"
+        assert (await schema.execute(None, operation_extensions=persisted("0" * 64))).errors
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("query", ["{ hello", "{ missing }"])
+    async def test_invalid_query_is_not_registered(self, schema, registry, query):
+        sha256_hash = hash_query(query)
+        result = await schema.execute(query, operation_extensions=persisted(sha256_hash))
+
+        assert result.errors
+        assert await registry.get(sha256_hash) is None
+
+    @pytest.mark.asyncio
+    async def test_overlong_query_is_executed_but_not_registered(self, schema, registry):
+        query = "{ hello }" + " " * 100
+        sha256_hash = hash_query(query)
+        result = await schema.execute(query, operation_extensions=persisted(sha256_hash))
+
+        assert result.data == {"hello": "world"}
+        assert await registry.get(sha256_hash) is None
@@ -0,0 +1,58 @@
+"""Unit tests for static query cost and depth analysis - no database."""
+
+from functools import partial
+
+import pytest
+import strawberry
+from graphql import parse
+
+from common.domain.extensions.cost import QueryCostExtension, analyze_query
+from common.domain.resolvers import Mutation, Query
+
+schema = strawberry.Schema(query=Query, mutation=Mutation)
+
+
+def cost_of(query, variables=None, operation_name=None):
+    return analyze_query(schema._schema, parse(query), operation_name, variables)
+
+
+class TestAnalyzeQuery:
+    """Test cost multiplication by list sizes and pagination arguments."""
+
+    def test_scalars_are_free(self):
+        assert cost_of("{ categories { name slug } }").cost == 1
+
+    def test_nested_lists_multiply(self):
+        # 1 for guides + 100 guides x 1 for categories
+        assert cost_of("{ guides { slug categories { name } } }").cost == 101
+
+    def test_first_argument_sizes_connection_edges(self):
+        query = "query ($n: Int!) { guidesConnection(first: $n) { edges { node { categories { name } } } } }"
+        small = cost_of(query, {"n": 2})
+        large = cost_of(query, {"n": 50})
+
+        assert large.cost > small.cost
+        assert small.depth == 5
+
+    def test_fragments_are_counted(self):
+        inline = cost_of("{ guides { ... on UserGuide { media { url } } } }")
+        named = cost_of("fragment M on UserGuide { media { url } } { guides { ...M } }")
+        assert inline.cost == named.cost == 101
+
+
+class TestQueryCostExtension:
+    """Test rejection before execution and the cost in response extensions."""
+
+    @pytest.mark.asyncio
+    async def test_over_budget_query_is_rejected_without_executing(self):
+        limited = strawberry.Schema(
+            query=Query,
+            mutation=Mutation,
+            extensions=[partial(QueryCostExtension, max_cost=50)],
+        )
+
+        result = await limited.execute("{ guides { categories { guides { slug } } } }")
+
+        assert result.data is None
+        assert result.errors[0].extensions == {"code": "QUERY_TOO_COMPLEX"}
+        assert result.extensions["cost"]["requestedQueryCost"] > 50
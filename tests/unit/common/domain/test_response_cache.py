@@ -0,0 +1,196 @@
+"""Unit tests for the GraphQL response cache - tiny schema, Redis disabled."""
+
+from functools import partial
+from typing import List, Optional
+
+import pytest
+import strawberry
+from graphql import parse
+
+from redis.exceptions import WatchError
+
+from common.core.events import REFRESHED, ContentChanged
+from common.domain.extensions import response_cache as response_cache_module
+from common.domain.extensions.response_cache import (
+    REDIS_KEY_PREFIX,
+    ResponseCache,
+    ResponseCacheExtension,
+    referenced_types,
+)
+
+calls: List[str] = []
+
+
+@strawberry.type
+class UserGuide:
+    slug: str
+
+
+@strawberry.type
+class Category:
+    name: str
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def guides(self, category_slug: Optional[str] = None) -> List[UserGuide]:
+        calls.append("guides")
+        return [UserGuide(slug="getting-started")]
+
+    @strawberry.field
+    def categories(self) -> List[Category]:
+        calls.append("categories")
+        return [Category(name="Billing")]
+
+
+class FakeRedis:
+    """Strings, sets and optimistic transactions; enough for the response cache."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def incr(self, key):
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+    async def sadd(self, key, *members):
+        self.values.setdefault(key, set()).update(members)
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def smembers(self, key):
+        return set(self.values.get(key, set()))
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.watched = {}
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        pass
+
+    async def watch(self, key):
+        self.watched[key] = self.redis.values.get(key)
+
+    async def get(self, key):
+        return await self.redis.get(key)
+
+    def multi(self):
+        pass
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    async def execute(self):
+        if any(self.redis.values.get(key) != value for key, value in self.watched.items()):
+            raise WatchError()
+        for name, args, kwargs in self.commands:
+            await getattr(self.redis, name)(*args, **kwargs)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(response_cache_module, "get_redis_client", lambda: None)
+    calls.clear()
+    return ResponseCache(maxsize=10, ttl=60)
+
+
+@pytest.fixture
+def schema(cache):
+    return strawberry.Schema(query=Query, extensions=[partial(ResponseCacheExtension, cache=cache)])
+
+
+class TestResponseCache:
+    """Test hits, key normalization and invalidation by entity."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_is_served_from_cache(self, schema):
+        first = await schema.execute("{ guides { slug } }")
+        second = await schema.execute("{\n  guides {\n    slug\n  }\n}")
+
+        assert first.data == second.data
+        assert calls == ["guides"]
+
+    @pytest.mark.asyncio
+    async def test_variables_are_part_of_the_key(self, schema):
+        query = "query ($x: Boolean!) { guides @include(if: $x) { slug } }"
+        await schema.execute(query, variable_values={"x": True})
+        await schema.execute(query, variable_values={"x": False})
+
+        assert calls == ["guides"]
+        await schema.execute(query, variable_values={"x": True})
+        assert calls == ["guides"]
+
+    @pytest.mark.asyncio
+    async def test_content_change_only_drops_affected_entries(self, schema, cache):
+        await schema.execute("{ guides { slug } }")
+        await schema.execute("{ categories { name } }")
+
+        await cache.handle_content_change(ContentChanged("category", "updated", "1"))
+        await schema.execute("{ guides { slug } }")
+        await schema.execute("{ categories { name } }")
+
+        assert calls == ["guides", "categories", "categories"]
+
+    @pytest.mark.asyncio
+    async def test_result_computed_before_invalidation_is_not_stored(self, cache):
+        generation = await cache.current_generation()
+        await cache.invalidate({"UserGuide"})
+        await cache.set("key", {"guides": []}, frozenset({"UserGuide"}), generation)
+
+        assert await cache.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidation_on_another_instance_blocks_stale_writes(self, monkeypatch):
+        redis = FakeRedis()
+        monkeypatch.setattr(response_cache_module, "get_redis_client", lambda: redis)
+        writer, other = ResponseCache(maxsize=10, ttl=60), ResponseCache(maxsize=10, ttl=60)
+
+        generation = await writer.current_generation()
+        await other.invalidate({"UserGuide"})
+        await writer.set("stale", {"guides": []}, frozenset({"UserGuide"}), generation)
+        await writer.set(
+            "fresh", {"guides": []}, frozenset({"UserGuide"}), await writer.current_generation()
+        )
+
+        assert REDIS_KEY_PREFIX + "stale" not in redis.values
+        assert await writer.get("stale") is None
+        assert REDIS_KEY_PREFIX + "fresh" in redis.values
+
+    @pytest.mark.asyncio
+    async def test_content_refresh_clears_everything(self, schema, cache):
+        await schema.execute("{ guides { slug } }")
+        await schema.execute("{ categories { name } }")
+
+        await cache.handle_content_change(REFRESHED)
+        await schema.execute("{ guides { slug } }")
+        await schema.execute("{ categories { name } }")
+
+        assert calls == ["guides", "categories", "guides", "categories"]
+
+    def test_category_filter_tags_guide_lists_with_category(self, schema):
+        filtered = referenced_types(schema._schema, parse('{ guides(categorySlug: "x") { slug } }'))
+        unfiltered = referenced_types(schema._schema, parse("{ guides { slug } }"))
+
+        assert {"UserGuide", "Category"} <= filtered
+        assert "Category" not in unfiltered
@@ -0,0 +1,176 @@
+"""Unit tests for GraphQL selection lookahead - statements are compiled, not run."""
+
+from types import SimpleNamespace
+
+from graphql import FragmentDefinitionNode, parse
+from sqlalchemy import select
+from strawberry.types.nodes import InlineFragment, SelectedField
+
+from common.domain.models import Category, UserGuide
+from common.domain.resolvers.selection import (
+    child_fields,
+    flatten_selections,
+    loader_options,
+    node_fields,
+    to_type,
+)
+
+
+def field(name, *selections):
+    return SelectedField(
+        name=name, directives={}, arguments={}, selections=list(selections), alias=None
+    )
+
+
+def info_for(query):
+    """Minimal resolver info for the first root field of ``query``."""
+    document = parse(query)
+    operation, *definitions = document.definitions
+    fragments = {d.name.value: d for d in definitions if isinstance(d, FragmentDefinitionNode)}
+    field_nodes = [operation.selection_set.selections[0]]
+    return SimpleNamespace(_raw_info=SimpleNamespace(field_nodes=field_nodes, fragments=fragments))
+
+
+class TestLoaderOptions:
+    """Test compiling selections into SQLAlchemy loader options."""
+
+    def test_unselected_body_is_not_loaded(self):
+        stmt = select(UserGuide).options(
+            *loader_options(UserGuide, [field("slug"), field("title")])
+        )
+        sql = str(stmt)
+        assert "userguide.slug" in sql
+        assert "userguide.id" in sql
+        assert "userguide.body" not in sql
+
+    def test_selected_body_is_loaded(self):
+        stmt = select(UserGuide).options(*loader_options(UserGuide, [field("body")]))
+        assert "userguide.body" in str(stmt)
+
+    def test_computed_fields_load_the_columns_they_depend_on(self):
+        stmt = select(UserGuide).options(*loader_options(UserGuide, [field("bodyHtml")]))
+        assert "userguide.body" in str(stmt)
+
+        guide = to_type(
+            UserGuide(title="Pay", slug="pay", body={"blocks": []}), [field("bodyHtml")]
+        )
+        assert guide.loaded_body == {"blocks": []}
+        assert guide.title is None
+
+    def test_relationships_only_when_selected(self):
+        without = loader_options(UserGuide, [field("title")])
+        with_categories = loader_options(
+            UserGuide, [field("title"), field("categories", field("name"))]
+        )
+        assert len(without) == 1
+        assert len(with_categories) == 2
+
+    def test_fragments_are_flattened(self):
+        fragment = InlineFragment(
+            type_condition="UserGuide", selections=[field("title")], directives={}
+        )
+        names = [f.name for f in flatten_selections([field("slug"), fragment])]
+        assert names == ["slug", "title"]
+
+
+class TestNodeFields:
+    """Test compiling connection selections from below edges { node }."""
+
+    def test_keys_are_loaded_even_when_not_selected(self):
+        stmt = select(UserGuide).options(
+            *loader_options(UserGuide, [field("slug")], keys=("created_at", "id"))
+        )
+        sql = str(stmt)
+        assert "userguide.created_at" in sql
+        assert "userguide.body" not in sql
+
+    def test_node_fields_come_from_edges_node(self):
+        info = info_for(
+            "{ guidesConnection { totalCount edges { cursor node { slug ...F } } } }"
+            " fragment F on UserGuide { title }"
+        )
+
+        assert [f.name for f in node_fields(info)] == ["slug", "title"]
+
+
+class TestChildFields:
+    """Test reading the selection from the raw field nodes."""
+
+    def test_untyped_inline_fragments_are_flattened(self):
+        info = info_for("{ guides { slug ... @defer { body media { url } } } }")
+
+        assert [f.name for f in child_fields(info)] == ["slug", "body", "media"]
+        assert [f.name for f in child_fields(info)[2].selections] == ["url"]
+
+
+class TestDeferredSelections:
+    """Test that selections under @defer are left to the deferred payload."""
+
+    def test_deferred_body_and_relationships_are_not_loaded(self):
+        info = info_for("{ guides { slug ... @defer { title body media { url } } } }")
+        fields = child_fields(info)
+
+        options = loader_options(UserGuide, fields)
+        sql = str(select(UserGuide).options(*options))
+        guide = to_type(UserGuide(title="Pay", slug="pay", body={"blocks": []}), fields)
+
+        assert len(options) == 1
+        assert "userguide.title" in sql
+        assert "userguide.body" not in sql
+        assert guide.title == "Pay"
+        assert guide.loaded_body is None
+        assert guide.prefetched_media is None
+
+    def test_deferred_body_html_does_not_load_the_body(self):
+        info = info_for(
+            "query { guides { slug ...F @defer } } fragment F on UserGuide { bodyHtml }"
+        )
+
+        sql = str(select(UserGuide).options(*loader_options(UserGuide, child_fields(info))))
+
+        assert "userguide.body" not in sql
+
+    def test_defer_with_a_false_condition_is_loaded_up_front(self):
+        info = info_for("{ guides { ... @defer(if: false) { body media { url } } } }")
+
+        options = loader_options(UserGuide, child_fields(info))
+
+        assert len(options) == 2
+        assert "userguide.body" in str(select(UserGuide).options(*options))
+
+    def test_selection_outside_the_deferred_fragment_is_still_loaded(self):
+        info = info_for("{ guides { body ... @defer { body } } }")
+
+        sql = str(select(UserGuide).options(*loader_options(UserGuide, child_fields(info))))
+
+        assert "userguide.body" in sql
+
+
+class TestToType:
+    """Test mapping loaded rows onto GraphQL types along the selection."""
+
+    def test_only_selected_columns_and_relationships_are_mapped(self):
+        row = Category(name="Billing", slug="billing", description="Invoices")
+
+        category = to_type(row, [field("name")])
+
+        assert category.name == "Billing"
+        assert category.description is None
+        assert category.prefetched_guides is None
+
+    def test_selected_relationships_are_prefetched(self):
+        row = Category(name="Billing", slug="billing")
+        row.guides = [UserGuide(title="Pay", slug="pay", body={}, estimated_read_time=1)]
+
+        category = to_type(row, [field("guides", field("slug"))])
+
+        assert [guide.slug for guide in category.prefetched_guides] == ["pay"]
+        assert category.prefetched_guides[0].title is None
+
+    def test_categories_selection_loads_no_relationship(self):
+        options = loader_options(Category, [field("name")])
+        sql = str(select(Category).options(*options))
+
+        assert len(options) == 1
+        assert "category.name" in sql
+        assert "category.description" not in sql
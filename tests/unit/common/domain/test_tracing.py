@@ -0,0 +1,106 @@
+"""Unit tests for the tracing extension - in-memory SQLite (stdlib driver), no Postgres."""
+
+from functools import partial
+from typing import List
+
+import pytest
+import strawberry
+from sqlalchemy import create_engine, text
+
+import common.domain.extensions.tracing as tracing
+from common.domain.extensions.tracing import TracingExtension
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    # The listeners live on the sync engine, so the stdlib driver exercises them fully
+    engine = create_engine("sqlite://")
+    monkeypatch.setattr(tracing, "get_engines", lambda: [engine])
+    yield engine
+    engine.dispose()
+
+
+def build_schema(engine, responses=True):
+    async def run(statements: int) -> int:
+        with engine.connect() as conn:
+            for _ in range(statements):
+                conn.execute(text("SELECT 1"))
+        return statements
+
+    @strawberry.type
+    class Item:
+        name: str
+
+        @strawberry.field
+        async def lookups(self) -> int:
+            return await run(1)
+
+    @strawberry.type
+    class Query:
+        @strawberry.field
+        async def items(self) -> List[Item]:
+            await run(2)
+            return [Item(name="a"), Item(name="b")]
+
+    return strawberry.Schema(
+        query=Query, extensions=[partial(TracingExtension, responses=responses)]
+    )
+
+
+class FakeRequest:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class TestTracingExtension:
+    """Test per-resolver statement counts and the debug header."""
+
+    @pytest.mark.asyncio
+    async def test_statements_are_attributed_to_resolvers(self, engine):
+        schema = build_schema(engine)
+        context = {"request": FakeRequest({"x-debug-trace": "1"})}
+
+        result = await schema.execute("{ items { name lookups } }", context_value=context)
+
+        trace = result.extensions["tracing"]
+        assert trace["sqlCount"] == 4
+        assert trace["resolvers"]["items"]["sqlCount"] == 2
+        assert trace["resolvers"]["items.lookups"] == {
+            **trace["resolvers"]["items.lookups"],
+            "calls": 2,
+            "sqlCount": 2,
+        }
+        assert "items.name" not in trace["resolvers"]
+
+    @pytest.mark.asyncio
+    async def test_trace_is_omitted_without_debug_header(self, engine):
+        schema = build_schema(engine)
+        context = {"request": FakeRequest({})}
+
+        result = await schema.execute("{ items { lookups } }", context_value=context)
+
+        assert result.errors is None
+        assert "tracing" not in (result.extensions or {})
+
+    @pytest.mark.asyncio
+    async def test_each_operation_gets_its_own_trace(self, engine):
+        schema = build_schema(engine)
+        context = {"request": FakeRequest({"x-debug-trace": "1"})}
+
+        await schema.execute("{ items { lookups } }", context_value=context)
+        result = await schema.execute("{ items { name } }", context_value=context)
+
+        assert result.extensions["tracing"]["sqlCount"] == 2
+        assert list(result.extensions["tracing"]["resolvers"]) == ["items"]
+
+    @pytest.mark.asyncio
+    async def test_trace_is_omitted_when_responses_are_disabled(self, engine, caplog):
+        schema = build_schema(engine, responses=False)
+        context = {"request": FakeRequest({"x-debug-trace": "1"})}
+
+        with caplog.at_level("INFO"):
+            result = await schema.execute("{ items { lookups } }", context_value=context)
+
+        assert "tracing" not in (result.extensions or {})
+        # The trace is still logged
+        assert [r.sql_count for r in caplog.records if r.msg == "GraphQL operation traced"] == [4]
@@ -0,0 +1,73 @@
+"""Unit tests for rendering guide bodies to HTML and caching the result - no Redis."""
+
+import pytest
+
+from common.services import body_html
+from common.services.body_html import BodyHtmlCache, body_hash
+from common.utils.rich_text import render_html
+
+BODY = {
+    "blocks": [
+        {"type": "heading", "level": 2, "text": "Cards & <wallets>"},
+        {"type": "paragraph", "text": 'Use "Add card".'},
+        {"type": "list", "items": ["Open settings", "Save"], "ordered": True},
+        {"type": "list", "items": ["Visa"]},
+        {"type": "video", "url": "https://example.com"},
+    ]
+}
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        value = self.values.get(key)
+        return value.encode() if value is not None else None
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+
+class TestBodyHtml:
+    """Test the renderer and the two cache tiers."""
+
+    def test_render_html_escapes_text_and_skips_unknown_blocks(self):
+        assert render_html(BODY) == (
+            '<h2 id="cards-wallets">Cards &amp; &lt;wallets&gt;</h2>'
+            "<p>Use &quot;Add card&quot;.</p>"
+            "<ol><li>Open settings</li><li>Save</li></ol>"
+            "<ul><li>Visa</li></ul>"
+        )
+        assert render_html({"blocks": "nope"}) == ""
+
+    def test_body_hash_ignores_key_order(self):
+        assert body_hash({"a": 1, "b": [2]}) == body_hash({"b": [2], "a": 1})
+        assert body_hash({"a": 1}) != body_hash({"a": 2})
+
+    @pytest.mark.asyncio
+    async def test_bodies_are_rendered_once(self, monkeypatch):
+        redis = FakeRedis()
+        renders = []
+        monkeypatch.setattr(body_html, "get_redis_client", lambda: redis)
+        monkeypatch.setattr(body_html, "render_html", lambda body: renders.append(body) or "<p/>")
+
+        first, second = BodyHtmlCache(maxsize=10), BodyHtmlCache(maxsize=10)
+        assert await first.render(BODY) == "<p/>"
+        assert await first.render(dict(BODY)) == "<p/>"
+        # Another process finds it in Redis
+        assert await second.render(BODY) == "<p/>"
+
+        assert len(renders) == 1
+        assert list(redis.values) == [body_html.REDIS_KEY_PREFIX + body_hash(BODY)]
+        assert first.cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_rendering(self, monkeypatch):
+        class BrokenRedis:
+            async def get(self, key):
+                raise ConnectionError("down")
+
+        monkeypatch.setattr(body_html, "get_redis_client", lambda: BrokenRedis())
+
+        assert await BodyHtmlCache(maxsize=10).render(BODY) == render_html(BODY)
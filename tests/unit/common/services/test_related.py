@@ -0,0 +1,77 @@
+"""Unit tests for the related guides computation - no database."""
+
+import numpy as np
+import pytest
+
+from common.services.related import related_documents, tfidf_vectors
+from common.services.search_index import tokenize
+
+DOCUMENTS = [
+    ("billing", "billing address invoice payment card", ["account"]),
+    ("invoice", "download invoice billing history payment", ["account"]),
+    ("refund", "refund payment card", []),
+    ("password", "reset password security login", ["security"]),
+    ("login", "login security two factor password", ["security"]),
+    ("export", "export report csv", []),
+]
+
+
+def related(documents=DOCUMENTS, count=2, group_boost=0.0):
+    pairs = related_documents(
+        [(key, tokenize(text), groups) for key, text, groups in documents], count, group_boost
+    )
+    result = {}
+    for key, rank, other, score in pairs:
+        result.setdefault(key, []).append(other)
+        assert rank == len(result[key])
+    return result
+
+
+def dense(vectors):
+    matrix = np.zeros(vectors.shape)
+    for row in range(vectors.shape[0]):
+        columns, values = vectors.row(row)
+        matrix[row, columns] = values
+    return matrix
+
+
+class TestRelatedDocuments:
+    """Test TF-IDF vectors, cosine ranking and the group boost."""
+
+    def test_products_match_dense_dot_products(self):
+        vectors = tfidf_vectors([tokenize(text) for _, text, _ in DOCUMENTS])
+        matrix = dense(vectors)
+
+        for row in range(len(DOCUMENTS)):
+            assert vectors.products(row) == pytest.approx(matrix @ matrix[row])
+
+    def test_documents_sharing_rare_terms_rank_first(self):
+        result = related()
+
+        assert result["billing"] == ["invoice", "refund"]
+        assert result["password"] == ["login"]
+        assert result["refund"][0] == "billing"
+
+    def test_documents_without_shared_terms_are_not_related(self):
+        result = related()
+
+        assert "export" not in result
+        assert all("export" not in others for others in result.values())
+        assert all(key not in others for key, others in result.items())
+
+    def test_shared_groups_boost_documents(self):
+        documents = [
+            ("a", "alpha beta", ["g"]),
+            ("b", "alpha gamma", []),
+            ("c", "beta delta", ["g"]),
+            ("d", "epsilon", ["g"]),
+        ]
+
+        assert related(documents, count=3)["a"] == ["b", "c"]
+        boosted = related(documents, count=3, group_boost=0.2)
+        assert boosted["a"] == ["c", "b", "d"]
+        assert boosted["d"] == ["a", "c"]
+
+    def test_empty_input(self):
+        assert related([], count=3) == {}
+        assert related([("a", "", []), ("b", "", [])], count=3) == {}
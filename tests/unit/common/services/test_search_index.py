@@ -0,0 +1,185 @@
+"""Unit tests for the in-process BM25 search index - no database."""
+
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+
+from common.core.events import REFRESHED, ContentChanged
+from common.services import search_index
+from common.services.search_index import (
+    BM25Index,
+    GuideSearchIndex,
+    highlight,
+    tokenize,
+)
+
+DOCUMENTS = [
+    ("billing", "update your billing details and billing address", ["account"]),
+    ("invoice", "download an invoice from the billing page", ["account"]),
+    ("password", "reset a forgotten password", ["security"]),
+    ("webhooks", "configure webhooks for invoice events", []),
+]
+
+
+def build(documents=DOCUMENTS):
+    index = BM25Index()
+    index.rebuild((key, tokenize(text), groups) for key, text, groups in documents)
+    return index
+
+
+def keys(page):
+    return [key for key, _ in page]
+
+
+class TestBM25Index:
+    """Test ranking, filtering, paging and incremental updates."""
+
+    def test_tokenize_lowercases_and_drops_stop_words(self):
+        assert tokenize("How to Reset the Password?") == ["reset", "password"]
+
+    def test_documents_matching_more_often_rank_first(self):
+        page, total = build().search(tokenize("billing"), 10)
+
+        assert keys(page) == ["billing", "invoice"]
+        assert total == 2
+        assert page[0][1] > page[1][1] > 0
+
+    def test_any_term_matches_and_rare_terms_weigh_more(self):
+        page, total = build().search(tokenize("invoice webhooks"), 10)
+
+        assert keys(page) == ["webhooks", "invoice"]
+        assert total == 2
+
+    def test_unknown_terms_match_nothing(self):
+        assert build().search(tokenize("refund"), 10) == ([], 0)
+
+    def test_search_is_restricted_to_a_group(self):
+        index = build()
+
+        assert keys(index.search(tokenize("invoice"), 10, group="account")[0]) == ["invoice"]
+        assert index.search(tokenize("invoice"), 10, group="missing") == ([], 0)
+
+    def test_pages_do_not_overlap(self):
+        index = build([(f"doc{i}", "same words", []) for i in range(5)])
+
+        pages = [index.search(["same"], 2, offset)[0] for offset in (0, 2, 4)]
+
+        assert [keys(page) for page in pages] == [["doc0", "doc1"], ["doc2", "doc3"], ["doc4"]]
+        assert index.search(["same"], 2, 6) == ([], 5)
+
+    def test_incremental_updates_score_like_a_rebuild(self):
+        index = build()
+        index.remove("password")
+        index.add("billing", tokenize("billing plans and invoices"), ["plans"])
+        index.add("refunds", tokenize("refund an invoice"), ["account"])
+
+        expected = build(
+            [
+                ("invoice", "download an invoice from the billing page", ["account"]),
+                ("webhooks", "configure webhooks for invoice events", []),
+                ("billing", "billing plans and invoices", ["plans"]),
+                ("refunds", "refund an invoice", ["account"]),
+            ]
+        )
+        for query in ("invoice billing", "password", "plans refund"):
+            page, total = index.search(tokenize(query), 10)
+            expected_page, expected_total = expected.search(tokenize(query), 10)
+            assert total == expected_total
+            assert dict(page) == pytest.approx(dict(expected_page))
+        assert keys(index.search(["invoice"], 10, group="account")[0]) == ["refunds", "invoice"]
+        assert index.search(["billing"], 10, group="account")[0][0][0] == "invoice"
+        assert len(index) == 4
+        assert index.stats()["documents"] == 4
+
+    def test_removing_a_group_keeps_its_documents(self):
+        index = build()
+        index.remove_group("account")
+
+        assert index.search(["invoice"], 10, group="account") == ([], 0)
+        assert index.search(["invoice"], 10)[1] == 2
+        assert index.remove("invoice")
+        assert not index.remove("invoice")
+
+    def test_highlight_marks_terms_around_the_first_match(self):
+        text = " ".join(f"w{i}" for i in range(30)) + " Billing, details"
+
+        snippet = highlight(text, ["billing"], max_words=8)
+
+        assert snippet == "w24 w25 w26 w27 w28 w29 <b>Billing,</b> details"
+        assert highlight("no match here", ["billing"]) == "no match here"
+
+
+class FakeGuide:
+    def __init__(self, title, text, category_ids=()):
+        self.id = uuid4()
+        self.title = title
+        self.plaintext = text
+        self.category_ids = list(category_ids)
+
+
+class FakeRepository:
+    def __init__(self, guides):
+        self.guides = {guide.id: guide for guide in guides}
+
+    async def list_text(self, session):
+        return list(self.guides.values())
+
+    async def get_text(self, session, id):
+        return self.guides.get(id)
+
+
+@asynccontextmanager
+async def no_session():
+    yield None
+
+
+class TestGuideSearchIndex:
+    """Test building from the repository and updates from content change events."""
+
+    @pytest.fixture(autouse=True)
+    def no_database(self, monkeypatch):
+        monkeypatch.setattr(search_index, "get_read_session", no_session)
+
+    @pytest.mark.asyncio
+    async def test_index_follows_content_changes(self):
+        category_id = uuid4()
+        billing = FakeGuide("Billing", "Update billing details", [category_id])
+        password = FakeGuide("Password", "Reset your password")
+        repo = FakeRepository([billing, password])
+        index = GuideSearchIndex(repo)
+
+        # Nothing to update before the index is built
+        await index.handle_content_change(ContentChanged("guide", "deleted", str(billing.id)))
+        assert keys((await index.search("billing", 10))[0]) == [billing.id]
+
+        billing.title = "Plans"
+        billing.plaintext = "Change plan"
+        added = FakeGuide("Invoices", "Billing history and invoices")
+        repo.guides[added.id] = added
+        del repo.guides[password.id]
+        await index.handle_content_change(ContentChanged("guide", "updated", str(billing.id)))
+        await index.handle_content_change(ContentChanged("guide", "created", str(added.id)))
+        await index.handle_content_change(ContentChanged("guide", "deleted", str(password.id)))
+
+        assert keys((await index.search("billing", 10))[0]) == [added.id]
+        assert keys((await index.search("plan", 10, category_id=category_id))[0]) == [billing.id]
+        assert await index.search("password", 10) == ([], 0)
+
+        await index.handle_content_change(ContentChanged("category", "deleted", str(category_id)))
+        assert await index.search("plan", 10, category_id=category_id) == ([], 0)
+
+    @pytest.mark.asyncio
+    async def test_content_refresh_rebuilds_the_index(self):
+        billing = FakeGuide("Billing", "Update billing details")
+        repo = FakeRepository([billing])
+        index = GuideSearchIndex(repo)
+        await index.ensure_built()
+
+        # Changed by another instance; no event names the guides
+        added = FakeGuide("Invoices", "Billing history and invoices")
+        repo.guides = {added.id: added}
+        assert keys((await index.search("billing", 10))[0]) == [billing.id]
+
+        await index.handle_content_change(REFRESHED)
+        assert keys((await index.search("billing", 10))[0]) == [added.id]
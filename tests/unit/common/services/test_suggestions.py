@@ -0,0 +1,122 @@
+"""Unit tests for typeahead suggestions - no database."""
+
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+
+from common.core.events import REFRESHED, ContentChanged
+from common.services import suggestions
+from common.services.suggestions import PrefixIndex, TitleSuggestions, normalize
+
+
+def build(items):
+    index = PrefixIndex()
+    index.rebuild(items)
+    return index
+
+
+class TestPrefixIndex:
+    """Test normalization, prefix lookups and incremental updates."""
+
+    def test_normalize_drops_case_accents_and_punctuation(self):
+        assert normalize("  Café — Set-up_Guide! ") == "cafe set up guide"
+
+    def test_texts_starting_with_the_prefix_come_first(self):
+        index = build(
+            [
+                ("reset", "Reset your password"),
+                ("passwords", "Passwords and security"),
+                ("plans", "Plans"),
+            ]
+        )
+
+        assert index.search("pass", 10) == ["passwords", "reset"]
+        assert index.search("PASSWORDS a", 10) == ["passwords"]
+        assert index.search("p", 2) == ["passwords", "plans"]
+        assert index.search("x", 10) == []
+        assert index.search(" ", 10) == []
+
+    def test_values_matching_several_words_are_returned_once(self):
+        index = build([("pp", "Print preview pages")])
+
+        assert index.search("p", 10) == ["pp"]
+
+    def test_incremental_updates_match_a_rebuild(self):
+        index = build([("a", "Billing address"), ("b", "Invoices"), ("c", "Billing plans")])
+        index.add("a", "Shipping address")
+        index.remove("c")
+        index.add("d", "Billing history")
+
+        expected = build([("b", "Invoices"), ("a", "Shipping address"), ("d", "Billing history")])
+        for prefix in ("b", "bill", "add", "ship", "i", "h"):
+            assert index.search(prefix, 10) == expected.search(prefix, 10)
+        assert len(index) == 3
+        assert not index.remove("c")
+
+
+class FakeRepository:
+    def __init__(self, model, rows):
+        self.model = model
+        self.rows = {row[0]: row for row in rows}
+
+    async def list_columns(self, session, columns, criteria=()):
+        if criteria:
+            id = criteria[0].right.value
+            return [self.rows[id]] if id in self.rows else []
+        return list(self.rows.values())
+
+
+@asynccontextmanager
+async def no_session():
+    yield None
+
+
+class TestTitleSuggestions:
+    """Test building from the repositories and updates from content change events."""
+
+    @pytest.fixture(autouse=True)
+    def no_database(self, monkeypatch):
+        monkeypatch.setattr(suggestions, "get_read_session", no_session)
+
+    @pytest.mark.asyncio
+    async def test_suggestions_follow_content_changes(self):
+        from common.domain.models import Category, UserGuide
+
+        guide_id, category_id = uuid4(), uuid4()
+        guides = FakeRepository(UserGuide, [(guide_id, "Reset your password", "reset-password")])
+        categories = FakeRepository(Category, [(category_id, "Billing", "billing")])
+        index = TitleSuggestions(guides, categories)
+
+        found = await index.suggest("pass", 10)
+        assert [(item.kind, item.slug) for item in found] == [("guide", "reset-password")]
+        assert [item.text for item in await index.suggest("bil", 10)] == ["Billing"]
+
+        added_id = uuid4()
+        guides.rows[added_id] = (added_id, "Passkeys", "passkeys")
+        categories.rows[category_id] = (category_id, "Payments", "payments")
+        await index.handle_content_change(ContentChanged("guide", "created", str(added_id)))
+        await index.handle_content_change(ContentChanged("category", "updated", str(category_id)))
+        await index.handle_content_change(ContentChanged("guide", "deleted", str(guide_id)))
+        await index.handle_content_change(ContentChanged("media", "deleted", str(uuid4())))
+
+        assert [item.slug for item in await index.suggest("pa", 10)] == ["passkeys", "payments"]
+        assert await index.suggest("bil", 10) == []
+        assert await index.suggest("reset", 10) == []
+
+    @pytest.mark.asyncio
+    async def test_content_refresh_reloads_everything(self):
+        from common.domain.models import Category, UserGuide
+
+        guide_id = uuid4()
+        guides = FakeRepository(UserGuide, [(guide_id, "Reset your password", "reset-password")])
+        index = TitleSuggestions(guides, FakeRepository(Category, []))
+        await index.ensure_built()
+
+        # Renamed by another instance; no event names the guide
+        guides.rows[guide_id] = (guide_id, "Passkeys", "passkeys")
+        assert [item.slug for item in await index.suggest("reset", 10)] == ["reset-password"]
+
+        await index.handle_content_change(REFRESHED)
+        assert await index.suggest("reset", 10) == []
+        assert [item.slug for item in await index.suggest("pass", 10)] == ["passkeys"]
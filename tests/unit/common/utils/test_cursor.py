@@ -0,0 +1,28 @@
+"""Unit tests for opaque keyset pagination cursors."""
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from common.utils.cursor import decode_cursor, encode_cursor
+
+
+class TestCursor:
+    """Test cursor round-trips and rejection of tampered cursors."""
+
+    def test_round_trip_created_at_and_id(self):
+        created_at = datetime(2025, 9, 22, 4, 51, 51, 808605, tzinfo=timezone.utc)
+        id = uuid4()
+
+        cursor = encode_cursor(created_at, id)
+
+        assert decode_cursor(cursor, (datetime.fromisoformat, type(id))) == (created_at, id)
+
+    def test_round_trip_slug(self):
+        assert decode_cursor(encode_cursor("getting-started"), (str,)) == ("getting-started",)
+
+    @pytest.mark.parametrize("cursor", ["garbage", encode_cursor("a", "b"), encode_cursor(1, 2)])
+    def test_invalid_cursor_raises_value_error(self, cursor):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(cursor, (datetime.fromisoformat,))
@@ -0,0 +1,53 @@
+"""Unit tests for rich text body helpers."""
+
+from common.utils.rich_text import (
+    block_text,
+    derive_content,
+    excerpt,
+    table_of_contents,
+)
+
+BODY = {
+    "blocks": [
+        {"type": "heading", "level": 1, "text": "Set up billing"},
+        {"type": "paragraph", "text": "Add a payment card to your account."},
+        {"type": "heading", "level": 2, "text": "Set up billing!"},
+        {"type": "list", "items": ["Open settings", "Choose Billing"]},
+        {"type": "heading", "level": 2, "text": "???"},
+    ]
+}
+
+
+class TestRichText:
+    """Test text extraction and the content derived from a body."""
+
+    def test_block_text_filters_block_types(self):
+        assert block_text(BODY, ("list",)) == "Open settings Choose Billing"
+        assert block_text({"blocks": "nope"}) == ""
+
+    def test_excerpt_cuts_at_a_word_boundary(self):
+        assert excerpt("short text", 20) == "short text"
+        assert excerpt("Add a payment card, then save", 20) == "Add a payment card…"
+        assert excerpt("unbreakableword", 5) == "unbre…"
+
+    def test_table_of_contents_has_unique_anchors(self):
+        assert table_of_contents(BODY) == [
+            {"level": 1, "text": "Set up billing", "anchor": "set-up-billing"},
+            {"level": 2, "text": "Set up billing!", "anchor": "set-up-billing-2"},
+            {"level": 2, "text": "???", "anchor": "section"},
+        ]
+
+    def test_derive_content(self):
+        derived = derive_content(BODY)
+
+        assert derived.plaintext.startswith("Set up billing Add a payment card")
+        assert derived.excerpt == "Add a payment card to your account. Open settings Choose Billing"
+        assert derived.word_count == 18
+        assert derived.read_time == 1
+        assert len(derived.toc) == 3
+
+    def test_read_time_is_bounded(self):
+        long_body = {"blocks": [{"type": "paragraph", "text": "word " * 450}]}
+
+        assert derive_content(long_body).read_time == 3
+        assert derive_content({"blocks": []}).read_time == 1